@@ -0,0 +1,78 @@
+"""Microbenchmark: Book hydration via __slots__/_from_row vs the old constructor path.
+
+Usage (from the repository root, no database needed):
+    python -m benchmarks.bench_hydration --rows 200000
+"""
+import argparse
+import time
+import tracemalloc
+from models.book import Book
+
+class LegacyEntity:
+    # The pre-_from_row path: a __dict__ per instance and a pool check in __init__
+    _pool = object()
+
+    def __init__(self):
+        self._initialize_pool()
+
+    @classmethod
+    def _initialize_pool(cls):
+        if cls._pool is None:
+            raise RuntimeError("unreachable")
+
+class LegacyBook(LegacyEntity):
+    def __init__(self, title, isbn, category, publisher, shelf_location,
+                 publish_year=None, quantity=0, id=None):
+        super().__init__()
+        self.id = id
+        self.title = title
+        self.isbn = isbn
+        self.category = category
+        self.publisher = publisher
+        self.publish_year = publish_year
+        self.shelf_location = shelf_location
+        self.quantity = quantity
+
+def legacy_hydrate(rows):
+    LegacyBook("", "", "", "", "")  # the throwaway instance each classmethod built
+    books = []
+    for row in rows:
+        books.append(LegacyBook(id=row[0], title=row[1], isbn=row[2], category=row[3],
+                                publisher=row[4], publish_year=row[5],
+                                shelf_location=row[6], quantity=row[7]))
+    return books
+
+def fast_hydrate(rows):
+    return Book._from_rows(rows)
+
+def make_rows(count):
+    return [(i, f"Title {i}", f"978{i:010d}", "Reference", "Penguin", 2001,
+             f"A-{i % 400:03d}", 3) for i in range(count)]
+
+def measure(fn, rows):
+    start = time.perf_counter()
+    fn(rows)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = fn(rows)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Row tuples are shared by both paths, so this is the per-object overhead
+    return len(rows) / elapsed, (after - before) / len(objects)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    print(f"{'path':28} {'objects/sec':>14} {'bytes/row':>10}")
+    for name, fn in [("constructor (legacy)", legacy_hydrate),
+                     ("_from_row + __slots__", fast_hydrate)]:
+        rate, per_row = measure(fn, rows)
+        print(f"{name:28} {rate:14,.0f} {per_row:10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Concurrent loan issuance: throughput and rule violations at 8/32/128 clients.
+
+Usage (from the repository root, against a scratch database):
+    python -m benchmarks.bench_loans --members 200 --books 50 --copies 2
+    python -m benchmarks.bench_loans --mode naive    # old check-then-insert path
+
+Every client repeatedly issues a loan for a random member and book. Once all
+clients finish, the run counts members with more than the allowed number of
+open loans and books lent out more times than they have copies. Rows created
+by the run are deleted afterwards.
+
+Loans are not returned during a round, so the small default catalog runs out
+quickly and most later attempts are refused. A refusal still runs the full
+locked check, so attempts/s is the throughput figure and issues/s shows how
+much of it produced loans.
+"""
+import argparse
+import os
+import random
+import threading
+import time
+from controllers.loan_controller import LoanController
+from database_manager import BaseEntity
+from models.book import Book
+from models.loan import Loan, LoanError
+from models.member import Member
+
+RUN = int(time.time())
+MAX_ACTIVE = LoanController.MAX_ACTIVE_LOANS
+
+def seed(members, books, copies):
+    member_ids = []
+    for n in range(members):
+        member = Member(name=f"Load Member {n}", national_id=f"LD{RUN}-{n}")
+        member.save()
+        member_ids.append(member.id)
+    book_ids = []
+    for n in range(books):
+        book = Book(title=f"Load Book {n}", isbn=f"LD{RUN % 10**8}{n:05d}", category="Bench",
+                    publisher="Bench", shelf_location="BENCH", quantity=copies)
+        book.save()
+        book_ids.append(book.id)
+    return member_ids, book_ids
+
+def issue_naive(member_id, book_id):
+    if Loan.get_active_loans_count(member_id) >= MAX_ACTIVE:
+        raise LoanError("Active loan limit reached.")
+    loan = Loan(member_id=member_id, book_id=book_id)
+    loan.save()
+
+def issue_atomic(member_id, book_id):
+    Loan.issue_loan(member_id, book_id, MAX_ACTIVE)
+
+def violations(member_ids, book_ids):
+    marks = ", ".join(["%s"] * len(member_ids))
+    over_limit = BaseEntity.fetch_data(
+        f"""SELECT COUNT(*) FROM (SELECT member_id FROM loans
+            WHERE return_date IS NULL AND member_id IN ({marks})
+            GROUP BY member_id HAVING COUNT(*) > %s) t""",
+        (*member_ids, MAX_ACTIVE))[0][0]
+    marks = ", ".join(["%s"] * len(book_ids))
+    over_copies = BaseEntity.fetch_data(
+        f"""SELECT COUNT(*) FROM books b
+            JOIN (SELECT book_id, COUNT(*) AS lent FROM loans
+                  WHERE return_date IS NULL GROUP BY book_id) l ON l.book_id = b.id
+            WHERE b.id IN ({marks}) AND l.lent > b.quantity""",
+        tuple(book_ids))[0][0]
+    return over_limit, over_copies
+
+def return_all(member_ids):
+    marks = ", ".join(["%s"] * len(member_ids))
+    BaseEntity.execute_query(
+        f"UPDATE loans SET return_date = CURDATE() WHERE return_date IS NULL AND member_id IN ({marks})",
+        tuple(member_ids))
+
+def run(clients, attempts, issue, member_ids, book_ids):
+    counts = {"issued": 0, "refused": 0, "errors": 0}
+    lock = threading.Lock()
+    start_gate = threading.Barrier(clients)
+
+    def client(seed_value):
+        rng = random.Random(seed_value)
+        local = {"issued": 0, "refused": 0, "errors": 0}
+        start_gate.wait()
+        for _ in range(attempts):
+            try:
+                issue(rng.choice(member_ids), rng.choice(book_ids))
+                local["issued"] += 1
+            except LoanError:
+                local["refused"] += 1
+            except Exception:
+                local["errors"] += 1
+        with lock:
+            for key, value in local.items():
+                counts[key] += value
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counts["elapsed"] = time.perf_counter() - start
+    return counts
+
+def cleanup(member_ids, book_ids):
+    marks = ", ".join(["%s"] * len(member_ids))
+    BaseEntity.execute_query(f"DELETE FROM loans WHERE member_id IN ({marks})", tuple(member_ids))
+    BaseEntity.execute_query(f"DELETE FROM members WHERE id IN ({marks})", tuple(member_ids))
+    marks = ", ".join(["%s"] * len(book_ids))
+    BaseEntity.execute_query(f"DELETE FROM books WHERE id IN ({marks})", tuple(book_ids))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["atomic", "naive"], default="atomic")
+    parser.add_argument("--clients", type=int, nargs="+", default=[8, 32, 128])
+    parser.add_argument("--attempts", type=int, default=50, help="issue attempts per client")
+    parser.add_argument("--members", type=int, default=200)
+    parser.add_argument("--books", type=int, default=50)
+    parser.add_argument("--copies", type=int, default=2)
+    parser.add_argument("--pool-size", type=int, default=32)
+    args = parser.parse_args()
+
+    # Must be set before the first query creates the pool
+    os.environ["MYSQL_POOL_SIZE"] = str(args.pool_size)
+    os.environ.setdefault("MYSQL_POOL_TIMEOUT", "60")
+    issue = issue_atomic if args.mode == "atomic" else issue_naive
+
+    member_ids, book_ids = seed(args.members, args.books, args.copies)
+    print(f"mode {args.mode}, {args.members} members, {args.books} books x {args.copies} copies, "
+          f"pool {args.pool_size}, limit {MAX_ACTIVE} open loan(s) per member")
+    print(f"{'clients':>8} {'issued':>8} {'refused':>8} {'errors':>7} {'issues/s':>10} "
+          f"{'attempts/s':>11} {'over-limit':>11} {'over-copies':>12}")
+    try:
+        for clients in args.clients:
+            counts = run(clients, args.attempts, issue, member_ids, book_ids)
+            over_limit, over_copies = violations(member_ids, book_ids)
+            attempts = clients * args.attempts
+            print(f"{clients:>8} {counts['issued']:>8} {counts['refused']:>8} {counts['errors']:>7} "
+                  f"{counts['issued'] / counts['elapsed']:>10.1f} {attempts / counts['elapsed']:>11.1f} "
+                  f"{over_limit:>11} {over_copies:>12}")
+            return_all(member_ids)
+    finally:
+        cleanup(member_ids, book_ids)
+
+if __name__ == "__main__":
+    main()
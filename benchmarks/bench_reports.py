@@ -0,0 +1,64 @@
+"""Measure streaming PDF report throughput (rows/sec) and peak RSS.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_reports --synthetic 1000000      # layout only, no database
+    python -m benchmarks.bench_reports --report inventory       # read from the configured database
+
+Peak RSS is per process, so run one report per invocation.
+"""
+import argparse
+import resource
+import sys
+import time
+from reports.pdf_generator import PDFGenerator
+
+class CountingPDFGenerator(PDFGenerator):
+    rows = 0
+
+    def _stream_rows(self, sql, params=None):
+        for row in super()._stream_rows(sql, params):
+            self.rows += 1
+            yield row
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+def synthetic_rows(count):
+    for i in range(1, count + 1):
+        yield (i, f"Synthetic Title Number {i}", f"978{i:010d}", "Reference",
+               f"{chr(65 + i % 8)}-{i % 400:03d}", 1 + i % 5)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--synthetic", type=int, metavar="ROWS")
+    group.add_argument("--report", choices=["inventory", "members"])
+    parser.add_argument("--output", default="bench_report.pdf")
+    args = parser.parse_args()
+
+    gen = CountingPDFGenerator()
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if args.synthetic:
+        gen._build_streaming_report(
+            args.output, "Synthetic Inventory",
+            ["ID", "Title", "ISBN", "Category", "Shelf", "Qty"],
+            [40, 160, 85, 80, 63, 40], synthetic_rows(args.synthetic))
+        rows = args.synthetic
+    elif args.report == "inventory":
+        gen.generate_inventory_report(args.output)
+        rows = gen.rows
+    else:
+        gen.generate_member_report(args.output)
+        rows = gen.rows
+    elapsed = time.perf_counter() - start
+
+    print(f"rows:          {rows}")
+    print(f"elapsed:       {elapsed:.2f} s")
+    print(f"rows/sec:      {rows / elapsed:.0f}")
+    print(f"peak RSS:      {peak_rss_mb():.1f} MB (baseline {baseline:.1f} MB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Compare catalog search latency: FULLTEXT CatalogSearch vs Book.search_by_title.
+
+Usage (from the repository root, against a scratch database):
+    python -m benchmarks.bench_search --seed-books 1000000 --queries 200
+"""
+import argparse
+import random
+import statistics
+import time
+from database_manager import BaseEntity
+from models.book import Book
+from models.catalog_search import CatalogSearch
+
+WORDS = [
+    "history", "science", "garden", "ocean", "mountain", "dictionary", "empire",
+    "river", "journey", "winter", "shadow", "kingdom", "algebra", "poetry",
+    "machine", "language", "desert", "island", "memory", "silence", "forest",
+    "physics", "atlas", "letters", "stories", "theory", "voyage", "castle",
+    "philosophy", "medicine", "children", "music", "painting", "revolution",
+]
+CATEGORIES = ["Fiction", "Science", "History", "Reference", "Poetry", "Art"]
+PUBLISHERS = ["Penguin", "Oxford Press", "Harper", "Vintage", "Norton", "Springer"]
+
+def seed_books(count, batch_size=5000, seed=42):
+    rng = random.Random(seed)
+    conn = BaseEntity._get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT COUNT(*) FROM books WHERE isbn LIKE 'BENCH%'")
+        start = cursor.fetchone()[0]
+        sql = """INSERT INTO books (title, isbn, category, publisher, publish_year,
+                 shelf_location, quantity) VALUES (%s, %s, %s, %s, %s, %s, %s)"""
+        batch = []
+        for n in range(start, count):
+            title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5))).title()
+            batch.append((title, f"BENCH{n:010d}", rng.choice(CATEGORIES),
+                          rng.choice(PUBLISHERS), rng.randint(1900, 2025),
+                          f"{rng.choice('ABCDEFGH')}-{rng.randint(1, 400):03d}",
+                          rng.randint(1, 5)))
+            if len(batch) >= batch_size:
+                cursor.executemany(sql, batch)
+                conn.commit()
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+            conn.commit()
+        return max(count - start, 0)
+    finally:
+        cursor.close()
+        conn.close()
+
+def measure(fn, queries):
+    timings = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        timings.append((time.perf_counter() - start) * 1000)
+    cuts = statistics.quantiles(timings, n=100)
+    return {"p50_ms": cuts[49], "p99_ms": cuts[98], "mean_ms": statistics.fmean(timings)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed-books", type=int, default=0,
+                        help="insert synthetic books until this many BENCH rows exist")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.seed_books:
+        inserted = seed_books(args.seed_books)
+        print(f"Inserted {inserted} synthetic books")
+
+    rng = random.Random(7)
+    queries = [" ".join(rng.sample(WORDS, rng.randint(1, 2))) for _ in range(args.queries)]
+
+    results = {
+        "Book.search_by_title (LIKE '%x%')": measure(
+            lambda q: Book.search_by_title(q.split()[0]), queries),
+        "CatalogSearch.search (FULLTEXT)": measure(
+            lambda q: CatalogSearch.search(q, limit=args.limit), queries),
+    }
+    print(f"{'method':40} {'p50 ms':>10} {'p99 ms':>10} {'mean ms':>10}")
+    for name, r in results.items():
+        print(f"{name:40} {r['p50_ms']:10.2f} {r['p99_ms']:10.2f} {r['mean_ms']:10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Peak memory of scanning the loans table: Loan.iter_all() vs Loan.get_all-style fetchall.
+
+Usage (from the repository root; run each mode in its own process):
+    python -m benchmarks.bench_stream --mode stream
+    python -m benchmarks.bench_stream --mode fetchall
+"""
+import argparse
+import time
+from benchmarks.bench_reports import peak_rss_mb
+from models.loan import Loan
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["stream", "fetchall"], default="stream")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    count = 0
+    fines = 0.0
+    if args.mode == "stream":
+        loans = Loan.iter_all(batch_size=args.batch_size)
+    else:
+        loans = Loan._from_rows(Loan.fetch_data(
+            "SELECT id, member_id, book_id, loan_date, due_date, return_date, fine_amount FROM loans"))
+    for loan in loans:
+        count += 1
+        fines += loan.fine_amount
+    elapsed = time.perf_counter() - start
+
+    print(f"mode:      {args.mode}")
+    print(f"loans:     {count}")
+    print(f"rows/sec:  {count / elapsed:.0f}")
+    print(f"peak RSS:  {peak_rss_mb():.1f} MB (baseline {baseline:.1f} MB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Add-book and return-book flows: one commit per statement vs transaction().
+
+Usage (from the repository root, against a scratch database):
+    python -m benchmarks.bench_transactions --iterations 200
+
+Rows created by the run are deleted afterwards.
+"""
+import argparse
+import time
+from datetime import date
+from database_manager import BaseEntity, transaction
+from models.author import Author
+from models.book import Book
+from models.loan import Loan
+from models.member import Member
+
+RUN = int(time.time())
+
+def add_book(n, authors=3):
+    book = Book(title=f"Bench Book {n}", isbn=f"TX{RUN % 10**8}{n:08d}", category="Bench",
+                publisher="Bench", shelf_location="BENCH", quantity=1)
+    book.save()
+    for a in range(authors):
+        author = Author(name=f"Bench Author {RUN}-{n}-{a}")
+        author.save()
+        book.add_author(author.id)
+    return book
+
+def return_book(loan_id):
+    loan = Loan.get_by_id(loan_id)
+    loan.return_date = date.today()
+    loan.fine_amount = 0.0
+    loan.save()
+
+def timed(label, iterations, fn):
+    start = time.perf_counter()
+    for n in range(iterations):
+        fn(n)
+    elapsed = time.perf_counter() - start
+    print(f"{label:38} {iterations / elapsed:10.1f} ops/s {elapsed / iterations * 1000:10.2f} ms/op")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    n = args.iterations
+
+    member = Member(name="Bench Member", national_id=f"TXB{RUN}")
+    member.save()
+    try:
+        timed("add book + 3 authors (autocommit)", n, lambda i: add_book(i))
+
+        def add_book_tx(i):
+            with transaction():
+                add_book(n + i)
+        timed("add book + 3 authors (transaction)", n, add_book_tx)
+
+        books = Book.fetch_data("SELECT id FROM books WHERE isbn LIKE %s", (f"TX{RUN % 10**8}%",))
+        loans = [Loan.issue_loan(member.id, books[i % len(books)][0]).id for i in range(2 * n)]
+        timed("return book (autocommit)", n, lambda i: return_book(loans[i]))
+
+        def return_book_tx(i):
+            with transaction():
+                return_book(loans[n + i])
+        timed("return book (transaction)", n, return_book_tx)
+    finally:
+        with transaction():
+            BaseEntity.execute_query("DELETE FROM loans WHERE member_id = %s", (member.id,))
+            BaseEntity.execute_query("DELETE FROM book_authors WHERE book_id IN "
+                                     "(SELECT id FROM books WHERE isbn LIKE %s)", (f"TX{RUN % 10**8}%",))
+            BaseEntity.execute_query("DELETE FROM books WHERE isbn LIKE %s", (f"TX{RUN % 10**8}%",))
+            BaseEntity.execute_query("DELETE FROM authors WHERE name LIKE %s", (f"Bench Author {RUN}-%",))
+            BaseEntity.execute_query("DELETE FROM members WHERE id = %s", (member.id,))
+
+if __name__ == "__main__":
+    main()
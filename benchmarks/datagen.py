@@ -0,0 +1,190 @@
+"""Fill the schema with a deterministic synthetic library for benchmarking.
+
+Usage (from the repository root, against a scratch database):
+    python -m benchmarks.datagen --books 10000 --reset
+    python -m benchmarks.datagen --books 2000000 --reset     # about 10M rows in total
+
+Other tables scale with --books unless given explicitly: authors = books/5,
+members = books/2, loans = 2 x books, and book_authors averages 2 per book.
+The same --seed and --as-of always produce the same rows. Generated data
+keeps the business rules: no member has more than one open loan, and no
+book is lent out more times than its quantity. Open loans carry no fine
+until `main.py fines accrue` runs.
+
+Rows are written with explicit ids and multi-row inserts, with foreign key
+(and on MySQL unique) checks off for the session, so the target tables must
+be empty. --reset truncates them first. Works on either database backend.
+"""
+import argparse
+import random
+import time
+from array import array
+from datetime import date, timedelta
+from database_manager import BaseEntity, backend
+from benchmarks.bench_search import WORDS, CATEGORIES, PUBLISHERS
+
+FIRST_NAMES = ["Amina", "Omar", "Lina", "Yusuf", "Sara", "Karim", "Nour", "Hassan", "Maya",
+               "Ali", "Layla", "Tariq", "Huda", "Samir", "Rana", "Ziad", "Dana", "Fadi",
+               "Mona", "Khalid", "Rita", "Bilal", "Salma", "Nabil"]
+LAST_NAMES = ["Haddad", "Khoury", "Nasser", "Saleh", "Mansour", "Aziz", "Farah", "Habib",
+              "Jaber", "Rahman", "Sabbagh", "Issa", "Hamdan", "Shami", "Barakat", "Awad"]
+
+TABLES = ["loans", "book_authors", "books", "authors", "members"]
+OPEN_LOAN_SHARE = 0.3  # of members, capped by the loan count and free copies
+LOAN_DAYS = 7
+FINE_RATE = 1.0
+
+def _name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+def _authors(count, rng):
+    for author_id in range(1, count + 1):
+        yield (author_id, _name(rng))
+
+def _books(count, rng, quantities):
+    for book_id in range(1, count + 1):
+        quantity = rng.randint(1, 5)
+        quantities.append(quantity)
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5))).title()
+        yield (book_id, title, f"978{book_id:010d}", rng.choice(CATEGORIES),
+               rng.choice(PUBLISHERS), rng.randint(1900, 2025),
+               f"{rng.choice('ABCDEFGH')}-{rng.randint(1, 400):03d}", quantity)
+
+def _book_authors(books, authors, rng):
+    for book_id in range(1, books + 1):
+        for author_id in rng.sample(range(1, authors + 1), min(rng.randint(1, 3), authors)):
+            yield (book_id, author_id)
+
+def _members(count, rng, as_of):
+    for member_id in range(1, count + 1):
+        yield (member_id, _name(rng), f"N{member_id:09d}", f"05{member_id:08d}",
+               as_of - timedelta(days=rng.randint(0, 3650)))
+
+def _loans(count, members, books, rng, as_of, quantities):
+    open_target = min(int(members * OPEN_LOAN_SHARE), count // 10)
+    loan_id = 0
+    for _ in range(count - open_target):
+        loan_id += 1
+        loan_date = as_of - timedelta(days=rng.randint(21, 3650))
+        due_date = loan_date + timedelta(days=LOAN_DAYS)
+        return_date = loan_date + timedelta(days=rng.randint(1, 14))
+        fine = max((return_date - due_date).days, 0) * FINE_RATE
+        yield (loan_id, rng.randint(1, members), rng.randint(1, books),
+               loan_date, due_date, return_date, fine)
+
+    # One open loan per sampled member, on a book that still has a free copy
+    on_loan = array("B", bytes(books + 1))
+    for member_id in rng.sample(range(1, members + 1), open_target):
+        for _ in range(20):
+            book_id = rng.randint(1, books)
+            if on_loan[book_id] < quantities[book_id - 1]:
+                break
+        else:
+            continue
+        on_loan[book_id] += 1
+        loan_id += 1
+        loan_date = as_of - timedelta(days=rng.randint(0, 20))
+        yield (loan_id, member_id, book_id, loan_date,
+               loan_date + timedelta(days=LOAN_DAYS), None, 0.0)
+
+def _insert(conn, cursor, sql, rows, batch_size):
+    count = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            backend.begin(conn)
+            cursor.executemany(sql, batch)
+            conn.commit()
+            count += len(batch)
+            batch = []
+    if batch:
+        backend.begin(conn)
+        cursor.executemany(sql, batch)
+        conn.commit()
+        count += len(batch)
+    return count
+
+def generate(books, authors=None, members=None, loans=None, seed=42, as_of=None,
+             reset=False, batch_size=5000, log=print):
+    """Insert the synthetic data set; returns {table: rows} plus elapsed seconds."""
+    authors = authors if authors is not None else max(books // 5, 1)
+    members = members if members is not None else max(books // 2, 1)
+    loans = loans if loans is not None else books * 2
+    as_of = as_of or date.today()
+
+    conn = BaseEntity._connect()
+    cursor = conn.cursor()
+    counts = {}
+    start = time.perf_counter()
+    try:
+        if backend.name == "sqlite":
+            cursor.execute("PRAGMA foreign_keys = OFF")
+        else:
+            cursor.execute("SET unique_checks = 0")
+            cursor.execute("SET foreign_key_checks = 0")
+        if reset:
+            for table in TABLES:
+                cursor.execute(f"DELETE FROM {table}" if backend.name == "sqlite" else f"TRUNCATE TABLE {table}")
+        for table in TABLES:
+            cursor.execute(f"SELECT 1 FROM {table} LIMIT 1")
+            if cursor.fetchall():
+                raise RuntimeError(f"Table {table} is not empty; use --reset on a scratch database")
+
+        # Separate streams per table, so changing one count leaves the others' rows alone
+        quantities = array("B")
+        steps = [
+            ("authors", "INSERT INTO authors (id, name) VALUES (%s, %s)",
+             _authors(authors, random.Random(f"{seed}-authors"))),
+            ("books", """INSERT INTO books (id, title, isbn, category, publisher, publish_year,
+                         shelf_location, quantity) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+             _books(books, random.Random(f"{seed}-books"), quantities)),
+            ("book_authors", "INSERT INTO book_authors (book_id, author_id) VALUES (%s, %s)",
+             _book_authors(books, authors, random.Random(f"{seed}-book_authors"))),
+            ("members", """INSERT INTO members (id, name, national_id, phone, join_date)
+                           VALUES (%s, %s, %s, %s, %s)""",
+             _members(members, random.Random(f"{seed}-members"), as_of)),
+            ("loans", """INSERT INTO loans (id, member_id, book_id, loan_date, due_date,
+                         return_date, fine_amount) VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+             _loans(loans, members, books, random.Random(f"{seed}-loans"), as_of, quantities)),
+        ]
+        for table, sql, rows in steps:
+            step_start = time.perf_counter()
+            counts[table] = _insert(conn, cursor, sql, rows, batch_size)
+            elapsed = time.perf_counter() - step_start
+            log(f"{table:13} {counts[table]:>11,} rows {elapsed:8.1f} s "
+                f"({counts[table] / elapsed if elapsed else 0:,.0f} rows/s)")
+
+        for table in TABLES:
+            if backend.name == "sqlite":
+                cursor.execute(f"ANALYZE {table}")
+            else:
+                cursor.execute(f"ANALYZE TABLE {table}")
+                cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+    counts["elapsed"] = time.perf_counter() - start
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--books", type=int, default=10_000)
+    parser.add_argument("--authors", type=int)
+    parser.add_argument("--members", type=int)
+    parser.add_argument("--loans", type=int)
+    parser.add_argument("--seed", default="42")
+    parser.add_argument("--as-of", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                        help="date loans are generated around (default: today)")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--reset", action="store_true",
+                        help="truncate the library tables first")
+    args = parser.parse_args()
+
+    counts = generate(args.books, args.authors, args.members, args.loans, args.seed,
+                      args.as_of, args.reset, args.batch_size)
+    total = sum(v for k, v in counts.items() if k != "elapsed")
+    print(f"{'total':13} {total:>11,} rows {counts['elapsed']:8.1f} s")
+
+if __name__ == "__main__":
+    main()
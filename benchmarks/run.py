@@ -0,0 +1,311 @@
+"""Time the model queries, loan issuance, PDF reports and GUI table loads.
+
+Usage (from the repository root, after `python -m benchmarks.datagen`):
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --only "Loan\\." --baseline results-main.json
+
+Results are written as JSON along with the commit, database version and table
+sizes, so runs from different commits can be compared with --baseline.
+Benchmarks that load a whole table into memory are skipped when that table
+holds more than --full-limit rows. Issued loans are deleted again afterwards.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from benchmarks.bench_reports import CountingPDFGenerator, peak_rss_mb
+from benchmarks.bench_search import WORDS
+from controllers.loan_controller import LoanController
+from database_manager import BaseEntity, backend
+from models.author import Author
+from models.book import Book
+from models.catalog_search import CatalogSearch
+from models.loan import Loan
+from models.member import Member
+from models.member_index import MemberIndex
+from models.stats import LibraryStats
+
+class Context:
+    """Table sizes and seeded random arguments shared by the benchmarks."""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.counts = {}
+        self.max_ids = {}
+        for table in ("books", "authors", "members", "loans"):
+            count, max_id = BaseEntity.fetch_data(f"SELECT COUNT(*), COALESCE(MAX(id), 0) FROM {table}")[0]
+            self.counts[table] = count
+            self.max_ids[table] = max_id
+        self.counts["book_authors"] = BaseEntity.fetch_data("SELECT COUNT(*) FROM book_authors")[0][0]
+
+    def id(self, table):
+        return self.rng.randint(1, max(self.max_ids[table], 1))
+
+    def ids(self, table, n):
+        return [self.id(table) for _ in range(n)]
+
+    def word(self):
+        return self.rng.choice(WORDS)
+
+def consume(iterable):
+    return sum(1 for _ in iterable)
+
+def model_benchmarks(ctx, point, scan):
+    # (name, table the call may load in full or None, repeat, fn)
+    return [
+        ("Book.get_by_id", None, point, lambda: Book.get_by_id(ctx.id("books"))),
+        ("Book.get_many[100]", None, point, lambda: Book.get_many(ctx.ids("books", 100))),
+        ("Book.get_by_isbn", None, point, lambda: Book.get_by_isbn(f"978{ctx.id('books'):010d}")),
+        ("Book.search_by_title", None, scan, lambda: Book.search_by_title(f"{ctx.word()} {ctx.word()}")),
+        ("Book.get_page[first]", None, point, lambda: Book.get_page(None)),
+        ("Book.get_page[deep]", None, point,
+         lambda: Book.get_page((f"{ctx.rng.choice('ABCDEFGH')}-{ctx.rng.randint(1, 400):03d}", 0))),
+        ("Book.get_all", "books", scan, Book.get_all),
+        ("Book.iter_all", "books", scan, lambda: consume(Book.iter_all())),
+        ("CatalogSearch.search", None, point, lambda: CatalogSearch.search(ctx.word())),
+        ("CatalogSearch.search[2 terms]", None, point,
+         lambda: CatalogSearch.search(f"{ctx.word()} {ctx.word()}")),
+        ("Author.get_by_id", None, point, lambda: Author.get_by_id(ctx.id("authors"))),
+        ("Member.get_by_id", None, point, lambda: Member.get_by_id(ctx.id("members"))),
+        ("Member.get_many[100]", None, point, lambda: Member.get_many(ctx.ids("members", 100))),
+        ("Member.search_by_name", None, scan, lambda: Member.search_by_name("Haddad")),
+        ("Member.search[phone]", None, point, lambda: Member.search(f"05{ctx.id('members'):08d}")),
+        ("Member.search[name]", "members", point, lambda: Member.search("Amina Hadad")),
+        ("Member.get_page", None, point, lambda: Member.get_page(ctx.id("members"))),
+        ("Member.get_all", "members", scan, Member.get_all),
+        ("Member.iter_all", "members", scan, lambda: consume(Member.iter_all())),
+        ("Loan.get_by_id", None, point, lambda: Loan.get_by_id(ctx.id("loans"))),
+        ("Loan.get_active_loans_count", None, point,
+         lambda: Loan.get_active_loans_count(ctx.id("members"))),
+        ("Loan.get_active_loans", None, scan, Loan.get_active_loans),
+        ("Loan.get_overdue_loans", None, scan, Loan.get_overdue_loans),
+        ("Loan.get_active_loans_detailed", None, scan, Loan.get_active_loans_detailed),
+        ("Loan.get_overdue_loans_detailed", None, scan, Loan.get_overdue_loans_detailed),
+        ("Loan.get_outstanding_fines", None, scan, Loan.get_outstanding_fines),
+        ("Loan.iter_all", "loans", scan, lambda: consume(Loan.iter_all())),
+        ("LibraryStats.get", None, scan, lambda: (LibraryStats.invalidate(), LibraryStats.get())),
+    ]
+
+def issue_benchmark(count):
+    """Issue `count` loans through LoanController, then delete them."""
+    members = [row[0] for row in BaseEntity.fetch_data(
+        """SELECT m.id FROM members m WHERE NOT EXISTS
+               (SELECT 1 FROM loans l WHERE l.member_id = m.id AND l.return_date IS NULL)
+           LIMIT %s""", (count,))]
+    books = [row[0] for row in BaseEntity.fetch_data(
+        """SELECT b.id FROM books b WHERE b.quantity >
+               (SELECT COUNT(*) FROM loans l WHERE l.book_id = b.id AND l.return_date IS NULL)
+           LIMIT %s""", (count,))]
+    if not members or not books:
+        return {"skipped": "no eligible members or books"}
+    controller = LoanController()
+    timings = []
+    failures = 0
+    try:
+        for member_id, book_id in zip(members, books):
+            start = time.perf_counter()
+            result = controller.issue_loan(member_id, book_id)
+            timings.append((time.perf_counter() - start) * 1000)
+            failures += not result["success"]
+    finally:
+        marks = ", ".join(["%s"] * len(members))
+        BaseEntity.execute_query(
+            f"DELETE FROM loans WHERE return_date IS NULL AND member_id IN ({marks})", tuple(members))
+    summary = summarize(timings)
+    summary["failures"] = failures
+    return summary
+
+def report_benchmarks():
+    gen = CountingPDFGenerator()
+    return [
+        ("PDFGenerator.generate_inventory_report", "books", gen, gen.generate_inventory_report),
+        ("PDFGenerator.generate_member_report", "members", gen, gen.generate_member_report),
+        ("PDFGenerator.generate_overdue_report", None, gen, gen.generate_overdue_report),
+        ("PDFGenerator.generate_active_loans_report", None, gen, gen.generate_active_loans_report),
+    ]
+
+def gui_benchmarks(scroll_pages):
+    try:
+        from PySide6.QtCore import QCoreApplication
+        from gui.views.book_view import BookTableModel
+        from gui.views.member_view import MemberTableModel
+        from gui.views.loan_view import LoanTableModel
+    except ImportError as e:
+        return None, str(e)
+    QCoreApplication.instance() or QCoreApplication([])
+
+    def scroll(model_cls, pager):
+        model = model_cls()
+        model.set_pager(pager)
+        for _ in range(scroll_pages):
+            model.fetchMore()
+        return model.rowCount()
+
+    def first_page(model_cls, pager):
+        model = model_cls()
+        model.set_pager(pager)
+        return model.rowCount()
+
+    def loans():
+        model = LoanTableModel()
+        model.update_data(Loan.get_active_loans_detailed())
+        return model.rowCount()
+
+    return [
+        ("BookTableModel.set_pager", lambda: first_page(BookTableModel, Book.get_page)),
+        (f"BookTableModel.scroll[{scroll_pages} pages]", lambda: scroll(BookTableModel, Book.get_page)),
+        ("MemberTableModel.set_pager", lambda: first_page(MemberTableModel, Member.get_page)),
+        (f"MemberTableModel.scroll[{scroll_pages} pages]", lambda: scroll(MemberTableModel, Member.get_page)),
+        ("LoanTableModel.update_data[active]", loans),
+    ], None
+
+def summarize(timings, rows=None):
+    if not timings:
+        return {"skipped": "no runs"}
+    summary = {
+        "runs": len(timings),
+        "first_ms": timings[0],
+        "min_ms": min(timings),
+        "median_ms": statistics.median(timings),
+        "mean_ms": statistics.fmean(timings),
+        "max_ms": max(timings),
+    }
+    if len(timings) >= 20:
+        summary["p95_ms"] = statistics.quantiles(timings, n=20)[18]
+    if rows is not None:
+        summary["rows"] = rows
+    return summary
+
+def time_calls(fn, repeat):
+    timings = []
+    rows = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+        if isinstance(result, int):
+            rows = result
+        elif isinstance(result, (list, dict)):
+            rows = len(result)
+    return summarize(timings, rows)
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               capture_output=True, text=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\nvs {baseline_path} ({baseline['meta'].get('commit')})")
+    for name, result in results.items():
+        old = baseline["results"].get(name, {})
+        if "median_ms" in result and "median_ms" in old:
+            ratio = result["median_ms"] / old["median_ms"] if old["median_ms"] else float("inf")
+            print(f"  {name:48} {old['median_ms']:10.2f} -> {result['median_ms']:10.2f} ms  x{ratio:.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", metavar="PATH", help="earlier results to compare medians with")
+    parser.add_argument("--only", metavar="REGEX", help="run benchmarks whose name matches")
+    parser.add_argument("--seed", default="42")
+    parser.add_argument("--point-repeat", type=int, default=200, help="calls per lookup benchmark")
+    parser.add_argument("--scan-repeat", type=int, default=3, help="calls per list/scan benchmark")
+    parser.add_argument("--issue-count", type=int, default=200)
+    parser.add_argument("--scroll-pages", type=int, default=50)
+    parser.add_argument("--full-limit", type=int, default=1_000_000,
+                        help="skip whole-table benchmarks above this many rows")
+    parser.add_argument("--no-reports", action="store_true")
+    parser.add_argument("--no-gui", action="store_true")
+    args = parser.parse_args()
+
+    selected = re.compile(args.only).search if args.only else (lambda name: True)
+    ctx = Context(args.seed)
+    results = {}
+
+    def record(name, result):
+        results[name] = result
+        if "skipped" in result:
+            print(f"{name:48} skipped: {result['skipped']}")
+        else:
+            rows = f"{result['rows']:>9} rows" if "rows" in result else ""
+            print(f"{name:48} {result['median_ms']:10.2f} ms median {result['min_ms']:10.2f} ms min {rows}")
+
+    def too_big(table):
+        if table and ctx.counts[table] > args.full_limit:
+            return {"skipped": f"{table} has {ctx.counts[table]} rows (> --full-limit)"}
+        return None
+
+    print(f"tables: {ctx.counts}")
+    # Warm the trigram name index so Member.search[name] times the lookup, not the load
+    if selected("Member.search"):
+        start = time.perf_counter()
+        MemberIndex.search_ids("warm up")
+        results["MemberIndex.load"] = summarize([(time.perf_counter() - start) * 1000])
+
+    for name, table, repeat, fn in model_benchmarks(ctx, args.point_repeat, args.scan_repeat):
+        if selected(name):
+            record(name, too_big(table) or time_calls(fn, repeat))
+
+    if selected("LoanController.issue_loan"):
+        record("LoanController.issue_loan", issue_benchmark(args.issue_count))
+    if selected("LoanController.accrue_fines"):
+        record("LoanController.accrue_fines",
+               time_calls(lambda: LoanController().accrue_fines()["rows"], args.scan_repeat))
+
+    if not args.no_reports:
+        with tempfile.TemporaryDirectory() as out:
+            for name, table, gen, fn in report_benchmarks():
+                if not selected(name):
+                    continue
+                gen.rows = 0
+                path = os.path.join(out, name.split(".")[-1] + ".pdf")
+                result = too_big(table) or time_calls(lambda: fn(path), 1)
+                if "skipped" not in result:
+                    result["streamed_rows"] = gen.rows
+                    result["bytes"] = os.path.getsize(path)
+                record(name, result)
+
+    if not args.no_gui:
+        benches, error = gui_benchmarks(args.scroll_pages)
+        for name, fn in benches or []:
+            if selected(name):
+                record(name, time_calls(fn, args.scan_repeat))
+        if error:
+            results["gui"] = {"skipped": error}
+
+    meta = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "backend": backend.name,
+        "server_version": (sqlite3.sqlite_version if backend.name == "sqlite"
+                           else BaseEntity.fetch_data("SELECT VERSION()")[0][0]),
+        "tables": ctx.counts,
+        "args": vars(args),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2, default=str)
+    print(f"\nWrote {len(results)} results to {args.output}")
+    if args.baseline:
+        compare(results, args.baseline)
+
+if __name__ == "__main__":
+    main()
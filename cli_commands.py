@@ -0,0 +1,331 @@
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from datetime import date
+import query_stats
+import startup_trace
+
+# Handlers import their controllers on first use, so `--help` and the
+# interactive menu don't pay for the database driver.
+
+BOOK_FIELDS = ("id", "title", "isbn", "category", "publisher", "publish_year",
+               "shelf_location", "quantity")
+
+# report name -> (PDFGenerator method, default file name)
+REPORTS = {
+    "inventory": ("generate_inventory_report", "inventory_report.pdf"),
+    "overdue": ("generate_overdue_report", "overdue_report.pdf"),
+    "active-loans": ("generate_active_loans_report", "active_loans_report.pdf"),
+    "members": ("generate_member_report", "member_report.pdf"),
+}
+
+def add_batch_argument(parser, example):
+    parser.add_argument("--batch", metavar="PATH",
+                        help=f"read one operation per line from a JSONL file ('-' for stdin), e.g. {example}")
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Library Management System. Run without a command for the interactive menu.")
+    parser.add_argument("--query-stats", metavar="PATH",
+                        help="write per-query latency statistics to PATH as JSON on exit")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print startup timings and the slowest imports to stderr")
+    parser.add_argument("--json", action="store_true",
+                        help="write results to stdout as JSON Lines, one object per operation")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    books = commands.add_parser("books", help="catalog operations")
+    book_actions = books.add_subparsers(dest="action", metavar="action", required=True)
+
+    book_import = book_actions.add_parser("import", help="bulk import a CSV or JSONL catalog feed")
+    book_import.add_argument("file", help="CSV or JSONL file, or '-' for stdin")
+    book_import.add_argument("--format", choices=["csv", "jsonl"],
+                             help="defaults to the file extension, or jsonl for stdin")
+    book_import.add_argument("--batch-size", type=int,
+                             help="rows per transaction (default: 1000)")
+    book_import.add_argument("--rejects", metavar="PATH",
+                             help="write rejected rows to PATH as JSONL")
+    book_import.set_defaults(handler=cmd_books_import)
+
+    book_search = book_actions.add_parser(
+        "search", help="search the catalog by title, author, publisher or category")
+    book_search.add_argument("query", nargs="?")
+    book_search.add_argument("--limit", type=int, default=50)
+    add_batch_argument(book_search, '"text" or {"query": "text", "limit": 10}')
+    book_search.set_defaults(handler=cmd_books_search)
+
+    loans = commands.add_parser("loans", help="issue and return loans")
+    loan_actions = loans.add_subparsers(dest="action", metavar="action", required=True)
+
+    loan_issue = loan_actions.add_parser("issue", help="issue loans")
+    loan_issue.add_argument("member_id", type=int, nargs="?")
+    loan_issue.add_argument("book_id", type=int, nargs="?")
+    add_batch_argument(loan_issue, '{"member_id": 1, "book_id": 2}')
+    loan_issue.set_defaults(handler=cmd_loans_issue)
+
+    loan_return = loan_actions.add_parser("return", help="return loans, charging any overdue fine")
+    loan_return.add_argument("loan_ids", type=int, nargs="*", metavar="loan_id")
+    loan_return.add_argument("--date", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                             help="return date (default: today)")
+    add_batch_argument(loan_return, '{"loan_id": 1} or {"loan_id": 1, "return_date": "YYYY-MM-DD"}')
+    loan_return.set_defaults(handler=cmd_loans_return)
+
+    reports = commands.add_parser("reports", help="PDF reports")
+    report_actions = reports.add_subparsers(dest="action", metavar="action", required=True)
+
+    report_generate = report_actions.add_parser("generate", help="generate one or more PDF reports")
+    report_generate.add_argument("reports", nargs="+", choices=list(REPORTS), metavar="report",
+                                 help=", ".join(REPORTS))
+    report_generate.add_argument("--output-dir", default=".", metavar="DIR")
+    report_generate.set_defaults(handler=cmd_reports_generate)
+
+    fines = commands.add_parser("fines", help="overdue fine maintenance")
+    fine_actions = fines.add_subparsers(dest="action", metavar="action", required=True)
+
+    fines_accrue = fine_actions.add_parser(
+        "accrue", help="recompute fines on all open overdue loans (safe to rerun)")
+    fines_accrue.add_argument("--as-of", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                              help="accrue up to this date instead of today")
+    fines_accrue.set_defaults(handler=cmd_fines_accrue)
+
+    return parser
+
+def cmd_books_import(args):
+    from controllers.catalog_importer import CatalogImporter
+    def progress(result):
+        print(f"\r{result['imported']} imported, {len(result['rejected'])} rejected",
+              end="", file=sys.stderr, flush=True)
+
+    importer = CatalogImporter(batch_size=args.batch_size, progress=progress)
+    try:
+        if args.file == "-":
+            # Re-read stdin as utf-8-sig: piped spreadsheet exports often start with a BOM
+            stdin = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", newline="")
+            result = importer.import_stream(stdin, args.format or "jsonl")
+        else:
+            result = importer.import_file(args.file, args.format)
+        print(file=sys.stderr)
+
+        if args.rejects:
+            with open(args.rejects, "w", encoding="utf-8") as f:
+                for rejected in result["rejected"]:
+                    f.write(json.dumps(rejected, default=str) + "\n")
+    except (OSError, ValueError) as e:
+        # Missing or unreadable file, or one that is not valid UTF-8 text
+        if args.json:
+            print(json.dumps({"success": False, "message": str(e)}))
+        else:
+            print(f"Import failed: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        summary = {k: v for k, v in result.items() if k != "rejected"}
+        print(json.dumps({"success": True, "rejected": len(result["rejected"]), **summary}, default=str))
+        return 0
+
+    print(f"Imported:        {result['imported']}")
+    print(f"Rejected:        {len(result['rejected'])}")
+    print(f"Authors created: {result['authors_created']}")
+    print(f"Elapsed:         {result['elapsed']:.2f} s ({result['rows_per_sec']:.0f} rows/s)")
+    for rejected in result["rejected"][:10]:
+        print(f"  line {rejected['line']}: {rejected['reason']}")
+    if len(result["rejected"]) > 10 and not args.rejects:
+        print("  ... use --rejects PATH to save every rejected row")
+    return 0
+
+def cmd_fines_accrue(args):
+    from controllers.loan_controller import LoanController
+    result = LoanController().accrue_fines(args.as_of)
+    if args.json:
+        print(json.dumps(result, default=str))
+        return 0 if result["success"] else 1
+    if not result["success"]:
+        print(f"Fine accrual failed: {result['message']}", file=sys.stderr)
+        return 1
+    print(f"As of:           {result['as_of']}")
+    print(f"Loans updated:   {result['rows']}")
+    print(f"Outstanding:     ${result['outstanding']:.2f}")
+    print(f"Elapsed:         {result['elapsed']:.2f} s")
+    return 0
+
+def cmd_books_search(args):
+    from models.catalog_search import CatalogSearch
+
+    def parse(item):
+        if isinstance(item, str):
+            item = {"query": item}
+        if not isinstance(item, dict):
+            raise ValueError("expected a JSON object or string")
+        query = item.get("query")
+        if not isinstance(query, str) or not query.strip():
+            raise ValueError("query must be a non-empty string")
+        return {"query": query, "limit": int(item.get("limit", args.limit))}
+
+    def search(query, limit):
+        books = CatalogSearch.search(query, limit=limit)
+        return {"success": True, "message": f"{len(books)} book(s) found.",
+                "results": [{f: getattr(b, f) for f in BOOK_FIELDS} for b in books]}
+
+    def text(record):
+        lines = [f"{record['query']!r}: {record['message']}"]
+        for book in record.get("results", []):
+            lines.append(f"  {book['id']:>7}  {book['title']}  [{book['isbn']}]  "
+                         f"shelf {book['shelf_location']}, qty {book['quantity']}")
+        return "\n".join(lines)
+
+    single = [{"query": args.query, "limit": args.limit}] if args.query else []
+    return run_batch(args, single, parse, search, text)
+
+def cmd_loans_issue(args):
+    from controllers.loan_controller import LoanController
+    controller = LoanController()
+
+    def parse(item):
+        return {"member_id": int(item["member_id"]), "book_id": int(item["book_id"])}
+
+    def text(record):
+        if record["success"]:
+            return (f"member {record['member_id']}, book {record['book_id']}: loan {record['loan_id']} "
+                    f"issued, due {record['due_date']}")
+        return f"member {record['member_id']}, book {record['book_id']}: {record['message']}"
+
+    single = []
+    if args.member_id is not None and args.book_id is not None:
+        single = [{"member_id": args.member_id, "book_id": args.book_id}]
+    return run_batch(args, single, parse, controller.issue_loan, text)
+
+def cmd_loans_return(args):
+    from controllers.loan_controller import LoanController
+    controller = LoanController()
+
+    def parse(item):
+        return_date = item.get("return_date")
+        return {"loan_id": int(item["loan_id"]),
+                "return_date": date.fromisoformat(return_date) if return_date else args.date}
+
+    def text(record):
+        if record["success"]:
+            return f"loan {record['loan_id']}: returned, fine ${record['fine']:.2f}"
+        return f"loan {record['loan_id']}: {record['message']}"
+
+    single = [{"loan_id": loan_id, "return_date": args.date} for loan_id in args.loan_ids]
+    return run_batch(args, single, parse, controller.return_loan, text)
+
+def cmd_reports_generate(args):
+    from reports.pdf_generator import PDFGenerator
+    generator = PDFGenerator()
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    def generate(report):
+        method, filename = REPORTS[report]
+        start = time.perf_counter()
+        try:
+            path = getattr(generator, method)(os.path.join(args.output_dir, filename))
+        except Exception as e:
+            return {"success": False, "message": str(e)}
+        return {"success": True, "message": "Report generated.", "path": os.path.abspath(path),
+                "elapsed": round(time.perf_counter() - start, 3)}
+
+    def text(record):
+        if record["success"]:
+            return f"{record['report']}: {record['path']} ({record['elapsed']:.2f} s)"
+        return f"{record['report']}: {record['message']}"
+
+    return run_batch(args, [{"report": r} for r in args.reports], None, generate, text)
+
+def read_batch(f):
+    """Yield (line number, parsed JSON, error) for each non-blank line of a JSONL file."""
+    for line_no, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_no, json.loads(line), None
+        except ValueError as e:
+            yield line_no, None, f"Invalid JSON: {e}"
+
+def batch_failed(args, error):
+    # Same shape as a failed `books import`: one record under --json, else stderr
+    if args.json:
+        print(json.dumps({"success": False, "message": str(error)}))
+    else:
+        print(f"Batch failed: {error}", file=sys.stderr)
+    return 1
+
+def run_batch(args, single, parse, apply, text):
+    """Apply each operation from --batch (or the command line) and emit one
+    record per operation. All operations share this process and its
+    connection pool. Returns 0 if every operation succeeded, else 1."""
+    batch = getattr(args, "batch", None)
+    if batch:
+        try:
+            f = sys.stdin if batch == "-" else open(batch, encoding="utf-8")
+        except OSError as e:
+            return batch_failed(args, e)
+        try:
+            return run_operations(args, read_batch(f), parse, apply, text)
+        except (OSError, UnicodeDecodeError) as e:
+            # The file went away or turned out not to be UTF-8 text part way
+            return batch_failed(args, e)
+        finally:
+            if f is not sys.stdin:
+                f.close()
+    if single:
+        return run_operations(args, ((None, params, None) for params in single),
+                               parse, apply, text)
+    print("Nothing to do: give the operation as arguments or use --batch PATH", file=sys.stderr)
+    return 2
+
+def run_operations(args, operations, parse, apply, text):
+    succeeded = failed = 0
+    start = time.perf_counter()
+    for line_no, item, error in operations:
+        params = item
+        if error is None and parse and line_no is not None:
+            try:
+                params = parse(item)
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                error = f"Invalid operation: {e!r}"
+        if error is None:
+            try:
+                result = apply(**params)
+            except Exception as e:
+                result = {"success": False, "message": str(e)}
+            record = {**params, **result}
+        else:
+            record = {"success": False, "message": error}
+        if line_no is not None:
+            record = {"line": line_no, **record}
+        if record["success"]:
+            succeeded += 1
+        else:
+            failed += 1
+        if args.json:
+            print(json.dumps(record, default=str), flush=True)
+        else:
+            line = text(record) if error is None else error
+            prefix = f"line {line_no}: " if line_no is not None else ""
+            print(("" if record["success"] else "FAILED ") + prefix + line, flush=True)
+
+    elapsed = time.perf_counter() - start
+    print(f"{succeeded} succeeded, {failed} failed in {elapsed:.2f} s "
+          f"({(succeeded + failed) / elapsed if elapsed else 0:.0f} ops/s)", file=sys.stderr)
+    return 0 if failed == 0 else 1
+
+def run(argv=None):
+    """Run a subcommand and return its exit code, or None for the interactive menu."""
+    args = build_parser().parse_args(argv)
+    if args.query_stats:
+        query_stats.dump_at_exit(args.query_stats)
+    if not args.command:
+        return None
+    startup_trace.mark("command")
+    code = args.handler(args)
+    if args.profile_startup:
+        startup_trace.mark("done")
+        startup_trace.print_report()
+    return code
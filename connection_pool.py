@@ -0,0 +1,164 @@
+import bisect
+import threading
+import time
+
+class PoolError(Exception):
+    pass
+
+class PoolExhaustedError(PoolError):
+    pass
+
+class PooledConnection:
+    """Proxy handed out by ConnectionPool; close() returns it to the pool."""
+    __slots__ = ("_pool", "_raw", "_created_at", "_closed")
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._closed = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._pool._release(self._raw, self._created_at)
+
+    def discard(self):
+        """Close the underlying connection instead of returning it to the pool."""
+        if not self._closed:
+            self._closed = True
+            self._pool._release(self._raw, self._created_at, discard=True)
+
+class ConnectionPool:
+    """Bounded connection pool whose checkout waits instead of failing.
+
+    Connections are opened lazily up to `size`. When all are in use,
+    get_connection() blocks for up to `timeout` seconds before raising
+    PoolExhaustedError. Connections older than `max_lifetime` seconds are
+    closed and replaced on their next checkout. `exhausted_error` lets the
+    caller raise a driver-specific subclass of PoolExhaustedError.
+    """
+    WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+    # Idle connections are pinged before reuse after this many seconds
+    IDLE_CHECK = 60
+
+    def __init__(self, connect, size=5, timeout=10.0, max_lifetime=1800,
+                 exhausted_error=PoolExhaustedError):
+        self._connect = connect
+        self._exhausted_error = exhausted_error
+        self.size = size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self._cond = threading.Condition()
+        self._idle = []  # (raw, created_at, released_at), most recent last
+        self._open = 0
+        self._in_use = 0
+        self._checkouts = 0
+        self._exhaustions = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._wait_counts = [0] * (len(self.WAIT_BUCKETS_MS) + 1)
+
+    def get_connection(self):
+        start = time.monotonic()
+        waited = False
+        raw = None
+        with self._cond:
+            while True:
+                if self._idle:
+                    raw, created_at, released_at = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    break
+                if not waited:
+                    self._exhaustions += 1
+                    waited = True
+                remaining = self.timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise self._exhausted_error(
+                        f"No connection available after {self.timeout:.1f}s "
+                        f"({self.size} in use); raise MYSQL_POOL_SIZE or MYSQL_POOL_TIMEOUT")
+                self._cond.wait(remaining)
+            self._in_use += 1
+
+        now = time.monotonic()
+        try:
+            if raw is not None and (now - created_at > self.max_lifetime or
+                                    (now - released_at > self.IDLE_CHECK and not raw.is_connected())):
+                self._close_quietly(raw)
+                raw = None
+            if raw is None:
+                raw = self._connect()
+                created_at = time.monotonic()
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+        self._record_wait(time.monotonic() - start)
+        return PooledConnection(self, raw, created_at)
+
+    def _release(self, raw, created_at, discard=False):
+        reusable = False
+        if not discard:
+            try:
+                # Never hand the next caller someone else's open transaction
+                if getattr(raw, "in_transaction", False):
+                    raw.rollback()
+                reusable = time.monotonic() - created_at <= self.max_lifetime
+            except Exception:
+                reusable = False
+        with self._cond:
+            self._in_use -= 1
+            if reusable:
+                self._idle.append((raw, created_at, time.monotonic()))
+            else:
+                self._open -= 1
+            self._cond.notify()
+        if not reusable:
+            self._close_quietly(raw)
+
+    def _record_wait(self, seconds):
+        with self._cond:
+            self._checkouts += 1
+            self._wait_total += seconds
+            self._wait_max = max(self._wait_max, seconds)
+            self._wait_counts[bisect.bisect_left(self.WAIT_BUCKETS_MS, seconds * 1000)] += 1
+
+    @staticmethod
+    def _close_quietly(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for raw, _, _ in idle:
+            self._close_quietly(raw)
+
+    def metrics(self):
+        with self._cond:
+            labels = [f"<={b}ms" for b in self.WAIT_BUCKETS_MS] + [f">{self.WAIT_BUCKETS_MS[-1]}ms"]
+            return {
+                "size": self.size,
+                "open": self._open,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "checkouts": self._checkouts,
+                "exhaustion_count": self._exhaustions,
+                "timeouts": self._timeouts,
+                "wait_ms_avg": self._wait_total / self._checkouts * 1000 if self._checkouts else 0.0,
+                "wait_ms_max": self._wait_max * 1000,
+                "wait_ms_histogram": dict(zip(labels, self._wait_counts)),
+            }
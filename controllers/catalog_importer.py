@@ -0,0 +1,203 @@
+import csv
+import json
+import logging
+import time
+from database_manager import DatabaseError, backend, notify_write, transaction
+from models.book import Book
+
+class CatalogImporter:
+    """Bulk-loads vendor catalog feeds (CSV or JSONL) into books/authors.
+
+    Rows are streamed from the file and written in chunks: one transaction
+    and a handful of executemany() round trips per chunk. Author names are
+    resolved through a name -> id map so existing authors are reused.
+    """
+    BATCH_SIZE = 1000
+    REQUIRED = ("title", "isbn", "category", "publisher", "shelf_location")
+    ALIASES = {"shelf": "shelf_location", "qty": "quantity", "year": "publish_year",
+               "author": "authors"}
+
+    def __init__(self, batch_size=None, progress=None):
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.progress = progress
+        self._author_ids = {}
+        self._seen_isbns = set()
+
+    def import_file(self, path, fmt=None):
+        fmt = fmt or ("jsonl" if path.endswith((".jsonl", ".json")) else "csv")
+        # utf-8-sig drops the byte order mark spreadsheet exports often start with
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            return self.import_stream(f, fmt)
+
+    def import_stream(self, f, fmt):
+        """Import from an open text file (e.g. stdin) in "csv" or "jsonl" format."""
+        records = self._read_jsonl(f) if fmt == "jsonl" else self._read_csv(f)
+        return self.import_records(records)
+
+    def import_records(self, records):
+        """Import an iterable of (line number, dict) pairs; returns a summary dict."""
+        result = {"imported": 0, "rejected": [], "authors_created": 0}
+        start = time.perf_counter()
+        chunk = []
+        for line, record in records:
+            try:
+                chunk.append((line, self._normalize(record)))
+            except ValueError as e:
+                result["rejected"].append({"line": line, "reason": str(e), "record": record})
+            if len(chunk) >= self.batch_size:
+                self._import_chunk(chunk, result)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk, result)
+
+        elapsed = time.perf_counter() - start
+        result["elapsed"] = elapsed
+        result["rows_per_sec"] = result["imported"] / elapsed if elapsed else 0.0
+        return result
+
+    @staticmethod
+    def _read_csv(f):
+        for line, record in enumerate(csv.DictReader(f), start=2):
+            yield line, record
+
+    @staticmethod
+    def _read_jsonl(f):
+        for line, text in enumerate(f, start=1):
+            text = text.strip()
+            if not text:
+                continue
+            try:
+                yield line, json.loads(text)
+            except json.JSONDecodeError as e:
+                yield line, {"_error": f"invalid JSON: {e.msg}"}
+
+    def _normalize(self, record):
+        if not isinstance(record, dict):
+            # A JSONL line can be any JSON value: [1, 2], "text", 3, null
+            raise ValueError(f"expected a JSON object, got {type(record).__name__}")
+        if "_error" in record:
+            raise ValueError(record["_error"])
+        row = {}
+        for key, value in record.items():
+            if key is None:
+                continue
+            key = key.strip().lower()
+            row[self.ALIASES.get(key, key)] = value.strip() if isinstance(value, str) else value
+
+        missing = [field for field in self.REQUIRED if not row.get(field)]
+        if missing:
+            raise ValueError(f"missing {', '.join(missing)}")
+        try:
+            year = int(row["publish_year"]) if row.get("publish_year") not in (None, "") else None
+            quantity = int(row.get("quantity") or 0)
+        except (TypeError, ValueError):
+            raise ValueError("publish_year and quantity must be integers")
+        if quantity < 0:
+            raise ValueError("quantity cannot be negative")
+
+        isbn = str(row["isbn"])
+        if len(isbn) > 20:
+            raise ValueError("isbn longer than 20 characters")
+        if isbn in self._seen_isbns:
+            raise ValueError(f"duplicate ISBN {isbn} in file")
+        self._seen_isbns.add(isbn)
+
+        authors = row.get("authors") or []
+        if isinstance(authors, str):
+            authors = authors.replace(";", ",").split(",")
+        authors = list(dict.fromkeys(" ".join(str(a).split()) for a in authors if str(a).strip()))
+
+        return {
+            "book": (row["title"], isbn, row["category"], row["publisher"], year,
+                     row["shelf_location"], quantity),
+            "authors": authors,
+        }
+
+    def _import_chunk(self, chunk, result):
+        try:
+            with transaction() as conn:
+                cursor = conn.cursor()
+                try:
+                    imported, duplicates, authors_created = self._write_chunk(cursor, chunk)
+                finally:
+                    cursor.close()
+            result["imported"] += imported
+            result["rejected"].extend(duplicates)
+            result["authors_created"] += authors_created
+        except DatabaseError as err:
+            logging.error(f"Error importing catalog chunk at line {chunk[0][0]}: {err}")
+            # Authors created in the rolled back transaction no longer exist
+            self._author_ids = {}
+            for line, row in chunk:
+                result["rejected"].append({"line": line, "reason": f"database error: {err}",
+                                           "record": row["book"]})
+        notify_write(Book)
+        if self.progress:
+            self.progress(result)
+
+    def _write_chunk(self, cursor, chunk):
+        isbns = [row["book"][1] for _, row in chunk]
+        existing = {r[0] for r in self._select_in(cursor, "SELECT isbn FROM books WHERE isbn IN ({})", isbns)}
+        accepted = []
+        duplicates = []
+        for line, row in chunk:
+            if row["book"][1] in existing:
+                duplicates.append({"line": line, "reason": f"ISBN {row['book'][1]} already exists",
+                                   "record": row["book"]})
+            else:
+                accepted.append(row)
+        if not accepted:
+            return 0, duplicates, 0
+
+        cursor.executemany(
+            """INSERT INTO books (title, isbn, category, publisher, publish_year,
+               shelf_location, quantity) VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+            [row["book"] for row in accepted])
+        book_ids = dict((isbn, book_id) for book_id, isbn in self._select_in(
+            cursor, "SELECT id, isbn FROM books WHERE isbn IN ({})",
+            [row["book"][1] for row in accepted]))
+
+        names = {name for row in accepted for name in row["authors"]}
+        authors_created = self._resolve_authors(cursor, names)
+        links = [(book_ids[row["book"][1]], self._author_ids[self._author_key(name)])
+                 for row in accepted for name in row["authors"]]
+        if links:
+            cursor.executemany(
+                "INSERT IGNORE INTO book_authors (book_id, author_id) VALUES (%s, %s)", links)
+        return len(accepted), duplicates, authors_created
+
+    @staticmethod
+    def _author_key(name):
+        return name.casefold()
+
+    def _resolve_authors(self, cursor, names):
+        missing = list({self._author_key(n): n for n in names
+                        if self._author_key(n) not in self._author_ids}.values())
+        if not missing:
+            return 0
+        self._load_author_ids(cursor, missing)
+        new = [n for n in missing if self._author_key(n) not in self._author_ids]
+        if new:
+            cursor.executemany("INSERT INTO authors (name) VALUES (%s)", [(n,) for n in new])
+            self._load_author_ids(cursor, new)
+        return len(new)
+
+    def _load_author_ids(self, cursor, names):
+        # Match names ignoring case, as _author_key does. MySQL's default
+        # collation is case-insensitive already; on SQLite NOCASE only folds
+        # ASCII, so common spellings of non-ASCII names are asked for as well.
+        # Older data may hold the same name several times; keep the lowest id
+        if backend.name == "sqlite":
+            sql = "SELECT id, name FROM authors WHERE name COLLATE NOCASE IN ({}) ORDER BY id"
+            names = list({spelling for n in names
+                          for spelling in ((n,) if n.isascii() else (n, n.lower(), n.upper(), n.title()))})
+        else:
+            sql = "SELECT id, name FROM authors WHERE name IN ({}) ORDER BY id"
+        for author_id, name in self._select_in(cursor, sql, names):
+            self._author_ids.setdefault(self._author_key(name), author_id)
+
+    @staticmethod
+    def _select_in(cursor, sql, values):
+        placeholders = ", ".join(["%s"] * len(values))
+        cursor.execute(sql.format(placeholders), tuple(values))
+        return cursor.fetchall()
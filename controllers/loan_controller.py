@@ -1,8 +1,10 @@
+import time
 from datetime import date, timedelta
 from models.loan import Loan
 
 class LoanController:
     DAILY_FINE_RATE = 1.0
+    MAX_ACTIVE_LOANS = 1
 
     def calculate_due_date(self, start_date):
         return start_date + timedelta(days=7)
@@ -14,21 +16,56 @@ class LoanController:
         return float(overdue_days * self.DAILY_FINE_RATE)
 
     def issue_loan(self, member_id, book_id):
-        # 1. Check eligibility (Business Rule: 1 active loan)
-        active_loans = Loan.get_active_loans_count(member_id)
-        if active_loans >= 1:
+        # Limit and availability are checked under row locks in Loan.issue_loan
+        try:
+            loan = Loan.issue_loan(member_id, book_id, self.MAX_ACTIVE_LOANS)
+            return {
+                "success": True,
+                "message": "Loan issued successfully.",
+                "loan_id": loan.id,
+                "due_date": loan.due_date
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": str(e)
+            }
+
+    def return_loan(self, loan_id, return_date=None):
+        return_date = return_date or date.today()
+        try:
+            loan = Loan.get_by_id(loan_id)
+            if not loan:
+                return {"success": False, "message": "Loan record not found."}
+            if loan.return_date:
+                return {"success": False, "message": "This book has already been returned."}
+            loan.return_date = return_date
+            loan.fine_amount = self.calculate_fine(loan.due_date, return_date)
+            loan.save()
+            return {
+                "success": True,
+                "message": "Book returned successfully.",
+                "loan_id": loan.id,
+                "fine": loan.fine_amount
+            }
+        except Exception as e:
             return {
                 "success": False,
-                "message": "Active loan limit reached (Max 1)."
+                "message": str(e)
             }
 
-        # 2. Issue Loan
-        # Note: This relies on Loan.issue_loan implementation later
+    def accrue_fines(self, as_of=None):
+        as_of = as_of or date.today()
+        start = time.perf_counter()
         try:
-            Loan.issue_loan(member_id, book_id)
+            rows = Loan.accrue_fines(self.DAILY_FINE_RATE, as_of)
             return {
                 "success": True,
-                "message": "Loan issued successfully."
+                "message": f"Fines updated on {rows} overdue loan(s).",
+                "as_of": as_of,
+                "rows": rows,
+                "elapsed": time.perf_counter() - start,
+                "outstanding": Loan.get_outstanding_fines()
             }
         except Exception as e:
             return {
@@ -1,11 +1,21 @@
 import os
-import mysql.connector
-from mysql.connector import pooling
+import random
+import threading
+import time
+from contextlib import contextmanager
 from dotenv import load_dotenv
 import logging
+from connection_pool import ConnectionPool, PoolExhaustedError
+from db_backend import get_backend
+import query_stats
+from identity_cache import IdentityCache
 
 load_dotenv()
 
+# Selected by LIBRARY_DB_BACKEND; DatabaseError is that driver's base exception
+backend = get_backend()
+DatabaseError = backend.Error
+
 # Configure logging
 logging.basicConfig(
     filename='library_system.log',
@@ -13,57 +23,309 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+def pool_metrics():
+    """Snapshot of connection pool usage, or None before the first checkout."""
+    if BaseEntity._pool is None:
+        return None
+    return BaseEntity._pool.metrics()
+
+# Callbacks run after every committed write, used to invalidate caches.
+_write_listeners = []
+
+def register_write_listener(callback):
+    _write_listeners.append(callback)
+
+def notify_write(entity_cls):
+    for callback in _write_listeners:
+        callback(entity_cls)
+
+# Connection pinned by transaction() for the current thread
+_local = threading.local()
+
+@contextmanager
+def transaction():
+    """Unit of work: model writes inside the block share one connection and
+    commit once at the end, or roll back together if anything raises.
+    Nested blocks join the outermost one."""
+    if getattr(_local, "conn", None) is not None:
+        yield _local.conn
+        return
+
+    conn = BaseEntity._get_connection()
+    _local.conn = conn
+    _local.written = {}  # entity class -> ids to evict from its identity cache
+    committed = False
+    try:
+        backend.begin(conn)
+        yield conn
+        conn.commit()
+        committed = True
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        written = _local.written
+        _local.conn = None
+        _local.written = None
+        conn.close()
+        # Only once the transaction has ended, so a concurrent reader can't
+        # re-cache the old row. A rollback evicts too: cached instances edited
+        # inside the block hold changes that were never stored.
+        for entity_cls, ids in written.items():
+            cache = entity_cls._identity_cache
+            if cache is not None:
+                for key in ids:
+                    cache.invalidate(key)
+            if committed:
+                notify_write(entity_cls)
+
+def in_transaction():
+    return getattr(_local, "conn", None) is not None
+
+def run_in_transaction(fn, retries=3):
+    """Call fn(conn) inside transaction(), rerunning it from the start when
+    the database aborts it for a deadlock or lock timeout. Inside an
+    already open transaction fn joins it and is not retried."""
+    if in_transaction():
+        return fn(_local.conn)
+    attempt = 0
+    while True:
+        try:
+            with transaction() as conn:
+                return fn(conn)
+        except DatabaseError as err:
+            if not backend.is_retryable(err) or attempt >= retries:
+                raise
+            attempt += 1
+            time.sleep(random.uniform(0, 0.005 * 2 ** attempt))
+
 class BaseEntity:
+    __slots__ = ()
     _pool = None
+    _pool_lock = threading.Lock()
+    # Per-model IdentityCache for get_by_id/get_many, off unless enable_cache()
+    _identity_cache = None
+    IN_BATCH = 1000
 
-    def __init__(self):
-        self._initialize_pool()
+    @staticmethod
+    def _connect():
+        try:
+            return backend.connect()
+        except DatabaseError as err:
+            logging.error(f"Error opening database connection: {err}")
+            raise
 
     @classmethod
     def _initialize_pool(cls):
-        if cls._pool is None:
-            try:
-                cls._pool = mysql.connector.pooling.MySQLConnectionPool(
-                    pool_name="lib_pool",
-                    pool_size=5,
-                    host=os.getenv('MYSQL_HOST', 'localhost'),
-                    port=int(os.getenv('MYSQL_PORT', 3306)),
-                    database=os.getenv('MYSQL_DATABASE'),
-                    user=os.getenv('MYSQL_USER'),
-                    password=os.getenv('MYSQL_PASSWORD')
+        with BaseEntity._pool_lock:
+            if BaseEntity._pool is None:
+                BaseEntity._pool = ConnectionPool(
+                    BaseEntity._connect,
+                    size=int(os.getenv('MYSQL_POOL_SIZE', 5)),
+                    timeout=float(os.getenv('MYSQL_POOL_TIMEOUT', 10)),
+                    max_lifetime=float(os.getenv('MYSQL_POOL_MAX_LIFETIME', 1800)),
+                    exhausted_error=backend.PoolExhaustedError
                 )
-            except mysql.connector.Error as err:
-                logging.error(f"Error creating connection pool: {err}")
-                raise
 
-    def _get_connection(self):
-        return self._pool.get_connection()
+    @classmethod
+    def _get_connection(cls):
+        if BaseEntity._pool is None:
+            cls._initialize_pool()
+        try:
+            return BaseEntity._pool.get_connection()
+        except PoolExhaustedError as err:
+            logging.error(f"Connection pool exhausted: {err}")
+            raise
+
+    @classmethod
+    def _from_row(cls, row):
+        # Models build instances straight from a SELECT row, skipping __init__
+        raise NotImplementedError
+
+    @classmethod
+    def _from_rows(cls, rows):
+        from_row = cls._from_row
+        return [from_row(row) for row in rows]
+
+    @classmethod
+    def enable_cache(cls, maxsize=1024, ttl=60.0):
+        cls._identity_cache = IdentityCache(maxsize, ttl)
+
+    @classmethod
+    def disable_cache(cls):
+        cls._identity_cache = None
+
+    @classmethod
+    def cache_stats(cls):
+        return cls._identity_cache.stats() if cls._identity_cache is not None else None
+
+    def _evict_cached(self):
+        # save() calls this whether or not its UPDATE succeeded: callers share
+        # the cached instance, so it may hold edits the database never took.
+        # Inside a transaction the id is evicted when the block ends, committed
+        # or rolled back.
+        if self._identity_cache is None or self.id is None:
+            return
+        if in_transaction():
+            _local.written.setdefault(type(self), set()).add(self.id)
+        else:
+            self._identity_cache.invalidate(self.id)
+
+    @classmethod
+    def _get_cached(cls, key, sql):
+        cache = cls._identity_cache
+        if cache is not None:
+            obj = cache.get(key)
+            if obj is not None:
+                return obj
+        result = cls.fetch_data(sql, (key,))
+        if not result:
+            return None
+        obj = cls._from_row(result[0])
+        if cache is not None:
+            cache.put(key, obj)
+        return obj
+
+    @classmethod
+    def _get_many(cls, ids, sql):
+        # sql has one "{}" for the IN list; only cache misses are queried
+        found = {}
+        misses = []
+        cache = cls._identity_cache
+        for key in dict.fromkeys(ids):
+            obj = cache.get(key) if cache is not None else None
+            if obj is None:
+                misses.append(key)
+            else:
+                found[key] = obj
+        for i in range(0, len(misses), cls.IN_BATCH):
+            batch = misses[i:i + cls.IN_BATCH]
+            placeholders = ", ".join(["%s"] * len(batch))
+            for obj in cls._from_rows(cls.fetch_data(sql.format(placeholders), tuple(batch))):
+                found[obj.id] = obj
+                if cache is not None:
+                    cache.put(obj.id, obj)
+        return found
+
+    @classmethod
+    def _checkout(cls):
+        # Returns (connection, pinned); pinned connections belong to an open
+        # transaction() and must not be committed or closed here.
+        conn = getattr(_local, "conn", None)
+        if conn is not None:
+            return conn, True
+        return cls._get_connection(), False
+
+    @classmethod
+    def _instrument(cls, conn, sql, params, start, rows):
+        elapsed = time.perf_counter() - start
+        site = query_stats.call_site()
+        query_stats.stats.record(sql, elapsed, rows, site)
+        if query_stats.stats.is_slow(elapsed):
+            plan = cls._explain(conn, sql, params) if conn is not None else None
+            query_stats.stats.log_slow(sql, params, elapsed, site, plan)
+
+    @staticmethod
+    def _explain(conn, sql, params):
+        if not sql.lstrip().upper().startswith("SELECT"):
+            return None
+        cursor = conn.cursor()
+        try:
+            cursor.execute(backend.explain_prefix + sql, params)
+            return [cursor.column_names] + cursor.fetchall()
+        except DatabaseError as err:
+            return [(f"EXPLAIN failed: {err}",)]
+        finally:
+            cursor.close()
+
+    @classmethod
+    def execute_query(cls, sql, params=None):
+        return cls._execute(sql, params)[0]
+
+    @classmethod
+    def execute_update(cls, sql, params=None):
+        """Like execute_query, but returns the number of rows changed."""
+        return cls._execute(sql, params)[1]
 
-    def execute_query(self, sql, params=None):
-        conn = self._get_connection()
+    @classmethod
+    def _execute(cls, sql, params):
+        conn, pinned = cls._checkout()
         cursor = conn.cursor()
         try:
+            start = time.perf_counter()
             cursor.execute(sql, params)
-            conn.commit()
-            return cursor.lastrowid
-        except mysql.connector.Error as err:
+            rows = cursor.rowcount
+            if pinned:
+                _local.written.setdefault(cls, set())
+            else:
+                conn.commit()
+                notify_write(cls)
+            cls._instrument(conn, sql, params, start, rows)
+            return cursor.lastrowid, rows
+        except DatabaseError as err:
             logging.error(f"Error executing query: {err}\nSQL: {sql}\nParams: {params}")
-            conn.rollback()
+            if not pinned:
+                conn.rollback()
             raise
         finally:
             cursor.close()
-            conn.close()
+            if not pinned:
+                conn.close()
 
-    def fetch_data(self, sql, params=None):
-        conn = self._get_connection()
+    @classmethod
+    def fetch_data(cls, sql, params=None):
+        conn, pinned = cls._checkout()
         cursor = conn.cursor()
         try:
+            start = time.perf_counter()
             cursor.execute(sql, params)
             result = cursor.fetchall()
+            cls._instrument(conn, sql, params, start, len(result))
             return result
-        except mysql.connector.Error as err:
+        except DatabaseError as err:
             logging.error(f"Error fetching data: {err}\nSQL: {sql}\nParams: {params}")
             raise
         finally:
             cursor.close()
-            conn.close()
\ No newline at end of file
+            if not pinned:
+                conn.close()
+
+    @classmethod
+    def stream(cls, sql, params=None, batch_size=1000):
+        """Yield result rows without materializing the whole result set.
+
+        Rows come from an unbuffered cursor in fetchmany() batches, so memory
+        stays at one batch regardless of table size. The connection is checked
+        out on the first next() and returned when the iterator is exhausted or
+        closed.
+        """
+        conn, pinned = cls._checkout()
+        cursor = conn.cursor()
+        rows = 0
+        finished = False
+        start = time.perf_counter()
+        try:
+            cursor.execute(sql, params)
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                rows += len(batch)
+                yield from batch
+            finished = True
+        except DatabaseError as err:
+            logging.error(f"Error streaming data: {err}\nSQL: {sql}\nParams: {params}")
+            raise
+        finally:
+            cls._instrument(conn if finished else None, sql, params, start, rows)
+            if finished or not conn.unread_result:
+                cursor.close()
+                if not pinned:
+                    conn.close()
+            elif pinned:
+                # Stopped early inside a transaction: drain so the connection stays usable
+                conn.consume_results()
+                cursor.close()
+            else:
+                # Stopped early: dropping the connection beats reading the rest
+                conn.discard()
@@ -0,0 +1,219 @@
+"""Database backends for BaseEntity: MySQL (default) and embedded SQLite.
+
+LIBRARY_DB_BACKEND selects one ("mysql" or "sqlite"). Models keep writing
+MySQL-flavoured SQL with %s placeholders; the SQLite backend translates it and
+registers CURDATE, DATEDIFF and GREATEST so the same statements run there.
+"""
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from functools import lru_cache
+from connection_pool import PoolExhaustedError
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+class MySQLBackend:
+    name = "mysql"
+    schema_file = os.path.join(_ROOT, "schema.sql")
+    explain_prefix = "EXPLAIN "
+    fulltext = True
+    # InnoDB deadlock victim / lock wait timeout: the whole unit of work can be rerun
+    RETRYABLE_ERRNOS = (1213, 1205)
+
+    def __init__(self):
+        import mysql.connector
+        self._connector = mysql.connector
+        self.Error = mysql.connector.Error
+        # Also a mysql-connector PoolError, so callers catching DatabaseError
+        # still see pool exhaustion
+        self.PoolExhaustedError = type("PoolExhaustedError",
+                                       (PoolExhaustedError, mysql.connector.errors.PoolError), {})
+
+    def connect(self):
+        return self._connector.connect(
+            host=os.getenv('MYSQL_HOST', 'localhost'),
+            port=int(os.getenv('MYSQL_PORT', 3306)),
+            database=os.getenv('MYSQL_DATABASE'),
+            user=os.getenv('MYSQL_USER'),
+            password=os.getenv('MYSQL_PASSWORD')
+        )
+
+    def begin(self, conn):
+        pass  # InnoDB opens the transaction on the first statement
+
+    def is_retryable(self, err):
+        return getattr(err, "errno", None) in self.RETRYABLE_ERRNOS
+
+class SQLiteCursor:
+    """sqlite3 cursor with the parts of the mysql-connector cursor API we use."""
+    __slots__ = ("_cursor",)
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, sql, params=None):
+        self._cursor.execute(translate(sql), params or ())
+
+    def executemany(self, sql, seq_of_params):
+        self._cursor.executemany(translate(sql), seq_of_params)
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size):
+        return self._cursor.fetchmany(size)
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def column_names(self):
+        return tuple(d[0] for d in self._cursor.description or ())
+
+    def close(self):
+        self._cursor.close()
+
+class SQLiteConnection:
+    """sqlite3 connection in autocommit mode; transactions are opened explicitly
+    by SQLiteBackend.begin(), so single statements commit on their own."""
+    __slots__ = ("_conn",)
+    unread_result = False  # sqlite3 cursors can be closed mid-result
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self):
+        return SQLiteCursor(self._conn.cursor())
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+    @property
+    def in_transaction(self):
+        return self._conn.in_transaction
+
+    @property
+    def autocommit(self):
+        return not self._conn.in_transaction
+
+    @autocommit.setter
+    def autocommit(self, value):
+        pass  # always autocommit outside begin()
+
+    def is_connected(self):
+        return True
+
+    def consume_results(self):
+        pass
+
+_PLACEHOLDER = re.compile(r"%s")
+_INSERT_IGNORE = re.compile(r"\bINSERT\s+IGNORE\b", re.IGNORECASE)
+_FOR_UPDATE = re.compile(r"\s+FOR\s+UPDATE\b", re.IGNORECASE)
+
+@lru_cache(maxsize=512)
+def translate(sql):
+    """MySQL dialect -> SQLite: placeholders, INSERT IGNORE, and FOR UPDATE
+    (SQLite locks the whole database for the transaction instead)."""
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _INSERT_IGNORE.sub("INSERT OR IGNORE", sql)
+    return _FOR_UPDATE.sub("", sql)
+
+def _as_date(value):
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+def _datediff(a, b):
+    if a is None or b is None:
+        return None
+    return (_as_date(a) - _as_date(b)).days
+
+def _greatest(*args):
+    return None if any(a is None for a in args) else max(args)
+
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda d: d.isoformat(" "))
+sqlite3.register_converter("DATE", lambda b: date.fromisoformat(b.decode()[:10]))
+sqlite3.register_converter("DATETIME", lambda b: datetime.fromisoformat(b.decode()))
+sqlite3.register_converter("DECIMAL", lambda b: float(b))
+
+class SQLiteBackend:
+    name = "sqlite"
+    schema_file = os.path.join(_ROOT, "schema_sqlite.sql")
+    explain_prefix = "EXPLAIN QUERY PLAN "
+    fulltext = False
+    Error = sqlite3.Error
+    PoolExhaustedError = PoolExhaustedError
+
+    # Read-heavy tuning: WAL lets readers run alongside the single writer,
+    # NORMAL sync is safe under WAL, and a large page cache and mmap keep the
+    # catalog in memory.
+    PRAGMAS = (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA foreign_keys = ON",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA cache_size = -65536",
+        "PRAGMA mmap_size = 268435456",
+    )
+
+    def __init__(self, path=None):
+        path = path or os.getenv("LIBRARY_SQLITE_PATH", "library.db")
+        self.memory = path == ":memory:"
+        self._keeper = None
+        self._lock = threading.Lock()
+        if self.memory:
+            # Pool connections share one in-memory database, which lives as
+            # long as any connection to it is open.
+            self.path = f"file:library-{os.getpid()}-{id(self)}?mode=memory&cache=shared"
+        else:
+            self.path = path
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=float(os.getenv("LIBRARY_SQLITE_BUSY_TIMEOUT", 5)),
+                               detect_types=sqlite3.PARSE_DECLTYPES, isolation_level=None,
+                               check_same_thread=False, uri=self.memory)
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        if self.memory:
+            conn.execute("PRAGMA read_uncommitted = ON")
+        conn.create_function("CURDATE", 0, lambda: date.today().isoformat())
+        conn.create_function("DATEDIFF", 2, _datediff, deterministic=True)
+        conn.create_function("GREATEST", -1, _greatest, deterministic=True)
+        if self.memory:
+            with self._lock:
+                if self._keeper is None:
+                    self._keeper = sqlite3.connect(self.path, uri=True, check_same_thread=False)
+        return SQLiteConnection(conn)
+
+    def begin(self, conn):
+        # Take the write lock up front so read-check-write units of work
+        # (loan issuance) serialize instead of failing on upgrade.
+        conn.cursor().execute("BEGIN IMMEDIATE")
+
+    def is_retryable(self, err):
+        return isinstance(err, sqlite3.OperationalError) and "locked" in str(err)
+
+BACKENDS = {"mysql": MySQLBackend, "sqlite": SQLiteBackend}
+
+def get_backend(name=None):
+    name = (name or os.getenv("LIBRARY_DB_BACKEND", "mysql")).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown LIBRARY_DB_BACKEND {name!r}; expected one of {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
@@ -1,11 +1,26 @@
 import sys
 from PySide6.QtWidgets import (QMainWindow, QTabWidget, QWidget, QVBoxLayout, 
                              QLabel, QApplication)
-from gui.views.book_view import BookView
-from gui.views.member_view import MemberView
-from gui.views.loan_view import LoanView
-from gui.views.report_view import ReportView
-from gui.views.dashboard_view import DashboardView
+from PySide6.QtCore import Qt, QTimer
+import startup_trace
+
+class LazyTab(QWidget):
+    """Tab page that builds its view the first time the tab is shown."""
+
+    def __init__(self, factory):
+        super().__init__()
+        self.factory = factory
+        self.view = None
+
+    def ensure_built(self):
+        if self.view is None:
+            self.view = self.factory()
+            layout = self.layout()
+            while layout.count():
+                layout.takeAt(0).widget().deleteLater()
+            layout.setContentsMargins(0, 0, 0, 0)
+            layout.addWidget(self.view)
+        return self.view
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -17,23 +32,77 @@ class MainWindow(QMainWindow):
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
 
-        # Implementation widgets
+        # Views are imported and built when their tab is first opened; only
+        # the current tab is built at startup, and its data loads off-thread.
+        self.dashboard_view = None
+        self.books_view = None
+        self.members_view = None
+        self.loans_view = None
+        self.reports_view = None
+        for title, factory in (("Dashboard", self._build_dashboard),
+                               ("Books", self._build_books),
+                               ("Members", self._build_members),
+                               ("Loans", self._build_loans),
+                               ("Reports", self._build_reports)):
+            page = LazyTab(factory)
+            self._setup_placeholder(page, f"Loading {title.lower()}...")
+            self.tabs.addTab(page, title)
+
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+        self.tabs.currentWidget().ensure_built()
+
+    def _on_tab_changed(self, index):
+        page = self.tabs.widget(index)
+        if page.view is None:
+            # Let the placeholder paint before the view is constructed
+            QTimer.singleShot(0, page.ensure_built)
+
+    def _watch_first_data(self, view):
+        view.data_loaded.connect(startup_trace.finish)
+
+    def _build_dashboard(self):
+        from gui.views.dashboard_view import DashboardView
         self.dashboard_view = DashboardView()
+        self._watch_first_data(self.dashboard_view)
+        return self.dashboard_view
+
+    def _build_books(self):
+        from gui.views.book_view import BookView
         self.books_view = BookView()
+        self.books_view.status_message.connect(self.statusBar().showMessage)
+        self._watch_first_data(self.books_view)
+        return self.books_view
+
+    def _build_members(self):
+        from gui.views.member_view import MemberView
         self.members_view = MemberView()
+        self.members_view.status_message.connect(self.statusBar().showMessage)
+        self._watch_first_data(self.members_view)
+        return self.members_view
+
+    def _build_loans(self):
+        from gui.views.loan_view import LoanView
         self.loans_view = LoanView()
+        self._watch_first_data(self.loans_view)
+        return self.loans_view
+
+    def _build_reports(self):
+        from gui.views.report_view import ReportView
         self.reports_view = ReportView()
+        self.reports_view.status_message.connect(self.statusBar().showMessage)
+        return self.reports_view
 
-        # Add tabs
-        self.tabs.addTab(self.dashboard_view, "Dashboard")
-        self.tabs.addTab(self.books_view, "Books")
-        self.tabs.addTab(self.members_view, "Members")
-        self.tabs.addTab(self.loans_view, "Loans")
-        self.tabs.addTab(self.reports_view, "Reports")
+    def closeEvent(self, event):
+        # Stop report workers at their next row batch or page instead of
+        # letting them finish into a window that is gone
+        if self.reports_view is not None:
+            self.reports_view.cancel_all()
+        super().closeEvent(event)
 
     def _setup_placeholder(self, widget, text):
         layout = QVBoxLayout(widget)
         label = QLabel(text)
+        label.setAlignment(Qt.AlignCenter)
         layout.addWidget(label)
 
 if __name__ == "__main__":
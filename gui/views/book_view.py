@@ -1,34 +1,23 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, 
                              QPushButton, QTableView, QHeaderView, QDialog, 
                              QFormLayout, QLabel, QMessageBox)
-from PySide6.QtCore import Qt, QAbstractTableModel
+from PySide6.QtCore import Signal
 from models.book import Book
+from gui.workers import BackgroundLoad, DebouncedSearch
+from gui.views.paged_model import PagedTableModel
 from models.author import Author
+from database_manager import transaction
+from models.catalog_search import CatalogSearch
 
-class BookTableModel(QAbstractTableModel):
-    def __init__(self, books=None):
-        super().__init__()
-        self._books = books or []
+class BookTableModel(PagedTableModel):
+    def __init__(self, books=None, page_size=None, max_rows=None):
+        super().__init__(books, page_size, max_rows)
         self._headers = ["ID", "Title", "ISBN", "Category", "Shelf", "Qty"]
 
-    def rowCount(self, parent=None):
-        return len(self._books)
-
-    def columnCount(self, parent=None):
-        return len(self._headers)
+    def _key(self, book):
+        return (book.shelf_location, book.id)
 
-    def headerData(self, section, orientation, role):
-        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
-            return self._headers[section]
-        return None
-
-    def data(self, index, role):
-        if not index.isValid() or role != Qt.DisplayRole:
-            return None
-        
-        book = self._books[index.row()]
-        col = index.column()
-        
+    def _cell(self, book, col):
         if col == 0: return book.id
         elif col == 1: return book.title
         elif col == 2: return book.isbn
@@ -37,11 +26,6 @@ class BookTableModel(QAbstractTableModel):
         elif col == 5: return book.quantity
         return None
 
-    def update_data(self, books):
-        self.beginResetModel()
-        self._books = books
-        self.endResetModel()
-
 class AddBookDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -80,14 +64,28 @@ class AddBookDialog(QDialog):
         }
 
 class BookView(QWidget):
+    status_message = Signal(str)
+    data_loaded = Signal()
+    SEARCH_LIMIT = 200
+
     def __init__(self):
         super().__init__()
         self.layout = QVBoxLayout(self)
 
+        # Searches run on the thread pool once typing pauses
+        self.search = DebouncedSearch(self._run_search, parent=self)
+        self.search.results_ready.connect(self._apply_search_results)
+        self.search.search_failed.connect(self._search_failed)
+
+        # The first page loads off the GUI thread; a placeholder shows meanwhile
+        self.loader = BackgroundLoad(self._load_first_page, parent=self)
+        self.loader.loaded.connect(self._apply_first_page)
+        self.loader.failed.connect(self._load_failed)
+
         # Toolbar
         self.toolbar = QHBoxLayout()
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Search by title...")
+        self.search_input.setPlaceholderText("Search by title, author, publisher or category...")
         self.search_input.textChanged.connect(self.search_books)
         
         self.add_btn = QPushButton("Add Book")
@@ -102,21 +100,62 @@ class BookView(QWidget):
         self.model = BookTableModel()
         self.table_view.setModel(self.model)
         self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.placeholder = QLabel("Loading books...")
+        self.layout.addWidget(self.placeholder)
         self.layout.addWidget(self.table_view)
 
+        # Shown when scrolling reaches the model's resident row cap
+        self.truncated_notice = QLabel()
+        self.truncated_notice.hide()
+        self.layout.addWidget(self.truncated_notice)
+        self.model.truncated.connect(self._show_truncated)
+        self.model.modelReset.connect(self.truncated_notice.hide)
+
         self.refresh_data()
 
     def refresh_data(self):
-        books = Book.get_all()
-        self.model.update_data(books)
+        self.loader.start(self.model.page_size)
+
+    @staticmethod
+    def _load_first_page(limit):
+        return Book.get_page(None, limit)
+
+    def _apply_first_page(self, page, elapsed):
+        self.placeholder.hide()
+        self.model.set_pager(Book.get_page, first_page=page)
+        self.data_loaded.emit()
+
+    def _show_truncated(self, rows):
+        text = f"Showing the first {rows:,} books. Use search to find the rest."
+        self.truncated_notice.setText(text)
+        self.truncated_notice.show()
+        self.status_message.emit(text)
+
+    def _load_failed(self, message):
+        self.placeholder.setText(f"Could not load books: {message}")
+        self.placeholder.show()
 
     def search_books(self):
-        text = self.search_input.text()
+        text = self.search_input.text().strip()
         if not text:
+            self.search.cancel()
             self.refresh_data()
             return
-        books = Book.search_by_title(text)
+        self.loader.cancel()
+        self.search.submit(text)
+
+    @staticmethod
+    def _run_search(text):
+        return CatalogSearch.search(text, limit=BookView.SEARCH_LIMIT)
+
+    def _apply_search_results(self, text, books, elapsed):
         self.model.update_data(books)
+        self.placeholder.hide()
+        query = f" matching '{text}'" if text else ""
+        self.status_message.emit(f"{len(books)} book(s){query} in {elapsed * 1000:.0f} ms")
+
+    def _search_failed(self, text, message):
+        self.status_message.emit(f"Search failed: {message}")
 
     def open_add_dialog(self):
         dialog = AddBookDialog(self)
@@ -131,16 +170,16 @@ class BookView(QWidget):
                     shelf_location=data['shelf'],
                     quantity=int(data['qty']) if data['qty'] else 0
                 )
-                book.save()
-                
-                # Handle authors
-                author_names = data['authors'].split(',')
-                for name in author_names:
-                    name = name.strip()
-                    if name:
-                        author = Author(name=name)
-                        author.save()
-                        book.add_author(author.id)
+                # Book and authors are saved together or not at all
+                with transaction():
+                    book.save()
+                    author_names = data['authors'].split(',')
+                    for name in author_names:
+                        name = name.strip()
+                        if name:
+                            author = Author(name=name)
+                            author.save()
+                            book.add_author(author.id)
                 
                 QMessageBox.information(self, "Success", "Book added successfully!")
                 self.refresh_data()
@@ -1,9 +1,8 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QFrame, QPushButton)
-from PySide6.QtCore import Qt
-from models.book import Book
-from models.member import Member
-from models.loan import Loan
+from PySide6.QtCore import Qt, Signal
+from models.stats import LibraryStats
+from gui.workers import BackgroundLoad
 
 class StatCard(QFrame):
     def __init__(self, title, value, color="#2196F3"):
@@ -33,9 +32,14 @@ class StatCard(QFrame):
         layout.addWidget(lbl_title)
 
 class DashboardView(QWidget):
+    data_loaded = Signal()
+
     def __init__(self):
         super().__init__()
         self.layout = QVBoxLayout(self)
+        self.loader = BackgroundLoad(LibraryStats.get, parent=self)
+        self.loader.loaded.connect(self._show_stats)
+        self.loader.failed.connect(self._load_failed)
         
         # Header
         header = QLabel("<h2>Library Dashboard</h2>")
@@ -54,27 +58,30 @@ class DashboardView(QWidget):
         self.refresh_stats()
 
     def refresh_stats(self):
+        # Placeholder cards until the counts arrive from the thread pool
+        if not self.stats_layout.count():
+            self._set_cards(["..."] * 5)
+        self.loader.start()
+
+    def _show_stats(self, stats, elapsed):
+        self._set_cards([stats["total_books"], stats["total_copies"], stats["total_members"],
+                         stats["active_loans"], stats["overdue_loans"]])
+        self.data_loaded.emit()
+
+    def _load_failed(self, message):
+        print(f"Error fetching stats: {message}")
+        self._set_cards(["-"] * 5)
+
+    def _set_cards(self, values):
         # Clear existing widgets in stats layout
         while self.stats_layout.count():
             child = self.stats_layout.takeAt(0)
             if child.widget():
                 child.widget().deleteLater()
 
-        # Fetch Data
-        try:
-            total_books = len(Book.get_all())
-            total_members = len(Member.get_all())
-            active_loans = len(Loan.get_active_loans())
-            overdue_loans = len(Loan.get_overdue_loans())
-        except Exception as e:
-            print(f"Error fetching stats: {e}")
-            total_books = "-"
-            total_members = "-"
-            active_loans = "-"
-            overdue_loans = "-"
-
-        # Add Cards
+        total_books, total_copies, total_members, active_loans, overdue_loans = values
         self.stats_layout.addWidget(StatCard("Total Books", total_books, "#4CAF50"))
+        self.stats_layout.addWidget(StatCard("Total Copies", total_copies, "#009688"))
         self.stats_layout.addWidget(StatCard("Members", total_members, "#2196F3"))
         self.stats_layout.addWidget(StatCard("Active Loans", active_loans, "#FF9800"))
         self.stats_layout.addWidget(StatCard("Overdue", overdue_loans, "#F44336"))
@@ -1,21 +1,23 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, 
                              QPushButton, QTableView, QHeaderView, QDialog, 
                              QFormLayout, QMessageBox, QLabel)
-from PySide6.QtCore import Qt, QAbstractTableModel
+from PySide6.QtCore import Qt, QAbstractTableModel, Signal
 from models.loan import Loan
-from models.book import Book
-from models.member import Member
 from controllers.loan_controller import LoanController
+from gui.workers import BackgroundLoad
 from datetime import date
 
 class LoanTableModel(QAbstractTableModel):
     def __init__(self, loans=None):
         super().__init__()
-        self._loans = loans or []
         self._headers = ["ID", "Member", "Book", "Loan Date", "Due Date", "Status"]
+        self._loans = []
+        self._rows = []
+        if loans:
+            self._set_rows(loans)
 
     def rowCount(self, parent=None):
-        return len(self._loans)
+        return len(self._rows)
 
     def columnCount(self, parent=None):
         return len(self._headers)
@@ -26,27 +28,29 @@ class LoanTableModel(QAbstractTableModel):
         return None
 
     def data(self, index, role):
+        # Rows are fully resolved in update_data; painting must never query.
         if not index.isValid() or role != Qt.DisplayRole:
             return None
-        
-        loan = self._loans[index.row()]
-        col = index.column()
-        
-        if col == 0: return loan.id
-        elif col == 1: 
-            member = Member.get_by_id(loan.member_id)
-            return member.name if member else f"ID: {loan.member_id}"
-        elif col == 2: 
-            book = Book.get_by_id(loan.book_id)
-            return book.title if book else f"ID: {loan.book_id}"
-        elif col == 3: return loan.loan_date
-        elif col == 4: return loan.due_date
-        elif col == 5: return "Returned" if loan.return_date else "Active"
-        return None
+        return self._rows[index.row()][index.column()]
+
+    def _set_rows(self, loans):
+        # loans are the dicts returned by Loan.get_active_loans_detailed()
+        self._loans = loans
+        self._rows = [
+            (l["id"], l["member_name"], l["book_title"], l["loan_date"], l["due_date"],
+             "Returned" if l["return_date"] else "Active")
+            for l in loans
+        ]
+
+    def loan_at(self, row):
+        l = self._loans[row]
+        return Loan(id=l["id"], member_id=l["member_id"], book_id=l["book_id"],
+                    loan_date=l["loan_date"], due_date=l["due_date"],
+                    return_date=l["return_date"], fine_amount=l["fine_amount"])
 
     def update_data(self, loans):
         self.beginResetModel()
-        self._loans = loans
+        self._set_rows(loans)
         self.endResetModel()
 
 class IssueLoanDialog(QDialog):
@@ -72,11 +76,17 @@ class IssueLoanDialog(QDialog):
         }
 
 class LoanView(QWidget):
+    data_loaded = Signal()
+
     def __init__(self):
         super().__init__()
         self.layout = QVBoxLayout(self)
         self.controller = LoanController()
 
+        self.loader = BackgroundLoad(Loan.get_active_loans_detailed, parent=self)
+        self.loader.loaded.connect(self._apply_loans)
+        self.loader.failed.connect(self._load_failed)
+
         # Toolbar
         self.toolbar = QHBoxLayout()
         
@@ -95,14 +105,24 @@ class LoanView(QWidget):
         self.model = LoanTableModel()
         self.table_view.setModel(self.model)
         self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.placeholder = QLabel("Loading loans...")
+        self.layout.addWidget(self.placeholder)
         self.layout.addWidget(self.table_view)
 
         self.refresh_data()
 
     def refresh_data(self):
-        # Fetch only active loans for the main view
-        loans = Loan.get_active_loans()
+        # Only active loans for the main view, fetched off the GUI thread
+        self.loader.start()
+
+    def _apply_loans(self, loans, elapsed):
+        self.placeholder.hide()
         self.model.update_data(loans)
+        self.data_loaded.emit()
+
+    def _load_failed(self, message):
+        self.placeholder.setText(f"Could not load loans: {message}")
+        self.placeholder.show()
 
     def open_issue_dialog(self):
         dialog = IssueLoanDialog(self)
@@ -131,7 +151,7 @@ class LoanView(QWidget):
         
         # Get loan object from model
         row = indexes[0].row()
-        loan = self.model._loans[row]
+        loan = self.model.loan_at(row)
         
         try:
             # Calculate fine
@@ -1,33 +1,20 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, 
                              QPushButton, QTableView, QHeaderView, QDialog, 
-                             QFormLayout, QMessageBox)
-from PySide6.QtCore import Qt, QAbstractTableModel
+                             QFormLayout, QMessageBox, QLabel)
+from PySide6.QtCore import Signal
 from models.member import Member
+from gui.workers import BackgroundLoad, DebouncedSearch
+from gui.views.paged_model import PagedTableModel
 
-class MemberTableModel(QAbstractTableModel):
-    def __init__(self, members=None):
-        super().__init__()
-        self._members = members or []
+class MemberTableModel(PagedTableModel):
+    def __init__(self, members=None, page_size=None, max_rows=None):
+        super().__init__(members, page_size, max_rows)
         self._headers = ["ID", "Name", "National ID", "Phone", "Joined"]
 
-    def rowCount(self, parent=None):
-        return len(self._members)
-
-    def columnCount(self, parent=None):
-        return len(self._headers)
+    def _key(self, member):
+        return member.id
 
-    def headerData(self, section, orientation, role):
-        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
-            return self._headers[section]
-        return None
-
-    def data(self, index, role):
-        if not index.isValid() or role != Qt.DisplayRole:
-            return None
-        
-        member = self._members[index.row()]
-        col = index.column()
-        
+    def _cell(self, member, col):
         if col == 0: return member.id
         elif col == 1: return member.name
         elif col == 2: return member.national_id
@@ -35,11 +22,6 @@ class MemberTableModel(QAbstractTableModel):
         elif col == 4: return member.join_date
         return None
 
-    def update_data(self, members):
-        self.beginResetModel()
-        self._members = members
-        self.endResetModel()
-
 class RegisterMemberDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -66,14 +48,28 @@ class RegisterMemberDialog(QDialog):
         }
 
 class MemberView(QWidget):
+    status_message = Signal(str)
+    data_loaded = Signal()
+    SEARCH_LIMIT = 100
+
     def __init__(self):
         super().__init__()
         self.layout = QVBoxLayout(self)
 
+        # Searches run on the thread pool once typing pauses
+        self.search = DebouncedSearch(self._run_search, parent=self)
+        self.search.results_ready.connect(self._apply_search_results)
+        self.search.search_failed.connect(self._search_failed)
+
+        # The first page loads off the GUI thread; a placeholder shows meanwhile
+        self.loader = BackgroundLoad(self._load_first_page, parent=self)
+        self.loader.loaded.connect(self._apply_first_page)
+        self.loader.failed.connect(self._load_failed)
+
         # Toolbar
         self.toolbar = QHBoxLayout()
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Search by name...")
+        self.search_input.setPlaceholderText("Search by name, national ID or phone...")
         self.search_input.textChanged.connect(self.search_members)
         
         self.reg_btn = QPushButton("Register Member")
@@ -88,21 +84,62 @@ class MemberView(QWidget):
         self.model = MemberTableModel()
         self.table_view.setModel(self.model)
         self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.placeholder = QLabel("Loading members...")
+        self.layout.addWidget(self.placeholder)
         self.layout.addWidget(self.table_view)
 
+        # Shown when scrolling reaches the model's resident row cap
+        self.truncated_notice = QLabel()
+        self.truncated_notice.hide()
+        self.layout.addWidget(self.truncated_notice)
+        self.model.truncated.connect(self._show_truncated)
+        self.model.modelReset.connect(self.truncated_notice.hide)
+
         self.refresh_data()
 
     def refresh_data(self):
-        members = Member.get_all()
-        self.model.update_data(members)
+        self.loader.start(self.model.page_size)
+
+    @staticmethod
+    def _load_first_page(limit):
+        return Member.get_page(None, limit)
+
+    def _apply_first_page(self, page, elapsed):
+        self.placeholder.hide()
+        self.model.set_pager(Member.get_page, first_page=page)
+        self.data_loaded.emit()
+
+    def _show_truncated(self, rows):
+        text = f"Showing the first {rows:,} members. Use search to find the rest."
+        self.truncated_notice.setText(text)
+        self.truncated_notice.show()
+        self.status_message.emit(text)
+
+    def _load_failed(self, message):
+        self.placeholder.setText(f"Could not load members: {message}")
+        self.placeholder.show()
 
     def search_members(self):
-        text = self.search_input.text()
+        text = self.search_input.text().strip()
         if not text:
+            self.search.cancel()
             self.refresh_data()
             return
-        members = Member.search_by_name(text)
+        self.loader.cancel()
+        self.search.submit(text)
+
+    @staticmethod
+    def _run_search(text):
+        return Member.search(text, limit=MemberView.SEARCH_LIMIT)
+
+    def _apply_search_results(self, text, members, elapsed):
         self.model.update_data(members)
+        self.placeholder.hide()
+        query = f" matching '{text}'" if text else ""
+        self.status_message.emit(f"{len(members)} member(s){query} in {elapsed * 1000:.0f} ms")
+
+    def _search_failed(self, text, message):
+        self.status_message.emit(f"Search failed: {message}")
 
     def open_register_dialog(self):
         dialog = RegisterMemberDialog(self)
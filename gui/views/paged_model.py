@@ -0,0 +1,96 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Signal
+
+class PagedTableModel(QAbstractTableModel):
+    """Table model that loads keyset pages on demand as the view scrolls.
+
+    Subclasses set _headers and implement _key(item) (the keyset position of
+    a row) and _cell(item, column). Resident rows are capped at max_rows;
+    when the cap cuts the list short, truncated(row count) is emitted so the
+    view can point the user to search.
+    """
+    PAGE_SIZE = 200
+    MAX_ROWS = 50_000
+
+    truncated = Signal(int)
+
+    def __init__(self, items=None, page_size=None, max_rows=None):
+        super().__init__()
+        self._items = items or []
+        self._headers = []
+        self.page_size = page_size or self.PAGE_SIZE
+        self.max_rows = max_rows or self.MAX_ROWS
+        self._fetch_page = None
+        self._exhausted = True
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._items)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self._headers)
+
+    def headerData(self, section, orientation, role):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self._headers[section]
+        return None
+
+    def data(self, index, role):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        return self._cell(self._items[index.row()], index.column())
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return not self._exhausted and len(self._items) < self.max_rows
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        after = self._key(self._items[-1]) if self._items else None
+        page = self._fetch_page(after, self.page_size)
+        if len(page) < self.page_size:
+            self._exhausted = True
+        page = page[:self.max_rows - len(self._items)]
+        if not page:
+            return
+        start = len(self._items)
+        self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+        self._items.extend(page)
+        self.endInsertRows()
+        if self.is_truncated():
+            self.truncated.emit(len(self._items))
+
+    def is_truncated(self):
+        return not self._exhausted and len(self._items) >= self.max_rows
+
+    def set_pager(self, fetch_page, first_page=None):
+        """Switch to lazy loading with fetch_page(after, limit). Page one is
+        fetched now unless the caller already loaded it (e.g. off-thread)."""
+        self.beginResetModel()
+        self._fetch_page = fetch_page
+        if first_page is None:
+            self._items = []
+            self._exhausted = False
+        else:
+            self._items = list(first_page[:self.max_rows])
+            self._exhausted = len(first_page) < self.page_size
+        self.endResetModel()
+        if first_page is None:
+            self.fetchMore()
+        elif self.is_truncated():
+            self.truncated.emit(len(self._items))
+
+    def update_data(self, items):
+        self.beginResetModel()
+        self._items = items
+        self._fetch_page = None
+        self._exhausted = True
+        self.endResetModel()
+
+    def _key(self, item):
+        raise NotImplementedError
+
+    def _cell(self, item, column):
+        raise NotImplementedError
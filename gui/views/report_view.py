@@ -1,15 +1,56 @@
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QLabel, 
-                             QMessageBox, QGroupBox)
-from reports.pdf_generator import PDFGenerator
+from PySide6.QtCore import QThreadPool, Signal
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+                             QMessageBox, QGroupBox, QProgressBar)
 from gui.pdf_viewer import PDFViewerWindow
-import os
+from gui.workers import ReportWorker
+
+# report key -> (button text, PDFGenerator method, file name)
+REPORTS = {
+    "inventory": ("Generate Inventory Report", "generate_inventory_report", "inventory_report.pdf"),
+    "overdue": ("Generate Overdue Loans Report", "generate_overdue_report", "overdue_report.pdf"),
+    "active": ("Generate Active Loans Report", "generate_active_loans_report", "active_loans_report.pdf"),
+    "members": ("Generate Member Directory", "generate_member_report", "member_report.pdf"),
+}
+
+class ReportRow(QWidget):
+    """Generate button plus progress and cancel controls for one report."""
+
+    def __init__(self, text):
+        super().__init__()
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.button = QPushButton(text)
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 0)  # row totals aren't known up front
+        self.progress.setMaximumWidth(120)
+        self.status = QLabel()
+        self.cancel_button = QPushButton("Cancel")
+        layout.addWidget(self.button, 2)
+        layout.addWidget(self.progress)
+        layout.addWidget(self.status, 1)
+        layout.addWidget(self.cancel_button)
+        self.set_running(False)
+
+    def set_running(self, running):
+        self.button.setEnabled(not running)
+        self.progress.setVisible(running)
+        self.cancel_button.setVisible(running)
+        self.cancel_button.setEnabled(running)
 
 class ReportView(QWidget):
+    status_message = Signal(str)
+    # Reports run on their own pool so they never hold the global pool's
+    # threads that searches, tab loads and the connection warmer share
+    MAX_REPORT_THREADS = 2
+
     def __init__(self):
         super().__init__()
         self.layout = QVBoxLayout(self)
-        self.pdf_gen = PDFGenerator()
         self.viewers = []  # Keep references to prevent garbage collection
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(self.MAX_REPORT_THREADS)
+        self.workers = {}  # report key -> running ReportWorker
+        self.rows = {}
 
         self.layout.addWidget(QLabel("<h2>Generate Reports</h2>"))
 
@@ -17,44 +58,76 @@ class ReportView(QWidget):
         group = QGroupBox("PDF Reports")
         group_layout = QVBoxLayout()
 
-        self.btn_inventory = QPushButton("Generate Inventory Report")
-        self.btn_overdue = QPushButton("Generate Overdue Loans Report")
-        self.btn_active = QPushButton("Generate Active Loans Report")
-        self.btn_members = QPushButton("Generate Member Directory")
-
-        self.btn_inventory.clicked.connect(lambda: self.generate_report("inventory"))
-        self.btn_overdue.clicked.connect(lambda: self.generate_report("overdue"))
-        self.btn_active.clicked.connect(lambda: self.generate_report("active"))
-        self.btn_members.clicked.connect(lambda: self.generate_report("members"))
-
-        group_layout.addWidget(self.btn_inventory)
-        group_layout.addWidget(self.btn_overdue)
-        group_layout.addWidget(self.btn_active)
-        group_layout.addWidget(self.btn_members)
-        
+        # Each report renders on its own worker, so several can run at once
+        for report, (text, _, _) in REPORTS.items():
+            row = ReportRow(text)
+            row.button.clicked.connect(lambda _=False, r=report: self.generate_report(r))
+            row.cancel_button.clicked.connect(lambda _=False, r=report: self.cancel_report(r))
+            self.rows[report] = row
+            group_layout.addWidget(row)
+
         group.setLayout(group_layout)
         self.layout.addWidget(group)
         self.layout.addStretch()
 
     def generate_report(self, report_type):
-        try:
-            filename = ""
-            if report_type == "inventory":
-                filename = self.pdf_gen.generate_inventory_report()
-            elif report_type == "overdue":
-                filename = self.pdf_gen.generate_overdue_report()
-            elif report_type == "active":
-                filename = self.pdf_gen.generate_active_loans_report()
-            elif report_type == "members":
-                filename = self.pdf_gen.generate_member_report()
-            
-            # Show the PDF Viewer automatically
-            viewer = PDFViewerWindow(self)
-            viewer.open_pdf(filename)
-            viewer.show()
-            self.viewers.append(viewer)
-            # Cleanup closed viewers
-            self.viewers = [v for v in self.viewers if v.isVisible() or v.isEnabled()]
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to generate report: {e}")
+        if report_type in self.workers:
+            return
+        _, method, filename = REPORTS[report_type]
+        worker = ReportWorker(report_type, method, filename)
+        worker.signals.progress.connect(self._on_progress)
+        worker.signals.finished.connect(self._on_finished)
+        worker.signals.failed.connect(self._on_failed)
+        worker.signals.cancelled.connect(self._on_cancelled)
+        self.workers[report_type] = worker
+        row = self.rows[report_type]
+        busy = self.pool.activeThreadCount() >= self.pool.maxThreadCount()
+        row.status.setText("Queued..." if busy else "Fetching rows...")
+        row.set_running(True)
+        self.pool.start(worker)
+
+    def cancel_report(self, report_type):
+        worker = self.workers.get(report_type)
+        if worker is None:
+            return
+        worker.cancel()
+        self.rows[report_type].cancel_button.setEnabled(False)
+        self.rows[report_type].status.setText("Cancelling...")
+        if self.pool.tryTake(worker):
+            self._on_cancelled(report_type)  # never started
+
+    def cancel_all(self):
+        for report_type in list(self.workers):
+            self.cancel_report(report_type)
+
+    def _done(self, report_type, text):
+        self.workers.pop(report_type, None)
+        row = self.rows[report_type]
+        row.set_running(False)
+        row.status.setText(text)
+
+    def _on_progress(self, report_type, rows, pages):
+        if report_type in self.workers and not self.workers[report_type].cancelled:
+            self.rows[report_type].status.setText(f"{rows:,} rows, {pages:,} page(s)")
+
+    def _on_finished(self, report_type, filename, elapsed, cached):
+        if cached:
+            self._done(report_type, "Unchanged, reopened")
+            self.status_message.emit(f"No changes since {filename} was generated; reopened it")
+        else:
+            self._done(report_type, f"Done in {elapsed:.1f} s")
+            self.status_message.emit(f"{filename} generated in {elapsed:.1f} s")
+        # Show the PDF Viewer automatically
+        viewer = PDFViewerWindow(self)
+        viewer.open_pdf(filename)
+        viewer.show()
+        self.viewers.append(viewer)
+        # Cleanup closed viewers
+        self.viewers = [v for v in self.viewers if v.isVisible() or v.isEnabled()]
+
+    def _on_failed(self, report_type, message):
+        self._done(report_type, "Failed")
+        QMessageBox.critical(self, "Error", f"Failed to generate report: {message}")
+
+    def _on_cancelled(self, report_type):
+        self._done(report_type, "Cancelled")
@@ -0,0 +1,177 @@
+import time
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+
+class WorkerSignals(QObject):
+    finished = Signal(int, object, float)  # request id, result, elapsed seconds
+    failed = Signal(int, str)
+
+class QueryWorker(QRunnable):
+    """Runs a blocking model call on a QThreadPool thread."""
+
+    def __init__(self, request_id, fn, *args, **kwargs):
+        super().__init__()
+        # Python owns the runnable so it can still be cancelled after it ran
+        self.setAutoDelete(False)
+        self.request_id = request_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self.cancelled = False
+
+    def run(self):
+        if self.cancelled:
+            return
+        start = time.perf_counter()
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.failed.emit(self.request_id, str(e))
+            return
+        if not self.cancelled:
+            self.signals.finished.emit(self.request_id, result, time.perf_counter() - start)
+
+class DebouncedSearch(QObject):
+    """Runs only the latest search once typing pauses; stale results are dropped."""
+    results_ready = Signal(str, object, float)  # text, result, elapsed seconds
+    search_failed = Signal(str, str)  # text, error message
+
+    def __init__(self, search_fn, delay_ms=250, parent=None):
+        super().__init__(parent)
+        self._search_fn = search_fn
+        self._pool = QThreadPool.globalInstance()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._start)
+        self._request_id = 0
+        self._text = ""
+        self._current = None
+
+    def submit(self, text):
+        self._request_id += 1
+        self._text = text
+        self._cancel_current()
+        self._timer.start()
+
+    def cancel(self):
+        self._request_id += 1
+        self._timer.stop()
+        self._cancel_current()
+
+    def _start(self):
+        worker = QueryWorker(self._request_id, self._search_fn, self._text)
+        worker.signals.finished.connect(self._on_finished)
+        worker.signals.failed.connect(self._on_failed)
+        self._current = worker
+        self._pool.start(worker)
+
+    def _cancel_current(self):
+        if self._current is not None:
+            self._current.cancelled = True
+            self._pool.tryTake(self._current)
+            self._current = None
+
+    def _on_finished(self, request_id, result, elapsed):
+        if request_id != self._request_id:
+            return
+        self._current = None
+        self.results_ready.emit(self._text, result, elapsed)
+
+    def _on_failed(self, request_id, message):
+        if request_id != self._request_id:
+            return
+        self._current = None
+        self.search_failed.emit(self._text, message)
+
+class BackgroundLoad(QObject):
+    """Runs a data load on the thread pool; a newer start() or cancel()
+    discards the result of the one in flight."""
+    loaded = Signal(object, float)  # result, elapsed seconds
+    failed = Signal(str)
+
+    def __init__(self, load_fn, parent=None):
+        super().__init__(parent)
+        self._load_fn = load_fn
+        self._pool = QThreadPool.globalInstance()
+        self._request_id = 0
+        self._current = None
+
+    def start(self, *args):
+        self.cancel()
+        worker = QueryWorker(self._request_id, self._load_fn, *args)
+        worker.signals.finished.connect(self._on_finished)
+        worker.signals.failed.connect(self._on_failed)
+        self._current = worker
+        self._pool.start(worker)
+
+    def cancel(self):
+        self._request_id += 1
+        if self._current is not None:
+            self._current.cancelled = True
+            self._pool.tryTake(self._current)
+            self._current = None
+
+    def is_running(self):
+        return self._current is not None
+
+    def _on_finished(self, request_id, result, elapsed):
+        if request_id != self._request_id:
+            return
+        self._current = None
+        self.loaded.emit(result, elapsed)
+
+    def _on_failed(self, request_id, message):
+        if request_id != self._request_id:
+            return
+        self._current = None
+        self.failed.emit(message)
+
+class ReportSignals(QObject):
+    progress = Signal(str, int, int)  # report, rows fetched, pages laid out
+    finished = Signal(str, str, float, bool)  # report, file name, elapsed seconds, from cache
+    failed = Signal(str, str)
+    cancelled = Signal(str)
+
+class ReportWorker(QRunnable):
+    """Builds one PDF report on a QThreadPool thread."""
+    PROGRESS_INTERVAL = 0.1  # seconds between progress signals
+
+    def __init__(self, report, method, filename):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.report = report
+        self.method = method
+        self.filename = filename
+        self.signals = ReportSignals()
+        self.cancelled = False
+        self._last_progress = 0.0
+
+    def cancel(self):
+        self.cancelled = True
+
+    def _progress(self, rows, pages):
+        now = time.perf_counter()
+        if now - self._last_progress >= self.PROGRESS_INTERVAL:
+            self._last_progress = now
+            self.signals.progress.emit(self.report, rows, pages)
+
+    def run(self):
+        # reportlab loads on first use, not when the GUI starts
+        from reports.pdf_generator import PDFGenerator, ReportCancelled
+        from reports.report_cache import report_cache
+        start = time.perf_counter()
+        generator = PDFGenerator(progress=self._progress, is_cancelled=lambda: self.cancelled)
+        try:
+            filename, cached = report_cache.generate(generator, self.method, filename=self.filename)
+        except ReportCancelled:
+            self.signals.cancelled.emit(self.report)
+            return
+        except Exception as e:
+            self.signals.failed.emit(self.report, str(e))
+            return
+        if self.cancelled:
+            self.signals.cancelled.emit(self.report)
+        else:
+            self.signals.finished.emit(self.report, filename, time.perf_counter() - start, cached)
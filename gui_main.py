@@ -1,7 +1,16 @@
+import startup_trace  # first, so the startup trace starts at t=0
 import sys
 import os
+from PySide6.QtCore import QThreadPool, QTimer
 from PySide6.QtWidgets import QApplication
+from database_manager import BaseEntity
 from gui.main_window import MainWindow
+from gui.workers import QueryWorker
+from models.author import Author
+from models.book import Book
+from models.member import Member
+
+startup_trace.mark("imports")
 
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
@@ -13,8 +22,24 @@ def resource_path(relative_path):
 
     return os.path.join(base_path, relative_path)
 
+def enable_identity_caches():
+    # The views look the same books/members up repeatedly; LIBRARY_ID_CACHE_SIZE=0 turns this off
+    size = int(os.getenv("LIBRARY_ID_CACHE_SIZE", 2048))
+    ttl = float(os.getenv("LIBRARY_ID_CACHE_TTL", 60))
+    if size > 0:
+        for model in (Book, Member, Author):
+            model.enable_cache(size, ttl)
+
+def warm_pool():
+    # Opens the first database connection while the window is being built
+    BaseEntity._get_connection().close()
+    startup_trace.mark("pool")
+
 def main():
     app = QApplication(sys.argv)
+    enable_identity_caches()
+    warmer = QueryWorker(0, warm_pool)
+    QThreadPool.globalInstance().start(warmer)
     
     # Set application style
     app.setStyle("Fusion")
@@ -28,7 +53,10 @@ def main():
         print(f"Could not load stylesheet: {e}")
     
     window = MainWindow()
+    startup_trace.mark("window")
     window.show()
+    # Runs on the first event loop pass, after the window's first paint
+    QTimer.singleShot(0, lambda: startup_trace.mark("first paint"))
     
     sys.exit(app.exec())
 
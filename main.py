@@ -1,13 +1,14 @@
+import startup_trace  # first, so --profile-startup sees every import
 import sys
+if "--profile-startup" in sys.argv:
+    startup_trace.profile_imports()
 import os
 from datetime import date, datetime
-from tabulate import tabulate
-from models.book import Book
-from models.member import Member
-from models.author import Author
-from models.loan import Loan
-from controllers.loan_controller import LoanController
-from reports.pdf_generator import PDFGenerator
+
+# Models, the database driver, tabulate and reportlab are imported where they
+# are first used, so the menu comes up without loading them.
+
+startup_trace.mark("imports")
 
 # ANSI Colors
 GREEN = "\033[92m"
@@ -31,10 +32,28 @@ def print_error(text):
 def print_warning(text):
     print(f"{YELLOW}WARNING: {text}{RESET}")
 
+def tabulate(*args, **kwargs):
+    from tabulate import tabulate as _tabulate
+    return _tabulate(*args, **kwargs)
+
 class LibraryCLI:
     def __init__(self):
-        self.loan_controller = LoanController()
-        self.pdf_gen = PDFGenerator()
+        self._loan_controller = None
+        self._pdf_gen = None
+
+    @property
+    def loan_controller(self):
+        if self._loan_controller is None:
+            from controllers.loan_controller import LoanController
+            self._loan_controller = LoanController()
+        return self._loan_controller
+
+    @property
+    def pdf_gen(self):
+        if self._pdf_gen is None:
+            from reports.pdf_generator import PDFGenerator
+            self._pdf_gen = PDFGenerator()
+        return self._pdf_gen
 
     def main_menu(self):
         while True:
@@ -44,6 +63,7 @@ class LibraryCLI:
             print("3. Loan Operations")
             print("4. Reports")
             print("5. Help")
+            print("6. Query Statistics")
             print("0. Exit")
             
             choice = input(f"\n{BOLD}Select an option: {RESET}")
@@ -58,6 +78,8 @@ class LibraryCLI:
                 self.report_menu()
             elif choice == "5":
                 self.show_help()
+            elif choice == "6":
+                self.show_query_stats()
             elif choice == "0":
                 print_header("GOODBYE")
                 sys.exit(0)
@@ -69,8 +91,9 @@ class LibraryCLI:
         while True:
             print_header("BOOK MANAGEMENT")
             print("1. Add New Book")
-            print("2. Search Book by Title")
+            print("2. Search Catalog (title, author, publisher, category)")
             print("3. Search Book by ISBN")
+            print("4. Bulk Import Catalog (CSV/JSONL)")
             print("0. Back to Main Menu")
             
             choice = input(f"\n{BOLD}Select an option: {RESET}")
@@ -80,12 +103,17 @@ class LibraryCLI:
                 self.search_books_title()
             elif choice == "3":
                 self.search_book_isbn()
+            elif choice == "4":
+                self.import_catalog()
             elif choice == "0":
                 break
             else:
                 print_error("Invalid option.")
 
     def add_book(self):
+        from database_manager import transaction
+        from models.author import Author
+        from models.book import Book
         print_header("ADD NEW BOOK")
         try:
             title = input("Title: ")
@@ -95,30 +123,31 @@ class LibraryCLI:
             publish_year = input("Publish Year (optional): ")
             shelf = input("Shelf Location: ")
             qty = input("Quantity: ")
+            author_names = input("Author(s) (comma separated): ").split(',')
             
             book = Book(
                 title=title, isbn=isbn, category=category, publisher=publisher,
                 publish_year=int(publish_year) if publish_year else None,
                 shelf_location=shelf, quantity=int(qty)
             )
-            book.save()
-            
-            # Handle Authors
-            author_names = input("Author(s) (comma separated): ").split(',')
-            for name in author_names:
-                name = name.strip()
-                if not name: continue
-                author = Author(name=name)
-                author.save()
-                book.add_author(author.id)
+            # Book and authors are saved together or not at all
+            with transaction():
+                book.save()
+                for name in author_names:
+                    name = name.strip()
+                    if not name: continue
+                    author = Author(name=name)
+                    author.save()
+                    book.add_author(author.id)
                 
             print_success(f"Book '{title}' added successfully!")
         except Exception as e:
             print_error(f"Failed to add book: {e}")
 
     def search_books_title(self):
-        title = input("Enter title keywords: ")
-        books = Book.search_by_title(title)
+        from models.catalog_search import CatalogSearch
+        title = input("Enter keywords: ")
+        books = CatalogSearch.search(title)
         if not books:
             print_warning("No books found.")
             return
@@ -127,6 +156,7 @@ class LibraryCLI:
         print(tabulate(data, headers=["ID", "Title", "ISBN", "Category", "Shelf", "Qty"], tablefmt="grid"))
 
     def search_book_isbn(self):
+        from models.book import Book
         isbn = input("Enter ISBN: ")
         book = Book.get_by_isbn(isbn)
         if not book:
@@ -136,12 +166,34 @@ class LibraryCLI:
         data = [[book.id, book.title, book.isbn, book.category, book.shelf_location, book.quantity]]
         print(tabulate(data, headers=["ID", "Title", "ISBN", "Category", "Shelf", "Qty"], tablefmt="grid"))
 
+    def import_catalog(self):
+        print_header("BULK IMPORT CATALOG")
+        path = input("File path (.csv or .jsonl): ").strip()
+        if not os.path.isfile(path):
+            print_error("File not found.")
+            return
+        try:
+            def progress(result):
+                print(f"\r{result['imported']} imported, {len(result['rejected'])} rejected", end="", flush=True)
+
+            from controllers.catalog_importer import CatalogImporter
+            result = CatalogImporter(progress=progress).import_file(path)
+            print()
+            print_success(f"Imported {result['imported']} books in {result['elapsed']:.1f}s "
+                          f"({result['rows_per_sec']:.0f} rows/s), {result['authors_created']} new authors.")
+            if result["rejected"]:
+                print_warning(f"{len(result['rejected'])} row(s) rejected:")
+                data = [[r["line"], r["reason"]] for r in result["rejected"][:20]]
+                print(tabulate(data, headers=["Line", "Reason"], tablefmt="grid"))
+        except Exception as e:
+            print_error(f"Import failed: {e}")
+
     # --- Member Management ---
     def member_menu(self):
         while True:
             print_header("MEMBER MANAGEMENT")
             print("1. Register New Member")
-            print("2. Search Member by Name")
+            print("2. Search Member (name, national ID or phone)")
             print("0. Back to Main Menu")
             
             choice = input(f"\n{BOLD}Select an option: {RESET}")
@@ -155,6 +207,7 @@ class LibraryCLI:
                 print_error("Invalid option.")
 
     def add_member(self):
+        from models.member import Member
         print_header("REGISTER MEMBER")
         try:
             name = input("Name: ")
@@ -167,8 +220,9 @@ class LibraryCLI:
             print_error(f"Failed to register member: {e}")
 
     def search_members(self):
-        name = input("Enter name: ")
-        members = Member.search_by_name(name)
+        from models.member import Member
+        name = input("Enter name, national ID or phone: ")
+        members = Member.search(name)
         if not members:
             print_warning("No members found.")
             return
@@ -206,7 +260,8 @@ class LibraryCLI:
                 bid = int(book_input)
             else:
                 # Search by title
-                books = Book.search_by_title(book_input)
+                from models.catalog_search import CatalogSearch
+                books = CatalogSearch.search(book_input, limit=20)
                 if not books:
                     print_error("No books found with that title.")
                     return
@@ -230,6 +285,7 @@ class LibraryCLI:
             print_error(f"Error: {e}")
 
     def return_book(self):
+        from models.loan import Loan
         print_header("RETURN BOOK")
         try:
             loan_id = int(input("Enter Loan ID: "))
@@ -262,32 +318,94 @@ class LibraryCLI:
 
     # --- Reports ---
     def report_menu(self):
+        reports = {
+            "1": ("generate_inventory_report", "Inventory"),
+            "2": ("generate_overdue_report", "Overdue"),
+            "3": ("generate_active_loans_report", "Active loans"),
+            "4": ("generate_member_report", "Member"),
+        }
         while True:
             print_header("REPORTS")
             print("1. Generate Inventory PDF")
             print("2. Generate Overdue Loans PDF")
             print("3. Generate Active Loans PDF")
             print("4. Generate Member Directory PDF")
+            print("5. View Overdue Loans")
+            print("6. View Active Loans")
             print("0. Back to Main Menu")
             
             choice = input(f"\n{BOLD}Select an option: {RESET}")
-            if choice == "1":
-                fname = self.pdf_gen.generate_inventory_report()
-                print_success(f"Inventory report saved to {os.path.abspath(fname)}")
-            elif choice == "2":
-                fname = self.pdf_gen.generate_overdue_report()
-                print_success(f"Overdue report saved to {os.path.abspath(fname)}")
-            elif choice == "3":
-                fname = self.pdf_gen.generate_active_loans_report()
-                print_success(f"Active loans report saved to {os.path.abspath(fname)}")
-            elif choice == "4":
-                fname = self.pdf_gen.generate_member_report()
-                print_success(f"Member report saved to {os.path.abspath(fname)}")
+            if choice in reports:
+                self.generate_report(*reports[choice])
+            elif choice == "5":
+                self.show_overdue_loans()
+            elif choice == "6":
+                self.show_active_loans()
             elif choice == "0":
                 break
             else:
                 print_error("Invalid option.")
 
+    def generate_report(self, method, label):
+        from reports.report_cache import report_cache
+        fname, cached = report_cache.generate(self.pdf_gen, method)
+        if cached:
+            print_success(f"{label} report unchanged since last run: {os.path.abspath(fname)}")
+        else:
+            print_success(f"{label} report saved to {os.path.abspath(fname)}")
+
+    def show_overdue_loans(self):
+        from models.loan import Loan
+        loans = Loan.get_overdue_loans_detailed()
+        if not loans:
+            print_success("No overdue loans.")
+            return
+
+        data = [[l["id"], l["member_name"], l["book_title"], l["due_date"], l["days_late"]] for l in loans]
+        print(tabulate(data, headers=["Loan ID", "Member", "Book Title", "Due Date", "Days Late"], tablefmt="grid"))
+        print_warning(f"{len(loans)} overdue loan(s).")
+
+    def show_active_loans(self):
+        from models.loan import Loan
+        loans = Loan.get_active_loans_detailed()
+        if not loans:
+            print_warning("No active loans.")
+            return
+
+        data = [[l["id"], l["member_name"], l["book_title"], l["loan_date"], l["due_date"]] for l in loans]
+        print(tabulate(data, headers=["Loan ID", "Member", "Book Title", "Loan Date", "Due Date"], tablefmt="grid"))
+        print(f"{len(loans)} active loan(s).")
+
+    # --- Diagnostics ---
+    def show_query_stats(self):
+        import query_stats
+        from database_manager import pool_metrics
+        print_header("QUERY STATISTICS")
+        summary = query_stats.stats.summary()
+        if not summary["statements"]:
+            print_warning("No queries recorded yet in this session.")
+            return
+
+        data = [[c["calls"], c["rows"], f"{c['total_ms']:.1f}", site]
+                for site, c in sorted(summary["call_sites"].items(), key=lambda i: -i[1]["total_ms"])]
+        print(tabulate(data, headers=["Calls", "Rows", "Total ms", "Call Site"], tablefmt="grid"))
+
+        data = [[s["calls"], f"{s['avg_ms']:.2f}", f"{s['max_ms']:.2f}", s["sql"][:70]]
+                for s in summary["statements"][:15]]
+        print(tabulate(data, headers=["Calls", "Avg ms", "Max ms", "Statement"], tablefmt="grid"))
+
+        pool = pool_metrics()
+        if pool:
+            print(f"Pool: {pool['in_use']} in use, {pool['idle']} idle of {pool['size']}; "
+                  f"{pool['exhaustion_count']} waits for a free connection, "
+                  f"avg checkout wait {pool['wait_ms_avg']:.2f} ms")
+        print(f"Slow query threshold: {summary['slow_query_ms']:.0f} ms (logged with EXPLAIN to library_system.log)")
+
+        path = input("\nSave full summary as JSON (path, blank to skip): ").strip()
+        if path:
+            query_stats.stats.dump_json(path)
+            print_success(f"Query statistics saved to {os.path.abspath(path)}")
+
     # --- Help ---
     def show_help(self):
         print_header("USER GUIDE & HELP")
@@ -303,7 +421,16 @@ class LibraryCLI:
         input("\nPress Enter to return to main menu...")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from cli_commands import run
+        code = run(sys.argv[1:])
+        if code is not None:
+            sys.exit(code)
+
     app = LibraryCLI()
+    startup_trace.mark("first prompt")
+    if "--profile-startup" in sys.argv:
+        startup_trace.print_report()
     try:
         app.main_menu()
     except KeyboardInterrupt:
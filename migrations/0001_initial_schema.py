@@ -0,0 +1,7 @@
+from database_manager import backend
+from migrations import run_sql_file
+
+def up(cursor):
+    # CREATE TABLE IF NOT EXISTS throughout, so databases created before
+    # migrations existed pass through unchanged and are fixed up by 0002.
+    run_sql_file(cursor, backend.schema_file)
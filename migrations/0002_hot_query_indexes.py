@@ -0,0 +1,14 @@
+from migrations import add_index_if_missing
+
+def up(cursor):
+    # Search, paging and phone lookups (previously applied by hand from the README)
+    add_index_if_missing(cursor, "books", "ft_books", "title, publisher, category", "FULLTEXT INDEX")
+    add_index_if_missing(cursor, "authors", "ft_author_name", "name", "FULLTEXT INDEX")
+    add_index_if_missing(cursor, "members", "idx_phone", "phone")
+    add_index_if_missing(cursor, "books", "idx_shelf", "shelf_location, id")
+
+    # Open and overdue loans: return_date IS NULL [AND due_date < CURDATE()]
+    add_index_if_missing(cursor, "loans", "idx_loans_open_due", "return_date, due_date")
+    # Per-member limit and per-book availability checks at issue time
+    add_index_if_missing(cursor, "loans", "idx_loans_member_open", "member_id, return_date")
+    add_index_if_missing(cursor, "loans", "idx_loans_book_open", "book_id, return_date")
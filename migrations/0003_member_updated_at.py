@@ -0,0 +1,13 @@
+from database_manager import backend
+from migrations import add_column_if_missing, add_index_if_missing
+
+def up(cursor):
+    # Lets MemberIndex pick up members renamed by other processes
+    if backend.name == "sqlite":
+        # ALTER TABLE can't add a CURRENT_TIMESTAMP default here; existing rows
+        # stay NULL and Member.save stamps updates itself
+        add_column_if_missing(cursor, "members", "updated_at", "DATETIME")
+    else:
+        add_column_if_missing(cursor, "members", "updated_at",
+                              "TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP")
+    add_index_if_missing(cursor, "members", "idx_members_updated", "updated_at")
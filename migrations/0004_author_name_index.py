@@ -0,0 +1,8 @@
+from database_manager import backend
+from migrations import add_index_if_missing
+
+def up(cursor):
+    # The importer looks authors up by name, ignoring case. MySQL's default
+    # collation already does; SQLite needs the NOCASE collation on the index.
+    columns = "name COLLATE NOCASE" if backend.name == "sqlite" else "name"
+    add_index_if_missing(cursor, "authors", "idx_author_name", columns)
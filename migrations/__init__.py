@@ -0,0 +1,112 @@
+"""Versioned, forward-only schema migrations.
+
+Each migration is a module named NNNN_description.py in this package with an
+up(cursor) function. Applied versions are recorded in schema_migrations, and
+`python -m migrations` applies the pending ones in order.
+
+MySQL commits DDL implicitly, so a migration that fails halfway is not rolled
+back. Write migrations so they can be rerun (see add_index_if_missing).
+schema.sql (schema_sqlite.sql on SQLite) stays the full current schema: 0001
+applies it to an empty database, and later migrations bring older databases
+up to date.
+"""
+import importlib
+import pkgutil
+import re
+import time
+from database_manager import BaseEntity, backend
+
+_MODULE_NAME = re.compile(r"^(\d{4})_\w+$")
+
+def discover():
+    """[(version, module_name)] for every migration in the package, in order."""
+    found = []
+    for module in pkgutil.iter_modules(__path__):
+        match = _MODULE_NAME.match(module.name)
+        if match:
+            found.append((int(match.group(1)), module.name))
+    return sorted(found)
+
+def _connect():
+    conn = BaseEntity._connect()
+    conn.autocommit = True
+    return conn
+
+def _applied(cursor):
+    cursor.execute("""CREATE TABLE IF NOT EXISTS schema_migrations (
+                          version INT PRIMARY KEY,
+                          name VARCHAR(255) NOT NULL,
+                          applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+                      )""")
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+def status():
+    """[(version, name, applied)] for every known migration."""
+    conn = _connect()
+    cursor = conn.cursor()
+    try:
+        applied = _applied(cursor)
+    finally:
+        cursor.close()
+        conn.close()
+    return [(version, name, version in applied) for version, name in discover()]
+
+def migrate(target=None, log=print):
+    """Apply pending migrations up to `target` (default: all). Returns their names."""
+    conn = _connect()
+    cursor = conn.cursor()
+    ran = []
+    try:
+        applied = _applied(cursor)
+        for version, name in discover():
+            if version in applied or (target is not None and version > target):
+                continue
+            log(f"Applying {name} ...")
+            start = time.perf_counter()
+            importlib.import_module(f"{__name__}.{name}").up(cursor)
+            cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                           (version, name))
+            log(f"  done in {time.perf_counter() - start:.2f} s")
+            ran.append(name)
+    finally:
+        cursor.close()
+        conn.close()
+    return ran
+
+def run_sql_file(cursor, path):
+    with open(path, encoding="utf-8") as f:
+        statements = [s.strip() for s in f.read().split(";")]
+    for statement in statements:
+        if statement:
+            cursor.execute(statement)
+
+def index_exists(cursor, table, index):
+    if backend.name == "sqlite":
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND name = %s",
+                       (table, index))
+    else:
+        cursor.execute("""SELECT 1 FROM information_schema.statistics
+                          WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+                          LIMIT 1""", (table, index))
+    return cursor.fetchone() is not None
+
+def add_index_if_missing(cursor, table, index, columns, kind="INDEX"):
+    if backend.name == "sqlite":
+        if kind == "INDEX":  # SQLite has no FULLTEXT indexes
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({columns})")
+    elif not index_exists(cursor, table, index):
+        cursor.execute(f"ALTER TABLE {table} ADD {kind} {index} ({columns})")
+
+def column_exists(cursor, table, column):
+    if backend.name == "sqlite":
+        cursor.execute(f"PRAGMA table_info({table})")
+        return any(row[1] == column for row in cursor.fetchall())
+    cursor.execute("""SELECT 1 FROM information_schema.columns
+                      WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s""",
+                   (table, column))
+    return cursor.fetchone() is not None
+
+def add_column_if_missing(cursor, table, column, definition):
+    if not column_exists(cursor, table, column):
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
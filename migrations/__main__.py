@@ -0,0 +1,30 @@
+import argparse
+import sys
+from migrations import migrate, status
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m migrations",
+                                     description="Apply pending schema migrations.")
+    parser.add_argument("--status", action="store_true", help="list migrations and exit")
+    parser.add_argument("--target", type=int, metavar="VERSION",
+                        help="stop after this version")
+    parser.add_argument("--check-plans", action="store_true",
+                        help="EXPLAIN the hot model queries; exit 1 if any does a full table scan")
+    args = parser.parse_args(argv)
+
+    if args.status:
+        for version, name, applied in status():
+            print(f"{'applied' if applied else 'pending':8} {name}")
+        return 0
+    if args.check_plans:
+        from migrations.plans import check_plans
+        failures = check_plans()
+        print(f"{failures} full scan(s)" if failures else "No full table scans.")
+        return 1 if failures else 0
+
+    ran = migrate(args.target)
+    print(f"Applied {len(ran)} migration(s)." if ran else "Schema is up to date.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""EXPLAIN the hot model queries and flag any that scan a whole table.
+
+The SQL is captured by calling the real model methods with the database calls
+stubbed out, so the check follows the models as they change. Run it against a
+database with realistic row counts: on near-empty tables MySQL may prefer a
+scan even when a usable index exists.
+"""
+from database_manager import BaseEntity, backend
+from models.book import Book
+from models.catalog_search import CatalogSearch
+from models.loan import Loan
+from models.member import Member
+from models.member_index import MemberIndex
+
+# The name index loads every member on its first refresh by design
+SKIP_CLASSES = (MemberIndex,)
+
+# (label, backend) -> why a scan there is expected; anything else fails the check
+ALLOWED_SCANS = {
+    ("CatalogSearch.search", "sqlite"):
+        "SQLite has no FULLTEXT index, so the LIKE fallback reads every title",
+}
+
+HOT_QUERIES = [
+    ("Book.get_by_isbn", lambda: Book.get_by_isbn("9780000000000")),
+    ("Book.get_page", lambda: Book.get_page(("A-01", 1))),
+    ("CatalogSearch.search", lambda: CatalogSearch.search("history")),
+    ("Member.get_page", lambda: Member.get_page(1)),
+    ("Member.search", lambda: Member.search("0550000000")),
+    ("Loan.get_active_loans_count", lambda: Loan.get_active_loans_count(1)),
+    ("Loan.get_active_loans", Loan.get_active_loans),
+    ("Loan.get_overdue_loans", Loan.get_overdue_loans),
+    ("Loan.get_active_loans_detailed", Loan.get_active_loans_detailed),
+    ("Loan.get_overdue_loans_detailed", Loan.get_overdue_loans_detailed),
+    ("Loan.accrue_fines", lambda: Loan.accrue_fines(1.0)),
+]
+
+def capture(call):
+    """[(sql, params)] the call would run, without touching the database."""
+    statements = []
+
+    def fetch_data(cls, sql, params=None):
+        if not issubclass(cls, SKIP_CLASSES):
+            statements.append((sql, params))
+        return []
+
+    def execute(cls, sql, params=None):
+        statements.append((sql, params))
+        return None, 0
+
+    saved = {name: BaseEntity.__dict__[name] for name in ("fetch_data", "_execute")}
+    BaseEntity.fetch_data = classmethod(fetch_data)
+    BaseEntity._execute = classmethod(execute)
+    try:
+        call()
+    except (IndexError, TypeError):
+        pass  # methods that index into a result row get an empty one here
+    finally:
+        for name, method in saved.items():
+            setattr(BaseEntity, name, method)
+    return statements
+
+def full_scans(cursor, sql, params):
+    """Tables the plan reads in full, whether the rows or a whole index
+    (MySQL type ALL or index, any SQLite SCAN); temporary tables ignored."""
+    cursor.execute(backend.explain_prefix + sql, params)
+    columns = cursor.column_names
+    scans = []
+    for row in cursor.fetchall():
+        plan = dict(zip(columns, row))
+        if backend.name == "sqlite":
+            detail = plan.get("detail") or ""
+            if detail.startswith("SCAN ") and detail != "SCAN CONSTANT ROW":
+                scans.append(detail[len("SCAN "):])
+            continue
+        table = plan.get("table") or ""
+        if plan.get("type") in ("ALL", "index") and not table.startswith("<"):
+            scans.append(table)
+    return scans
+
+def check_plans(log=print):
+    """EXPLAIN every hot query; returns the number that regressed to a full
+    scan not listed in ALLOWED_SCANS."""
+    conn = BaseEntity._connect()
+    cursor = conn.cursor()
+    failures = 0
+    try:
+        for label, call in HOT_QUERIES:
+            for sql, params in capture(call):
+                scans = full_scans(cursor, sql, params)
+                allowed = ALLOWED_SCANS.get((label, backend.name))
+                if scans and allowed:
+                    log(f"allowed    {label}: {', '.join(scans)} ({allowed})")
+                elif scans:
+                    failures += 1
+                    log(f"FULL SCAN  {label}: {', '.join(scans)}")
+                    log("           " + " ".join(sql.split()))
+                else:
+                    log(f"ok         {label}")
+    finally:
+        cursor.close()
+        conn.close()
+    return failures
@@ -1,6 +1,8 @@
 from database_manager import BaseEntity
 
 class Author(BaseEntity):
+    __slots__ = ("id", "name")
+
     def __init__(self, name, id=None):
         super().__init__()
         self.id = id
@@ -10,18 +12,27 @@ class Author(BaseEntity):
         if self.id:
             sql = "UPDATE authors SET name = %s WHERE id = %s"
             params = (self.name, self.id)
-            self.execute_query(sql, params)
+            try:
+                self.execute_query(sql, params)
+            finally:
+                self._evict_cached()
         else:
             sql = "INSERT INTO authors (name) VALUES (%s)"
             params = (self.name,)
             self.id = self.execute_query(sql, params)
 
+    @classmethod
+    def _from_row(cls, row):
+        author = cls.__new__(cls)
+        author.id, author.name = row
+        return author
+
     @classmethod
     def get_by_id(cls, author_id):
-        # Create a temp instance to use fetch_data or use a static/class method approach
-        instance = cls(name="")
         sql = "SELECT id, name FROM authors WHERE id = %s"
-        result = instance.fetch_data(sql, (author_id,))
-        if result:
-            return cls(id=result[0][0], name=result[0][1])
-        return None
+        return cls._get_cached(author_id, sql)
+
+    @classmethod
+    def get_many(cls, author_ids):
+        sql = "SELECT id, name FROM authors WHERE id IN ({})"
+        return cls._get_many(author_ids, sql)
@@ -1,6 +1,9 @@
 from database_manager import BaseEntity
 
 class Book(BaseEntity):
+    __slots__ = ("id", "title", "isbn", "category", "publisher", "publish_year",
+                 "shelf_location", "quantity")
+
     def __init__(self, title, isbn, category, publisher, shelf_location, 
                  publish_year=None, quantity=0, id=None):
         super().__init__()
@@ -19,7 +22,10 @@ class Book(BaseEntity):
                      publish_year=%s, shelf_location=%s, quantity=%s WHERE id=%s"""
             params = (self.title, self.isbn, self.category, self.publisher, 
                       self.publish_year, self.shelf_location, self.quantity, self.id)
-            self.execute_query(sql, params)
+            try:
+                self.execute_query(sql, params)
+            finally:
+                self._evict_cached()
         else:
             sql = """INSERT INTO books (title, isbn, category, publisher, 
                      publish_year, shelf_location, quantity) 
@@ -28,58 +34,70 @@ class Book(BaseEntity):
                       self.publish_year, self.shelf_location, self.quantity)
             self.id = self.execute_query(sql, params)
 
+    @classmethod
+    def _from_row(cls, row):
+        book = cls.__new__(cls)
+        (book.id, book.title, book.isbn, book.category, book.publisher,
+         book.publish_year, book.shelf_location, book.quantity) = row
+        return book
+
     def add_author(self, author_id):
         sql = "INSERT IGNORE INTO book_authors (book_id, author_id) VALUES (%s, %s)"
         self.execute_query(sql, (self.id, author_id))
 
     @classmethod
     def get_by_id(cls, book_id):
-        instance = cls("", "", "", "", "")
         sql = """SELECT id, title, isbn, category, publisher, publish_year, 
                         shelf_location, quantity FROM books WHERE id = %s"""
-        result = instance.fetch_data(sql, (book_id,))
-        if result:
-            row = result[0]
-            return cls(id=row[0], title=row[1], isbn=row[2], category=row[3], 
-                       publisher=row[4], publish_year=row[5], 
-                       shelf_location=row[6], quantity=row[7])
-        return None
+        return cls._get_cached(book_id, sql)
+
+    @classmethod
+    def get_many(cls, book_ids):
+        sql = """SELECT id, title, isbn, category, publisher, publish_year, 
+                        shelf_location, quantity FROM books WHERE id IN ({})"""
+        return cls._get_many(book_ids, sql)
 
     @classmethod
     def get_by_isbn(cls, isbn):
-        instance = cls("", "", "", "", "")
         sql = """SELECT id, title, isbn, category, publisher, publish_year, 
                         shelf_location, quantity FROM books WHERE isbn = %s"""
-        result = instance.fetch_data(sql, (isbn,))
+        result = cls.fetch_data(sql, (isbn,))
         if result:
-            row = result[0]
-            return cls(id=row[0], title=row[1], isbn=row[2], category=row[3], 
-                       publisher=row[4], publish_year=row[5], 
-                       shelf_location=row[6], quantity=row[7])
+            return cls._from_row(result[0])
         return None
 
     @classmethod
     def search_by_title(cls, title):
-        instance = cls("", "", "", "", "")
         sql = """SELECT id, title, isbn, category, publisher, publish_year, 
                         shelf_location, quantity FROM books WHERE title LIKE %s"""
-        results = instance.fetch_data(sql, (f"%{title}%",))
-        books = []
-        for row in results:
-            books.append(cls(id=row[0], title=row[1], isbn=row[2], category=row[3], 
-                             publisher=row[4], publish_year=row[5], 
-                             shelf_location=row[6], quantity=row[7]))
-        return books
+        return cls._from_rows(cls.fetch_data(sql, (f"%{title}%",)))
 
     @classmethod
     def get_all(cls):
-        instance = cls("", "", "", "", "")
         sql = """SELECT id, title, isbn, category, publisher, publish_year, 
                         shelf_location, quantity FROM books ORDER BY shelf_location"""
-        results = instance.fetch_data(sql)
-        books = []
-        for row in results:
-            books.append(cls(id=row[0], title=row[1], isbn=row[2], category=row[3], 
-                             publisher=row[4], publish_year=row[5], 
-                             shelf_location=row[6], quantity=row[7]))
-        return books
+        return cls._from_rows(cls.fetch_data(sql))
+
+    @classmethod
+    def iter_all(cls, batch_size=1000):
+        sql = """SELECT id, title, isbn, category, publisher, publish_year, 
+                        shelf_location, quantity FROM books ORDER BY shelf_location"""
+        return map(cls._from_row, cls.stream(sql, batch_size=batch_size))
+
+    @classmethod
+    def get_page(cls, after=None, limit=200):
+        # Keyset pagination on (shelf_location, id); `after` is the key of the
+        # last row of the previous page, or None for the first page. The
+        # leading >= lets the index seek to the page instead of scanning to it.
+        if after is None:
+            sql = """SELECT id, title, isbn, category, publisher, publish_year,
+                            shelf_location, quantity FROM books
+                     ORDER BY shelf_location, id LIMIT %s"""
+            params = (limit,)
+        else:
+            sql = """SELECT id, title, isbn, category, publisher, publish_year,
+                            shelf_location, quantity FROM books
+                     WHERE shelf_location >= %s AND (shelf_location > %s OR id > %s)
+                     ORDER BY shelf_location, id LIMIT %s"""
+            params = (after[0], after[0], after[1], limit)
+        return cls._from_rows(cls.fetch_data(sql, params))
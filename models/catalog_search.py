@@ -0,0 +1,88 @@
+import re
+from database_manager import BaseEntity, backend
+from models.book import Book
+
+class CatalogSearch(BaseEntity):
+    """Ranked catalog search backed by the FULLTEXT indexes in schema.sql.
+
+    Terms are matched as prefixes against book title, publisher and category
+    and against author names; a book's score is the sum of both relevances,
+    so "tolkien hobbit" ranks The Hobbit above other Tolkien titles.
+    Backends without full-text indexes (SQLite) get unranked LIKE matching.
+    """
+    # InnoDB ignores tokens shorter than innodb_ft_min_token_size (default 3)
+    MIN_TERM_LENGTH = 3
+
+    @classmethod
+    def _boolean_query(cls, text):
+        terms = [t for t in re.findall(r"\w+", text) if len(t) >= cls.MIN_TERM_LENGTH]
+        return " ".join(f"{t}*" for t in terms)
+
+    @classmethod
+    def search(cls, text, limit=50, offset=0):
+        if not backend.fulltext:
+            return cls._like_search(text, limit, offset)
+        query = cls._boolean_query(text)
+        if not query:
+            return cls._prefix_search(text, limit, offset)
+
+        sql = """SELECT b.id, b.title, b.isbn, b.category, b.publisher, b.publish_year,
+                        b.shelf_location, b.quantity
+                 FROM (
+                     SELECT hits.book_id, SUM(hits.score) AS score
+                     FROM (
+                         SELECT id AS book_id,
+                                MATCH(title, publisher, category) AGAINST (%s IN BOOLEAN MODE) AS score
+                         FROM books
+                         WHERE MATCH(title, publisher, category) AGAINST (%s IN BOOLEAN MODE)
+                         UNION ALL
+                         SELECT ba.book_id, MATCH(a.name) AGAINST (%s IN BOOLEAN MODE)
+                         FROM authors a
+                         JOIN book_authors ba ON ba.author_id = a.id
+                         WHERE MATCH(a.name) AGAINST (%s IN BOOLEAN MODE)
+                     ) hits
+                     GROUP BY hits.book_id
+                     ORDER BY score DESC, hits.book_id
+                     LIMIT %s OFFSET %s
+                 ) ranked
+                 JOIN books b ON b.id = ranked.book_id
+                 ORDER BY ranked.score DESC, b.id"""
+        results = cls.fetch_data(sql, (query, query, query, query, limit, offset))
+        return Book._from_rows(results)
+
+    @classmethod
+    def _prefix_search(cls, text, limit, offset):
+        # Too short for the full-text index; a prefix LIKE can still use idx_title
+        text = text.strip()
+        if not text:
+            return []
+        sql = """SELECT id, title, isbn, category, publisher, publish_year,
+                        shelf_location, quantity FROM books
+                 WHERE title LIKE %s ESCAPE '!' ORDER BY title, id LIMIT %s OFFSET %s"""
+        results = cls.fetch_data(sql, (cls._escape_like(text) + "%", limit, offset))
+        return Book._from_rows(results)
+
+    @classmethod
+    def _like_search(cls, text, limit, offset):
+        # Every term must appear in the title, publisher, category or an author name
+        terms = re.findall(r"\w+", text)
+        if not terms:
+            return []
+        condition = """(b.title LIKE %s ESCAPE '!' OR b.publisher LIKE %s ESCAPE '!'
+                        OR b.category LIKE %s ESCAPE '!'
+                        OR EXISTS (SELECT 1 FROM book_authors ba JOIN authors a ON a.id = ba.author_id
+                                   WHERE ba.book_id = b.id AND a.name LIKE %s ESCAPE '!'))"""
+        sql = f"""SELECT b.id, b.title, b.isbn, b.category, b.publisher, b.publish_year,
+                         b.shelf_location, b.quantity FROM books b
+                  WHERE {" AND ".join([condition] * len(terms))}
+                  ORDER BY b.title, b.id LIMIT %s OFFSET %s"""
+        params = []
+        for term in terms:
+            params.extend(["%" + cls._escape_like(term) + "%"] * 4)
+        results = cls.fetch_data(sql, (*params, limit, offset))
+        return Book._from_rows(results)
+
+    @staticmethod
+    def _escape_like(text):
+        # '!' is the LIKE escape character here; MySQL and SQLite both accept it
+        return text.replace("!", "!!").replace("%", "!%").replace("_", "!_")
@@ -1,7 +1,13 @@
-from database_manager import BaseEntity
+from database_manager import BaseEntity, run_in_transaction
 from datetime import date, timedelta
 
+class LoanError(Exception):
+    """A loan was refused by a business rule (limit reached, no copies left)."""
+
 class Loan(BaseEntity):
+    __slots__ = ("id", "member_id", "book_id", "loan_date", "due_date",
+                 "return_date", "fine_amount")
+
     def __init__(self, member_id, book_id, loan_date=None, due_date=None, 
                  return_date=None, fine_amount=0.0, id=None):
         super().__init__()
@@ -19,7 +25,10 @@ class Loan(BaseEntity):
                      due_date=%s, return_date=%s, fine_amount=%s WHERE id=%s"""
             params = (self.member_id, self.book_id, self.loan_date, 
                       self.due_date, self.return_date, self.fine_amount, self.id)
-            self.execute_query(sql, params)
+            try:
+                self.execute_query(sql, params)
+            finally:
+                self._evict_cached()
         else:
             sql = """INSERT INTO loans (member_id, book_id, loan_date, due_date, 
                      return_date, fine_amount) VALUES (%s, %s, %s, %s, %s, %s)"""
@@ -29,56 +38,144 @@ class Loan(BaseEntity):
 
     @classmethod
     def get_active_loans_count(cls, member_id):
-        instance = cls(0, 0)
         sql = "SELECT COUNT(*) FROM loans WHERE member_id = %s AND return_date IS NULL"
-        result = instance.fetch_data(sql, (member_id,))
+        result = cls.fetch_data(sql, (member_id,))
         if result:
             return result[0][0]
         return 0
 
     @classmethod
-    def issue_loan(cls, member_id, book_id):
-        loan = cls(member_id=member_id, book_id=book_id)
-        loan.save()
+    def issue_loan(cls, member_id, book_id, max_active=1):
+        """Check the member's loan limit and the book's free copies and insert
+        the loan as one atomic step. Raises LoanError if a check fails."""
+        def issue(conn):
+            # Lock order is always member then book, so concurrent issues queue
+            # on the rows instead of deadlocking. The counts below run after the
+            # locks are held, so they see every loan committed before us.
+            if not cls.fetch_data("SELECT id FROM members WHERE id = %s FOR UPDATE", (member_id,)):
+                raise LoanError("Member not found.")
+            book = cls.fetch_data("SELECT quantity FROM books WHERE id = %s FOR UPDATE", (book_id,))
+            if not book:
+                raise LoanError("Book not found.")
+            if cls.get_active_loans_count(member_id) >= max_active:
+                raise LoanError(f"Active loan limit reached (Max {max_active}).")
+            on_loan = cls.fetch_data(
+                "SELECT COUNT(*) FROM loans WHERE book_id = %s AND return_date IS NULL", (book_id,))
+            if on_loan[0][0] >= book[0][0]:
+                raise LoanError("No copies of this book are available.")
+            loan = cls(member_id=member_id, book_id=book_id)
+            loan.save()
+            return loan
+        return run_in_transaction(issue)
+
+    @classmethod
+    def accrue_fines(cls, rate, as_of=None):
+        """Set fine_amount on every open overdue loan to days late x rate as of
+        `as_of` (default today). Returns the number of loans changed.
+
+        Fines are recomputed from due_date rather than incremented, so running
+        it again on the same day changes nothing."""
+        as_of = as_of or date.today()
+        sql = """UPDATE loans SET fine_amount = ROUND(DATEDIFF(%s, due_date) * %s, 2)
+                 WHERE return_date IS NULL AND due_date < %s
+                   AND fine_amount <> ROUND(DATEDIFF(%s, due_date) * %s, 2)"""
+        rows = cls.execute_update(sql, (as_of, rate, as_of, as_of, rate))
+        if rows and cls._identity_cache is not None:
+            cls._identity_cache.clear()
+        return rows
+
+    @classmethod
+    def get_outstanding_fines(cls):
+        sql = "SELECT COALESCE(SUM(fine_amount), 0) FROM loans WHERE return_date IS NULL"
+        return float(cls.fetch_data(sql)[0][0])
+
+    @classmethod
+    def _from_row(cls, row):
+        loan = cls.__new__(cls)
+        (loan.id, loan.member_id, loan.book_id, loan.loan_date, loan.due_date,
+         loan.return_date, fine_amount) = row
+        loan.fine_amount = float(fine_amount)
         return loan
 
     @classmethod
     def get_by_id(cls, loan_id):
-        instance = cls(0, 0)
         sql = """SELECT id, member_id, book_id, loan_date, due_date, return_date, 
                         fine_amount FROM loans WHERE id = %s"""
-        result = instance.fetch_data(sql, (loan_id,))
-        if result:
-            row = result[0]
-            return cls(id=row[0], member_id=row[1], book_id=row[2], 
-                       loan_date=row[3], due_date=row[4], 
-                       return_date=row[5], fine_amount=float(row[6]))
-        return None
+        return cls._get_cached(loan_id, sql)
+
+    @classmethod
+    def get_many(cls, loan_ids):
+        sql = """SELECT id, member_id, book_id, loan_date, due_date, return_date, 
+                        fine_amount FROM loans WHERE id IN ({})"""
+        return cls._get_many(loan_ids, sql)
+
     @classmethod
     def get_overdue_loans(cls):
-        instance = cls(0, 0)
         sql = """SELECT id, member_id, book_id, loan_date, due_date, return_date, 
                         fine_amount FROM loans 
                  WHERE return_date IS NULL AND due_date < CURDATE()"""
-        results = instance.fetch_data(sql)
-        loans = []
-        for row in results:
-            loans.append(cls(id=row[0], member_id=row[1], book_id=row[2], 
-                             loan_date=row[3], due_date=row[4], 
-                             return_date=row[5], fine_amount=float(row[6])))
-        return loans
+        return cls._from_rows(cls.fetch_data(sql))
 
     @classmethod
     def get_active_loans(cls):
-        instance = cls(0, 0)
         # return_date IS NULL
         sql = """SELECT id, member_id, book_id, loan_date, due_date, return_date, 
                         fine_amount FROM loans WHERE return_date IS NULL"""
-        results = instance.fetch_data(sql)
-        loans = []
-        for row in results:
-            loans.append(cls(id=row[0], member_id=row[1], book_id=row[2], 
-                             loan_date=row[3], due_date=row[4], 
-                             return_date=row[5], fine_amount=float(row[6])))
-        return loans
-        
\ No newline at end of file
+        return cls._from_rows(cls.fetch_data(sql))
+
+    @classmethod
+    def iter_overdue_loans(cls, batch_size=1000):
+        sql = """SELECT id, member_id, book_id, loan_date, due_date, return_date, 
+                        fine_amount FROM loans 
+                 WHERE return_date IS NULL AND due_date < CURDATE()"""
+        return map(cls._from_row, cls.stream(sql, batch_size=batch_size))
+
+    @classmethod
+    def iter_active_loans(cls, batch_size=1000):
+        sql = """SELECT id, member_id, book_id, loan_date, due_date, return_date, 
+                        fine_amount FROM loans WHERE return_date IS NULL"""
+        return map(cls._from_row, cls.stream(sql, batch_size=batch_size))
+
+    @classmethod
+    def iter_all(cls, batch_size=1000):
+        sql = """SELECT id, member_id, book_id, loan_date, due_date, return_date, 
+                        fine_amount FROM loans"""
+        return map(cls._from_row, cls.stream(sql, batch_size=batch_size))
+
+    # Joined variants for reports and tables: one query returns the loan
+    # together with the member name, book title and days late, so callers
+    # never need per-row Member/Book lookups.
+    _DETAILED_SQL = """SELECT l.id, l.member_id, m.name, l.book_id, b.title,
+                              l.loan_date, l.due_date, l.return_date, l.fine_amount,
+                              GREATEST(DATEDIFF(CURDATE(), l.due_date), 0)
+                       FROM loans l
+                       LEFT JOIN members m ON m.id = l.member_id
+                       LEFT JOIN books b ON b.id = l.book_id"""
+
+    @staticmethod
+    def _detailed_row(row):
+        return {
+            "id": row[0],
+            "member_id": row[1],
+            "member_name": row[2] if row[2] is not None else f"ID: {row[1]}",
+            "book_id": row[3],
+            "book_title": row[4] if row[4] is not None else f"ID: {row[3]}",
+            "loan_date": row[5],
+            "due_date": row[6],
+            "return_date": row[7],
+            "fine_amount": float(row[8]),
+            "days_late": int(row[9]),
+        }
+
+    @classmethod
+    def get_active_loans_detailed(cls):
+        sql = cls._DETAILED_SQL + """ WHERE l.return_date IS NULL ORDER BY l.id"""
+        results = cls.fetch_data(sql)
+        return [cls._detailed_row(row) for row in results]
+
+    @classmethod
+    def get_overdue_loans_detailed(cls):
+        sql = cls._DETAILED_SQL + """ WHERE l.return_date IS NULL AND l.due_date < CURDATE()
+                                     ORDER BY l.due_date, l.id"""
+        results = cls.fetch_data(sql)
+        return [cls._detailed_row(row) for row in results]
@@ -1,7 +1,10 @@
 from database_manager import BaseEntity
 from datetime import date
+from models.member_index import MemberIndex
 
 class Member(BaseEntity):
+    __slots__ = ("id", "name", "national_id", "phone", "join_date")
+
     def __init__(self, name, national_id, phone=None, join_date=None, id=None):
         super().__init__()
         self.id = id
@@ -12,43 +15,72 @@ class Member(BaseEntity):
 
     def save(self):
         if self.id:
-            sql = "UPDATE members SET name=%s, national_id=%s, phone=%s, join_date=%s WHERE id=%s"
+            sql = """UPDATE members SET name=%s, national_id=%s, phone=%s, join_date=%s,
+                     updated_at=CURRENT_TIMESTAMP WHERE id=%s"""
             params = (self.name, self.national_id, self.phone, self.join_date, self.id)
-            self.execute_query(sql, params)
+            try:
+                self.execute_query(sql, params)
+            finally:
+                self._evict_cached()
         else:
             sql = "INSERT INTO members (name, national_id, phone, join_date) VALUES (%s, %s, %s, %s)"
             params = (self.name, self.national_id, self.phone, self.join_date)
             self.id = self.execute_query(sql, params)
+        # MemberIndex catches up through its write listener once this commits
+
+    @classmethod
+    def _from_row(cls, row):
+        member = cls.__new__(cls)
+        member.id, member.name, member.national_id, member.phone, member.join_date = row
+        return member
 
     @classmethod
     def get_by_id(cls, member_id):
-        instance = cls("", "")
         sql = "SELECT id, name, national_id, phone, join_date FROM members WHERE id = %s"
-        result = instance.fetch_data(sql, (member_id,))
-        if result:
-            row = result[0]
-            return cls(id=row[0], name=row[1], national_id=row[2], 
-                       phone=row[3], join_date=row[4])
-        return None
+        return cls._get_cached(member_id, sql)
+
+    @classmethod
+    def get_many(cls, member_ids):
+        sql = "SELECT id, name, national_id, phone, join_date FROM members WHERE id IN ({})"
+        return cls._get_many(member_ids, sql)
 
     @classmethod
     def search_by_name(cls, name):
-        instance = cls("", "")
         sql = "SELECT id, name, national_id, phone, join_date FROM members WHERE name LIKE %s"
-        results = instance.fetch_data(sql, (f"%{name}%",))
-        members = []
-        for row in results:
-            members.append(cls(id=row[0], name=row[1], national_id=row[2], 
-                               phone=row[3], join_date=row[4]))
-        return members
+        return cls._from_rows(cls.fetch_data(sql, (f"%{name}%",)))
 
     @classmethod
     def get_all(cls):
-        instance = cls("", "")
         sql = "SELECT id, name, national_id, phone, join_date FROM members"
-        results = instance.fetch_data(sql)
+        return cls._from_rows(cls.fetch_data(sql))
+
+    @classmethod
+    def iter_all(cls, batch_size=1000):
+        sql = "SELECT id, name, national_id, phone, join_date FROM members"
+        return map(cls._from_row, cls.stream(sql, batch_size=batch_size))
+
+    @classmethod
+    def search(cls, text, limit=20):
+        """Exact national ID / phone hits first, then typo-tolerant name matches."""
         members = []
-        for row in results:
-            members.append(cls(id=row[0], name=row[1], national_id=row[2], 
-                               phone=row[3], join_date=row[4]))
+        text = text.strip()
+        if any(ch.isdigit() for ch in text):
+            sql = """SELECT id, name, national_id, phone, join_date FROM members WHERE national_id = %s
+                     UNION
+                     SELECT id, name, national_id, phone, join_date FROM members WHERE phone = %s"""
+            members = cls._from_rows(cls.fetch_data(sql, (text, text)))
+
+        exact_ids = {m.id for m in members}
+        ids = [i for i in MemberIndex.search_ids(text, limit)
+               if i not in exact_ids][:max(limit - len(members), 0)]
+        if ids:
+            by_id = cls.get_many(ids)
+            members.extend(by_id[i] for i in ids if i in by_id)
         return members
+
+    @classmethod
+    def get_page(cls, after=None, limit=200):
+        # Keyset pagination on id; `after` is the last id of the previous page
+        sql = """SELECT id, name, national_id, phone, join_date FROM members
+                 WHERE id > %s ORDER BY id LIMIT %s"""
+        return cls._from_rows(cls.fetch_data(sql, (after or 0, limit)))
@@ -0,0 +1,133 @@
+import heapq
+import threading
+import time
+import unicodedata
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta
+from database_manager import BaseEntity, register_write_listener
+
+class MemberIndex(BaseEntity):
+    """In-memory trigram index over member names for typo-tolerant lookup.
+
+    Built from the members table on first use. Member writes committed in
+    this process mark it stale, so the next search catches up at once; rows
+    added or renamed by other processes are picked up every REFRESH_INTERVAL
+    through members.updated_at. Postings are append-only; candidates are
+    re-scored against the current name, so entries left behind by a rename
+    never surface.
+    """
+    REFRESH_INTERVAL = 30  # seconds
+    # Re-read rows stamped this long before the newest one seen, to catch
+    # transactions that committed after a later-stamped row was read
+    CHANGE_OVERLAP = timedelta(seconds=60)
+    MIN_SIMILARITY = 0.3
+    # Upper bound on postings visited per query, rarest trigrams first
+    MAX_POSTINGS = 250_000
+
+    _lock = threading.RLock()
+    _loaded = False
+    _names = {}
+    _postings = {}
+    _max_id = 0
+    _updated_at = None  # newest members.updated_at seen
+    _stale = False
+    _last_refresh = 0.0
+
+    @staticmethod
+    def normalize(text):
+        text = unicodedata.normalize("NFKD", text or "")
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+        return " ".join(text.casefold().split())
+
+    @staticmethod
+    def trigrams(normalized):
+        padded = f"  {normalized} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    @classmethod
+    def on_write(cls, entity_cls):
+        # Called after commit; raw BaseEntity writes may have touched members too
+        if entity_cls.__name__ in ("Member", "BaseEntity"):
+            cls._stale = True
+
+    @classmethod
+    def _add(cls, member_id, name):
+        normalized = cls.normalize(name)
+        if cls._names.get(member_id) == normalized:
+            return
+        cls._names[member_id] = normalized
+        for gram in cls.trigrams(normalized):
+            cls._postings.setdefault(gram, array("i")).append(member_id)
+        cls._max_id = max(cls._max_id, member_id)
+
+    @classmethod
+    def _refresh(cls):
+        now = time.monotonic()
+        if cls._loaded and not cls._stale and now - cls._last_refresh < cls.REFRESH_INTERVAL:
+            return
+        cls._stale = False
+        if not cls._loaded:
+            rows = cls.fetch_data("SELECT id, name, updated_at FROM members")
+        else:
+            # New ids cover rows inserted without a timestamp (bulk loads
+            # into a migrated SQLite table); updated_at covers renames
+            since = (cls._updated_at or datetime(1970, 1, 1)) - cls.CHANGE_OVERLAP
+            sql = "SELECT id, name, updated_at FROM members WHERE id > %s OR updated_at >= %s"
+            rows = cls.fetch_data(sql, (cls._max_id, since))
+        for member_id, name, updated_at in rows:
+            cls._add(member_id, name)
+            if updated_at is not None and (cls._updated_at is None or updated_at > cls._updated_at):
+                cls._updated_at = updated_at
+        cls._loaded = True
+        cls._last_refresh = now
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._loaded = False
+            cls._names = {}
+            cls._postings = {}
+            cls._max_id = 0
+            cls._updated_at = None
+
+    @classmethod
+    def search_ids(cls, text, limit=20):
+        query = cls.normalize(text)
+        if not query:
+            return []
+        query_grams = cls.trigrams(query)
+
+        with cls._lock:
+            cls._refresh()
+            postings = sorted((cls._postings.get(g, ()) for g in query_grams), key=len)
+            shared = Counter()
+            budget = cls.MAX_POSTINGS
+            for ids in postings:
+                if budget <= 0:
+                    break
+                shared.update(ids[:budget])
+                budget -= len(ids)
+
+            # Re-score the best candidates against their current names
+            scored = []
+            for member_id, _ in shared.most_common(limit * 20):
+                name = cls._names.get(member_id)
+                if name is None:
+                    continue
+                score = cls._similarity(query, query_grams, name)
+                if score >= cls.MIN_SIMILARITY:
+                    scored.append((score, -member_id))
+
+        return [-neg_id for _, neg_id in heapq.nlargest(limit, scored)]
+
+    @classmethod
+    def _similarity(cls, query, query_grams, name):
+        name_grams = cls.trigrams(name)
+        score = 2 * len(query_grams & name_grams) / (len(query_grams) + len(name_grams))
+        # Prefix matches rank first while the user is still typing
+        if name.startswith(query) or f" {query}" in name:
+            score += 1.0
+        return score
+
+register_write_listener(MemberIndex.on_write)
@@ -0,0 +1,50 @@
+import threading
+import time
+from database_manager import BaseEntity, register_write_listener
+
+class LibraryStats(BaseEntity):
+    CACHE_TTL = 30  # seconds
+
+    _cache = None
+    _cached_at = 0.0
+    _generation = 0  # bumped by invalidate()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls):
+        with cls._lock:
+            if cls._cache is not None and time.monotonic() - cls._cached_at < cls.CACHE_TTL:
+                return dict(cls._cache)
+            generation = cls._generation
+
+        # All counters in a single round trip, computed by the server.
+        sql = """SELECT (SELECT COUNT(*) FROM books),
+                        (SELECT COALESCE(SUM(quantity), 0) FROM books),
+                        (SELECT COUNT(*) FROM members),
+                        (SELECT COUNT(*) FROM loans WHERE return_date IS NULL),
+                        (SELECT COUNT(*) FROM loans
+                          WHERE return_date IS NULL AND due_date < CURDATE())"""
+        row = cls.fetch_data(sql)[0]
+        stats = {
+            "total_books": int(row[0]),
+            "total_copies": int(row[1]),
+            "total_members": int(row[2]),
+            "active_loans": int(row[3]),
+            "overdue_loans": int(row[4]),
+        }
+
+        with cls._lock:
+            # A write that committed while the query ran may be missing from
+            # these counts; return them, but don't keep them
+            if cls._generation == generation:
+                cls._cache = stats
+                cls._cached_at = time.monotonic()
+        return dict(stats)
+
+    @classmethod
+    def invalidate(cls, entity_cls=None):
+        with cls._lock:
+            cls._cache = None
+            cls._generation += 1
+
+register_write_listener(LibraryStats.invalidate)
@@ -0,0 +1,118 @@
+import atexit
+import bisect
+import json
+import logging
+import os
+import re
+import sys
+import threading
+
+slow_log = logging.getLogger("library.slow_queries")
+slow_log.setLevel(logging.WARNING)
+
+# Frames from these files are skipped when attributing a query to a caller
+_INTERNAL_FILES = ("database_manager.py", "query_stats.py", "contextlib.py")
+
+def _normalize(sql):
+    sql = " ".join(sql.split())
+    # IN lists vary in length per call; count them as one statement
+    return re.sub(r"IN \((?:%s, )*%s\)", "IN (...)", sql)
+
+def call_site():
+    """Name the model method that issued the query, e.g. 'Book.get_all'."""
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename.endswith(_INTERNAL_FILES):
+        frame = frame.f_back
+    if frame is None:
+        return "<unknown>"
+    local_vars = frame.f_locals
+    owner = local_vars.get("cls")
+    if owner is None and "self" in local_vars:
+        owner = type(local_vars["self"])
+    name = frame.f_code.co_name
+    if isinstance(owner, type):
+        return f"{owner.__name__}.{name}"
+    return f"{os.path.basename(frame.f_code.co_filename)}:{name}"
+
+class QueryStats:
+    """Per-statement latency histograms, row counts and call-site counters."""
+    BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+    def __init__(self, slow_ms=None):
+        self.slow_ms = float(os.getenv("LIBRARY_SLOW_QUERY_MS", 500)) if slow_ms is None else slow_ms
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._statements = {}
+            self._call_sites = {}
+
+    def is_slow(self, elapsed):
+        return self.slow_ms > 0 and elapsed * 1000 >= self.slow_ms
+
+    def record(self, sql, elapsed, rows, site):
+        ms = elapsed * 1000
+        key = _normalize(sql)
+        bucket = bisect.bisect_left(self.BUCKETS_MS, ms)
+        with self._lock:
+            stmt = self._statements.get(key)
+            if stmt is None:
+                stmt = self._statements[key] = {
+                    "calls": 0, "rows": 0, "total_ms": 0.0, "max_ms": 0.0,
+                    "histogram": [0] * (len(self.BUCKETS_MS) + 1), "call_sites": {},
+                }
+            stmt["calls"] += 1
+            stmt["rows"] += max(rows, 0)
+            stmt["total_ms"] += ms
+            stmt["max_ms"] = max(stmt["max_ms"], ms)
+            stmt["histogram"][bucket] += 1
+            stmt["call_sites"][site] = stmt["call_sites"].get(site, 0) + 1
+
+            caller = self._call_sites.get(site)
+            if caller is None:
+                caller = self._call_sites[site] = {"calls": 0, "rows": 0, "total_ms": 0.0}
+            caller["calls"] += 1
+            caller["rows"] += max(rows, 0)
+            caller["total_ms"] += ms
+
+    def log_slow(self, sql, params, elapsed, site, plan=None):
+        message = f"Slow query ({elapsed * 1000:.1f} ms) from {site}\nSQL: {' '.join(sql.split())}\nParams: {params}"
+        if plan:
+            message += "\nEXPLAIN:\n" + "\n".join(" | ".join(str(v) for v in row) for row in plan)
+        slow_log.warning(message)
+
+    def summary(self):
+        labels = [f"<={b}ms" for b in self.BUCKETS_MS] + [f">{self.BUCKETS_MS[-1]}ms"]
+        with self._lock:
+            statements = [
+                {
+                    "sql": sql,
+                    "calls": s["calls"],
+                    "rows": s["rows"],
+                    "total_ms": round(s["total_ms"], 3),
+                    "avg_ms": round(s["total_ms"] / s["calls"], 3),
+                    "max_ms": round(s["max_ms"], 3),
+                    "histogram": dict(zip(labels, s["histogram"])),
+                    "call_sites": dict(s["call_sites"]),
+                }
+                for sql, s in self._statements.items()
+            ]
+            call_sites = {
+                site: {"calls": c["calls"], "rows": c["rows"], "total_ms": round(c["total_ms"], 3)}
+                for site, c in self._call_sites.items()
+            }
+        statements.sort(key=lambda s: s["total_ms"], reverse=True)
+        return {"slow_query_ms": self.slow_ms, "statements": statements, "call_sites": call_sites}
+
+    def dump_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+stats = QueryStats()
+
+def dump_at_exit(path):
+    atexit.register(stats.dump_json, path)
+
+if os.getenv("LIBRARY_QUERY_STATS_FILE"):
+    dump_at_exit(os.getenv("LIBRARY_QUERY_STATS_FILE"))
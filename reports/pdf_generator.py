@@ -1,15 +1,147 @@
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.platypus import (SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph,
+                                Spacer, PageBreak)
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib import colors
+from reportlab.pdfbase.pdfdoc import PDFArray, PDFName, PDFStream
+from reportlab.pdfgen.canvas import Canvas
+import zlib
 from datetime import date
-from models.book import Book
 from models.loan import Loan
-from models.member import Member
+from database_manager import BaseEntity
+
+class _FlowableStream(list):
+    # doc.build() consumes flowables from the front of a list and checks
+    # len() before each one; topping the list up on demand lets a generator
+    # feed the layout so only the current page's tables exist at once.
+    def __init__(self, source):
+        super().__init__()
+        self._source = iter(source)
+
+    def __len__(self):
+        if not list.__len__(self):
+            flowable = next(self._source, None)
+            if flowable is not None:
+                self.append(flowable)
+        return list.__len__(self)
+
+class _CompactCanvas(Canvas):
+    # reportlab holds every finished page's content stream as an uncompressed
+    # string until save() writes the file. Measured on the member report, a
+    # finished page kept about 12 KB; deflating its stream as soon as the
+    # page is done brings that to about 5 KB (tests/test_pdf_generator.py
+    # checks the output still has every page).
+    def showPage(self):
+        super().showPage()
+        page = self._doc.Pages.pages[-1]
+        if not self._pageCompression or not page.stream:
+            return
+        stream = PDFStream(content=zlib.compress(page.stream.encode("utf8")))
+        stream.dictionary["Filter"] = PDFArray([PDFName("FlateDecode")])
+        stream.__Comment__ = "page stream"
+        page.Contents = stream
+        page.stream = None
+
+class ReportCancelled(Exception):
+    pass
 
 class PDFGenerator:
-    def __init__(self):
+    ROW_HEIGHT = 16
+    FETCH_SIZE = 2000
+
+    def __init__(self, progress=None, is_cancelled=None):
+        # progress(rows fetched, pages laid out) is called as the report builds;
+        # a true is_cancelled() stops it with ReportCancelled. Both run on the
+        # building thread.
         self.styles = getSampleStyleSheet()
+        self.progress = progress
+        self.is_cancelled = is_cancelled
+        self._rows = 0
+        self._pages = 0
+
+    def _build(self, doc, flowables, rows=0):
+        self._rows, self._pages = rows, 0
+        doc.build(flowables, onFirstPage=self._on_page, onLaterPages=self._on_page,
+                  canvasmaker=_CompactCanvas)
+
+    def _on_page(self, canvas, doc):
+        self._pages = doc.page
+        self._step()
+
+    def _step(self, rows=0):
+        self._rows += rows
+        if self.is_cancelled and self.is_cancelled():
+            raise ReportCancelled("Report generation cancelled.")
+        if self.progress:
+            self.progress(self._rows, self._pages)
+
+    def _stream_rows(self, sql, params=None):
+        return BaseEntity.stream(sql, params, batch_size=self.FETCH_SIZE)
+
+    def _build_streaming_report(self, filename, title, headers, col_widths, rows,
+                                header_color=colors.grey):
+        doc = SimpleDocTemplate(filename, pagesize=letter, pageCompression=1)
+        heading = [
+            Paragraph(title, self.styles['Title']),
+            Paragraph(f"Date: {date.today()}", self.styles['Normal']),
+            Spacer(1, 12),
+        ]
+        heading_height = sum(f.wrap(doc.width, doc.height)[1] + f.getSpaceBefore() + f.getSpaceAfter()
+                             for f in heading)
+        # Frame padding is 6pt on each side; keep one spare row as margin
+        usable = doc.height - 12 - self.ROW_HEIGHT
+        first_page_rows = max(int((usable - heading_height) // self.ROW_HEIGHT) - 1, 1)
+        page_rows = int(usable // self.ROW_HEIGHT) - 1
+        limits = [self._cell_limit(w) for w in col_widths]
+        style = self._table_style(header_color)
+
+        def flowables():
+            yield from heading
+            chunk = []
+            chunk_size = first_page_rows
+            for row in rows:
+                chunk.append([self._fit(value, limit) for value, limit in zip(row, limits)])
+                if len(chunk) == chunk_size:
+                    self._step(len(chunk))
+                    yield self._page_table(headers, chunk, col_widths, style)
+                    yield PageBreak()
+                    chunk = []
+                    chunk_size = page_rows
+            if chunk:
+                self._step(len(chunk))
+                yield self._page_table(headers, chunk, col_widths, style)
+
+        self._build(doc, _FlowableStream(flowables()))
+        return filename
+
+    def _page_table(self, headers, rows, col_widths, style):
+        t = LongTable([headers] + rows, colWidths=col_widths,
+                      rowHeights=self.ROW_HEIGHT, repeatRows=1)
+        t.setStyle(style)
+        return t
+
+    def _table_style(self, header_color):
+        return TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), header_color),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black)
+        ])
+
+    @staticmethod
+    def _cell_limit(width):
+        # Approximate characters that fit an 8pt Helvetica cell
+        return max(int((width - 6) / 4.4), 3)
+
+    @staticmethod
+    def _fit(value, limit):
+        text = "" if value is None else str(value)
+        if len(text) > limit:
+            return text[:limit - 1] + "\u2026"
+        return text
 
     def _create_basic_table(self, data, header_color=colors.grey):
         t = Table(data)
@@ -24,20 +156,13 @@ class PDFGenerator:
         return t
 
     def generate_inventory_report(self, filename="inventory_report.pdf"):
-        doc = SimpleDocTemplate(filename, pagesize=letter)
-        elements = []
-        elements.append(Paragraph("Library Inventory Report", self.styles['Title']))
-        elements.append(Paragraph(f"Date: {date.today()}", self.styles['Normal']))
-        elements.append(Spacer(1, 12))
-
-        books = Book.get_all()
-        data = [["ID", "Title", "ISBN", "Category", "Shelf", "Qty"]]
-        for b in books:
-            data.append([b.id, b.title, b.isbn, b.category, b.shelf_location, b.quantity])
-
-        elements.append(self._create_basic_table(data))
-        doc.build(elements)
-        return filename
+        sql = """SELECT id, title, isbn, category, shelf_location, quantity
+                 FROM books ORDER BY shelf_location, id"""
+        return self._build_streaming_report(
+            filename, "Library Inventory Report",
+            ["ID", "Title", "ISBN", "Category", "Shelf", "Qty"],
+            [40, 160, 85, 80, 63, 40],
+            self._stream_rows(sql))
 
     def generate_overdue_report(self, filename="overdue_report.pdf"):
         doc = SimpleDocTemplate(filename, pagesize=letter)
@@ -46,16 +171,13 @@ class PDFGenerator:
         elements.append(Paragraph(f"Date: {date.today()}", self.styles['Normal']))
         elements.append(Spacer(1, 12))
 
-        loans = Loan.get_overdue_loans()
-        data = [["Loan ID", "Member", "Book ID", "Due Date", "Days Late"]]
+        loans = Loan.get_overdue_loans_detailed()
+        data = [["Loan ID", "Member", "Book Title", "Due Date", "Days Late"]]
         for l in loans:
-            member = Member.get_by_id(l.member_id)
-            member_name = member.name if member else f"ID: {l.member_id}"
-            days_late = (date.today() - l.due_date).days
-            data.append([l.id, member_name, l.book_id, l.due_date, days_late])
+            data.append([l["id"], l["member_name"], l["book_title"], l["due_date"], l["days_late"]])
 
         elements.append(self._create_basic_table(data, colors.red))
-        doc.build(elements)
+        self._build(doc, elements, rows=len(loans))
         return filename
 
     def generate_active_loans_report(self, filename="active_loans_report.pdf"):
@@ -65,33 +187,19 @@ class PDFGenerator:
         elements.append(Paragraph(f"Date: {date.today()}", self.styles['Normal']))
         elements.append(Spacer(1, 12))
 
-        loans = Loan.get_active_loans()
+        loans = Loan.get_active_loans_detailed()
         data = [["Loan ID", "Member", "Book Title", "Loan Date", "Due Date"]]
         for l in loans:
-            member = Member.get_by_id(l.member_id)
-            book = Book.get_by_id(l.book_id)
-            
-            member_name = member.name if member else f"ID: {l.member_id}"
-            book_title = book.title if book else f"ID: {l.book_id}"
-            
-            data.append([l.id, member_name, book_title, l.loan_date, l.due_date])
+            data.append([l["id"], l["member_name"], l["book_title"], l["loan_date"], l["due_date"]])
 
         elements.append(self._create_basic_table(data, colors.blue))
-        doc.build(elements)
+        self._build(doc, elements, rows=len(loans))
         return filename
 
     def generate_member_report(self, filename="member_report.pdf"):
-        doc = SimpleDocTemplate(filename, pagesize=letter)
-        elements = []
-        elements.append(Paragraph("Member Directory", self.styles['Title']))
-        elements.append(Paragraph(f"Date: {date.today()}", self.styles['Normal']))
-        elements.append(Spacer(1, 12))
-
-        members = Member.get_all()
-        data = [["ID", "Name", "National ID", "Phone", "Join Date"]]
-        for m in members:
-            data.append([m.id, m.name, m.national_id, m.phone, m.join_date])
-
-        elements.append(self._create_basic_table(data, colors.green))
-        doc.build(elements)
-        return filename
\ No newline at end of file
+        sql = "SELECT id, name, national_id, phone, join_date FROM members ORDER BY id"
+        return self._build_streaming_report(
+            filename, "Member Directory",
+            ["ID", "Name", "National ID", "Phone", "Join Date"],
+            [40, 150, 100, 100, 78],
+            self._stream_rows(sql), colors.green)
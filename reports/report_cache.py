@@ -0,0 +1,99 @@
+"""Serve the last generated PDF while the data behind it is unchanged.
+
+A report is rebuilt only when its fingerprint moves. The fingerprint is made
+of three parts:
+
+  * cheap aggregates over the tables it reads (row counts, max ids, sums);
+  * a change counter for the models it reads, bumped by every write made
+    through BaseEntity in this process;
+  * today's date, which every report prints and the overdue list depends on.
+
+Edits made from another machine that keep every aggregate the same (a
+changed title, for example) show up once LIBRARY_REPORT_CACHE_TTL seconds
+(default 600) have passed. Setting it to 0 turns the cache off.
+"""
+import os
+import threading
+import time
+from collections import Counter
+from datetime import date
+from database_manager import BaseEntity, register_write_listener
+
+_OPEN_LOANS = """SELECT COUNT(*), COALESCE(MAX(id), 0), COALESCE(SUM(id), 0)
+                 FROM loans WHERE return_date IS NULL"""
+
+# PDFGenerator method -> (aggregate query, models whose writes change the report)
+FINGERPRINTS = {
+    "generate_inventory_report": (
+        "SELECT COUNT(*), COALESCE(MAX(id), 0), COALESCE(SUM(quantity), 0) FROM books",
+        ("Book",)),
+    "generate_member_report": (
+        "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM members",
+        ("Member",)),
+    "generate_overdue_report": (_OPEN_LOANS, ("Loan", "Book", "Member")),
+    "generate_active_loans_report": (_OPEN_LOANS, ("Loan", "Book", "Member")),
+}
+
+class ReportCache:
+    def __init__(self, ttl=None):
+        self.ttl = float(os.getenv("LIBRARY_REPORT_CACHE_TTL", 600) if ttl is None else ttl)
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> (fingerprint, path, mtime, built_at)
+        self._writes = Counter()  # model name -> writes seen
+        self.hits = 0
+        self.misses = 0
+
+    def on_write(self, entity_cls):
+        with self._lock:
+            self._writes[entity_cls.__name__] += 1
+
+    def fingerprint(self, method):
+        sql, models = FINGERPRINTS[method]
+        aggregates = tuple(BaseEntity.fetch_data(sql)[0])
+        with self._lock:
+            # Raw BaseEntity writes don't say which table they touched
+            changes = tuple(self._writes[m] for m in models + ("BaseEntity",))
+        return aggregates, changes, date.today()
+
+    def generate(self, generator, method, **params):
+        """Return (path, cached) for generator.<method>(**params), reusing the
+        previous file if the report's fingerprint has not moved."""
+        if self.ttl <= 0 or method not in FINGERPRINTS:
+            return getattr(generator, method)(**params), False
+        key = (method, tuple(sorted(params.items())))
+        # Taken before the build, so a write made during it forces a rebuild next time
+        fingerprint = self.fingerprint(method)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and self._fresh(entry, fingerprint):
+            with self._lock:
+                self.hits += 1
+            return entry[1], True
+
+        path = getattr(generator, method)(**params)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (fingerprint, path, os.path.getmtime(path), time.monotonic())
+        return path, False
+
+    def _fresh(self, entry, fingerprint):
+        cached_fingerprint, path, mtime, built_at = entry
+        if cached_fingerprint != fingerprint or time.monotonic() - built_at >= self.ttl:
+            return False
+        # The file must still be the one we wrote
+        try:
+            return os.path.getmtime(path) == mtime
+        except OSError:
+            return False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "ttl": self.ttl}
+
+report_cache = ReportCache()
+register_write_listener(report_cache.on_write)
@@ -1,6 +1,8 @@
 CREATE TABLE IF NOT EXISTS authors (
     id INT AUTO_INCREMENT PRIMARY KEY,
-    name VARCHAR(255) NOT NULL
+    name VARCHAR(255) NOT NULL,
+    INDEX idx_author_name (name),
+    FULLTEXT INDEX ft_author_name (name)
 );
 
 CREATE TABLE IF NOT EXISTS books (
@@ -12,7 +14,9 @@ CREATE TABLE IF NOT EXISTS books (
     publish_year INT,
     shelf_location VARCHAR(50) NOT NULL,
     quantity INT NOT NULL DEFAULT 0,
-    INDEX idx_title (title)
+    INDEX idx_title (title),
+    INDEX idx_shelf (shelf_location, id),
+    FULLTEXT INDEX ft_books (title, publisher, category)
 );
 
 CREATE TABLE IF NOT EXISTS book_authors (
@@ -29,7 +33,10 @@ CREATE TABLE IF NOT EXISTS members (
     national_id VARCHAR(20) NOT NULL UNIQUE,
     phone VARCHAR(20),
     join_date DATE NOT NULL,
-    INDEX idx_name (name)
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_name (name),
+    INDEX idx_phone (phone),
+    INDEX idx_members_updated (updated_at)
 );
 
 CREATE TABLE IF NOT EXISTS loans (
@@ -40,6 +47,9 @@ CREATE TABLE IF NOT EXISTS loans (
     due_date DATE NOT NULL,
     return_date DATE,
     fine_amount DECIMAL(10, 2) DEFAULT 0.00,
+    INDEX idx_loans_open_due (return_date, due_date),
+    INDEX idx_loans_member_open (member_id, return_date),
+    INDEX idx_loans_book_open (book_id, return_date),
     FOREIGN KEY (member_id) REFERENCES members(id),
     FOREIGN KEY (book_id) REFERENCES books(id)
 );
@@ -0,0 +1,56 @@
+-- SQLite equivalent of schema.sql (LIBRARY_DB_BACKEND=sqlite). There is no
+-- FULLTEXT index, so catalog search falls back to LIKE matching on this backend.
+CREATE TABLE IF NOT EXISTS authors (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(255) NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_author_name ON authors (name COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title VARCHAR(255) NOT NULL,
+    isbn VARCHAR(20) NOT NULL UNIQUE,
+    category VARCHAR(100) NOT NULL,
+    publisher VARCHAR(255) NOT NULL,
+    publish_year INT,
+    shelf_location VARCHAR(50) NOT NULL,
+    quantity INT NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_title ON books (title);
+CREATE INDEX IF NOT EXISTS idx_shelf ON books (shelf_location, id);
+
+CREATE TABLE IF NOT EXISTS book_authors (
+    book_id INT,
+    author_id INT,
+    PRIMARY KEY (book_id, author_id),
+    FOREIGN KEY (book_id) REFERENCES books(id) ON DELETE CASCADE,
+    FOREIGN KEY (author_id) REFERENCES authors(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_book_authors_author ON book_authors (author_id);
+
+CREATE TABLE IF NOT EXISTS members (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(255) NOT NULL,
+    national_id VARCHAR(20) NOT NULL UNIQUE,
+    phone VARCHAR(20),
+    join_date DATE NOT NULL,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_name ON members (name);
+CREATE INDEX IF NOT EXISTS idx_phone ON members (phone);
+CREATE INDEX IF NOT EXISTS idx_members_updated ON members (updated_at);
+
+CREATE TABLE IF NOT EXISTS loans (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    member_id INT,
+    book_id INT,
+    loan_date DATE NOT NULL,
+    due_date DATE NOT NULL,
+    return_date DATE,
+    fine_amount DECIMAL(10, 2) DEFAULT 0.00,
+    FOREIGN KEY (member_id) REFERENCES members(id),
+    FOREIGN KEY (book_id) REFERENCES books(id)
+);
+CREATE INDEX IF NOT EXISTS idx_loans_open_due ON loans (return_date, due_date);
+CREATE INDEX IF NOT EXISTS idx_loans_member_open ON loans (member_id, return_date);
+CREATE INDEX IF NOT EXISTS idx_loans_book_open ON loans (book_id, return_date);
@@ -0,0 +1,87 @@
+"""Startup timeline: import first in gui_main and main so t=0 is as early as possible.
+
+mark(name) records milliseconds since this module was imported. finish()
+closes the trace at time-to-interactive (first data on screen), logs it, and
+warns when it exceeds LIBRARY_STARTUP_BUDGET_MS. Set LIBRARY_STARTUP_TRACE=1
+to also print the trace to stderr.
+
+profile_imports() additionally times every module loaded from then on;
+print_report() shows the marks and the slowest imports (main.py --profile-startup).
+"""
+import logging
+import os
+import sys
+import threading
+import time
+
+_start = time.perf_counter()
+_lock = threading.Lock()
+_marks = {}  # name -> ms since start, in the order first recorded
+_finished = False
+_imports = []  # (module, self ms, cumulative ms, depth) in load order
+
+startup_log = logging.getLogger("library.startup")
+startup_log.setLevel(logging.INFO)
+
+BUDGET_MS = float(os.getenv("LIBRARY_STARTUP_BUDGET_MS", 2000))
+
+def mark(name):
+    """Record the first time `name` is reached; later calls are ignored."""
+    elapsed = (time.perf_counter() - _start) * 1000
+    with _lock:
+        _marks.setdefault(name, elapsed)
+
+def marks():
+    with _lock:
+        return dict(_marks)
+
+def finish(name="first data"):
+    global _finished
+    mark(name)
+    with _lock:
+        if _finished:
+            return
+        _finished = True
+        total = _marks[name]
+        line = ", ".join(f"{k} {v:.0f} ms" for k, v in _marks.items())
+    if total > BUDGET_MS:
+        startup_log.warning(f"Startup took {total:.0f} ms (budget {BUDGET_MS:.0f} ms): {line}")
+    else:
+        startup_log.info(f"Startup {total:.0f} ms: {line}")
+    if os.getenv("LIBRARY_STARTUP_TRACE"):
+        print(f"startup: {line}" + (f"  OVER BUDGET ({BUDGET_MS:.0f} ms)" if total > BUDGET_MS else ""),
+              file=sys.stderr)
+
+def profile_imports():
+    """Time each first-time absolute import until the process exits."""
+    import builtins
+    original = builtins.__import__
+    children = [0.0]  # time spent in nested imports, one slot per open import
+
+    def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+        children.append(0.0)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            total = (time.perf_counter() - start) * 1000
+            nested = children.pop()
+            children[-1] += total
+            _imports.append((name, total - nested, total, len(children) - 1))
+
+    builtins.__import__ = timed_import
+
+def print_report(limit=15, file=None):
+    file = file or sys.stderr
+    with _lock:
+        line = ", ".join(f"{k} {v:.0f} ms" for k, v in _marks.items())
+    print(f"startup: {line}", file=file)
+    if not _imports:
+        return
+    top_level = sum(total for _, _, total, depth in _imports if depth == 0)
+    print(f"imports: {len(_imports)} modules, {top_level:.0f} ms", file=file)
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module", file=file)
+    for name, own, total, _ in sorted(_imports, key=lambda i: -i[2])[:limit]:
+        print(f"{total:>14.1f} {own:>8.1f}  {name}", file=file)
@@ -0,0 +1,55 @@
+"""Run the suite against a throwaway in-memory SQLite database.
+
+The backend is chosen when database_manager is imported, so the environment
+is set here before any repository module loads.
+"""
+import os
+
+os.environ["LIBRARY_DB_BACKEND"] = "sqlite"
+os.environ["LIBRARY_SQLITE_PATH"] = ":memory:"
+os.environ["LIBRARY_REPORT_CACHE_TTL"] = "600"
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+import migrations
+from database_manager import BaseEntity
+from models.member_index import MemberIndex
+from reports.report_cache import report_cache
+
+TABLES = ("loans", "book_authors", "books", "authors", "members")
+
+migrations.migrate(log=lambda *args: None)
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    """Each test starts with empty tables and cold in-process caches."""
+    for table in TABLES:
+        BaseEntity.execute_query(f"DELETE FROM {table}")
+    MemberIndex.reset()
+    report_cache.clear()
+    yield
+
+@pytest.fixture
+def make_member():
+    from models.member import Member
+
+    def make(name="Test Member", national_id=None):
+        member = Member(name=name, national_id=national_id or f"N{make.count}")
+        make.count += 1
+        member.save()
+        return member
+    make.count = 0
+    return make
+
+@pytest.fixture
+def make_book():
+    from models.book import Book
+
+    def make(title="Test Book", quantity=1, shelf_location="A1", category="Fiction"):
+        book = Book(title=title, isbn=f"ISBN{make.count:06d}", category=category,
+                    publisher="Test Press", shelf_location=shelf_location, quantity=quantity)
+        make.count += 1
+        book.save()
+        return book
+    make.count = 0
+    return make
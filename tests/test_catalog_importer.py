@@ -0,0 +1,30 @@
+import io
+from controllers.catalog_importer import CatalogImporter
+from database_manager import BaseEntity
+
+HEADER = "title,isbn,category,publisher,shelf_location,authors\n"
+
+def _authors():
+    return [row[0] for row in BaseEntity.fetch_data("SELECT name FROM authors ORDER BY id")]
+
+def test_csv_with_byte_order_mark(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_text(HEADER + "Dune,111,SF,Chilton,A1,Frank Herbert\n", encoding="utf-8-sig")
+    result = CatalogImporter().import_file(str(path))
+    assert (result["imported"], result["rejected"]) == (1, [])
+
+def test_authors_are_reused_ignoring_case():
+    first = HEADER + "The Hobbit,1,Fantasy,Allen,A1,Tolkien;Émile Zola\n"
+    again = HEADER + "Silmarillion,2,Fantasy,Allen,A2,tolkien;ÉMILE ZOLA\n"
+    assert CatalogImporter().import_stream(io.StringIO(first), "csv")["authors_created"] == 2
+    # A new importer has no name map yet, so the lookup goes to the database
+    assert CatalogImporter().import_stream(io.StringIO(again), "csv")["authors_created"] == 0
+    assert sorted(_authors()) == ["Tolkien", "Émile Zola"]
+    assert BaseEntity.fetch_data("SELECT COUNT(*) FROM book_authors")[0][0] == 4
+
+def test_non_object_jsonl_lines_are_rejected():
+    feed = io.StringIO('[1, 2]\n"text"\n{"title": "T", "isbn": "9", "category": "C", '
+                       '"publisher": "P", "shelf_location": "S"}\n')
+    result = CatalogImporter().import_stream(feed, "jsonl")
+    assert result["imported"] == 1
+    assert [r["line"] for r in result["rejected"]] == [1, 2]
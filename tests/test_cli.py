@@ -0,0 +1,25 @@
+import json
+import cli_commands
+
+def test_missing_batch_file_is_reported(tmp_path, capsys):
+    path = str(tmp_path / "missing.jsonl")
+    assert cli_commands.run(["--json", "loans", "issue", "--batch", path]) == 1
+    record = json.loads(capsys.readouterr().out)
+    assert record["success"] is False and "missing.jsonl" in record["message"]
+
+    assert cli_commands.run(["loans", "return", "--batch", path]) == 1
+    assert "Batch failed" in capsys.readouterr().err
+
+def test_batch_that_is_not_utf8_is_reported(tmp_path, capsys):
+    path = tmp_path / "latin1.jsonl"
+    path.write_bytes('"caf\xe9"\n'.encode("latin-1"))
+    assert cli_commands.run(["--json", "books", "search", "--batch", str(path)]) == 1
+    assert json.loads(capsys.readouterr().out.splitlines()[-1])["success"] is False
+
+def test_batch_runs_every_line(tmp_path, capsys, make_book):
+    make_book(title="The Hobbit")
+    path = tmp_path / "searches.jsonl"
+    path.write_text('"hobbit"\n\n{"query": ""}\n', encoding="utf-8")
+    assert cli_commands.run(["--json", "books", "search", "--batch", str(path)]) == 1
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["line"], r["success"]) for r in records] == [(1, True), (3, False)]
@@ -0,0 +1,72 @@
+import random
+import threading
+import pytest
+import database_manager
+import migrations
+from benchmarks.bench_loans import MAX_ACTIVE, seed, violations
+from controllers.loan_controller import LoanController
+from database_manager import BaseEntity
+from db_backend import SQLiteBackend
+from models.loan import Loan, LoanError
+
+CLIENTS = 8
+ATTEMPTS = 40
+
+@pytest.fixture
+def file_db(tmp_path, monkeypatch):
+    """Point BaseEntity at a fresh SQLite file for one test.
+
+    The in-memory database from conftest keeps every connection in one
+    process-wide shared cache. A file database has real writer locks and
+    busy timeouts, which is what concurrent loans need to be tested against.
+    """
+    monkeypatch.setattr(database_manager, "backend", SQLiteBackend(str(tmp_path / "library.db")))
+    monkeypatch.setattr(BaseEntity, "_pool", None)
+    monkeypatch.setenv("MYSQL_POOL_SIZE", str(CLIENTS))
+    monkeypatch.setenv("MYSQL_POOL_TIMEOUT", "60")
+    migrations.migrate(log=lambda *args: None)
+    yield
+    BaseEntity._pool.close_all()
+
+def test_concurrent_issue_and_return_keep_the_rules(file_db):
+    member_ids, book_ids = seed(members=12, books=4, copies=2)
+    controller = LoanController()
+    counts = {"issued": 0, "returned": 0, "refused": 0}
+    errors = []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(CLIENTS)
+
+    def client(seed_value):
+        rng = random.Random(seed_value)
+        local = dict.fromkeys(counts, 0)
+        start_gate.wait()
+        try:
+            for _ in range(ATTEMPTS):
+                try:
+                    loan = Loan.issue_loan(rng.choice(member_ids), rng.choice(book_ids), MAX_ACTIVE)
+                    local["issued"] += 1
+                except LoanError:
+                    local["refused"] += 1
+                    continue
+                # Return about half, so copies and limits free up mid-run
+                if rng.random() < 0.5:
+                    result = controller.return_loan(loan.id)
+                    assert result["success"], result["message"]
+                    local["returned"] += 1
+        except Exception as err:
+            errors.append(err)
+        with lock:
+            for key, value in local.items():
+                counts[key] += value
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(CLIENTS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert counts["issued"] > 0 and counts["refused"] > 0
+    assert violations(member_ids, book_ids) == (0, 0)
+    open_loans = BaseEntity.fetch_data("SELECT COUNT(*) FROM loans WHERE return_date IS NULL")[0][0]
+    assert open_loans == counts["issued"] - counts["returned"]
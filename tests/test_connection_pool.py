@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+import pytest
+from connection_pool import ConnectionPool, PoolError, PoolExhaustedError
+
+class FakeConnection:
+    in_transaction = False
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        pass
+
+def test_exhausted_pool_times_out():
+    pool = ConnectionPool(FakeConnection, size=1, timeout=0.05)
+    held = pool.get_connection()
+    with pytest.raises(PoolExhaustedError):
+        pool.get_connection()
+    held.close()
+    pool.get_connection().close()
+    assert pool.metrics()["timeouts"] == 1
+
+def test_exhausted_error_can_be_a_driver_subclass():
+    class DriverPoolError(PoolExhaustedError):
+        pass
+    pool = ConnectionPool(FakeConnection, size=1, timeout=0.01, exhausted_error=DriverPoolError)
+    pool.get_connection()
+    with pytest.raises(DriverPoolError):
+        pool.get_connection()
+    assert issubclass(DriverPoolError, PoolError)
+
+def test_sqlite_backend_does_not_import_mysql_connector():
+    code = "import database_manager, sys; print(any(m.startswith('mysql') for m in sys.modules))"
+    env = {**os.environ, "LIBRARY_DB_BACKEND": "sqlite", "LIBRARY_SQLITE_PATH": ":memory:"}
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         env=env, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert out.stdout.strip() == "False"
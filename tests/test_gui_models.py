@@ -0,0 +1,36 @@
+import pytest
+
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+from PySide6.QtCore import Qt
+import query_stats
+from models.loan import Loan
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+def _queries_run():
+    return sum(s["calls"] for s in query_stats.stats.summary()["statements"])
+
+def test_loan_table_model_paints_without_queries(qapp, make_member, make_book):
+    from gui.views.loan_view import LoanTableModel
+    for n in range(5):
+        Loan.issue_loan(make_member(name=f"Reader {n}").id, make_book(title=f"Title {n}").id)
+    model = LoanTableModel(Loan.get_active_loans_detailed())
+    assert model.rowCount() == 5
+
+    before = _queries_run()
+    cells = [[model.data(model.index(row, col), Qt.DisplayRole)
+              for col in range(model.columnCount())]
+             for row in range(model.rowCount())]
+    model.loan_at(model.rowCount() - 1)
+    assert _queries_run() == before
+    assert cells[0][1] == "Reader 0" and cells[0][2] == "Title 0"
+    assert {row[5] for row in cells} == {"Active"}
+
+def test_reports_do_not_use_the_global_pool(qapp):
+    from PySide6.QtCore import QThreadPool
+    from gui.views.report_view import ReportView
+    view = ReportView()
+    assert view.pool is not QThreadPool.globalInstance()
+    assert view.pool.maxThreadCount() == ReportView.MAX_REPORT_THREADS
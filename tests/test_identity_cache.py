@@ -0,0 +1,48 @@
+import pytest
+from database_manager import DatabaseError, transaction
+from models.member import Member
+
+@pytest.fixture
+def member_cache():
+    Member.enable_cache()
+    yield
+    Member.disable_cache()
+
+def test_hits_share_one_instance_until_save(member_cache, make_member):
+    member_id = make_member(name="Orig").id
+    cached = Member.get_by_id(member_id)
+    assert Member.get_by_id(member_id) is cached
+    assert Member.cache_stats()["hits"] == 1
+    cached.name = "Changed"
+    cached.save()
+    fresh = Member.get_by_id(member_id)
+    assert fresh is not cached and fresh.name == "Changed"
+
+def test_commit_evicts_when_the_block_ends(member_cache, make_member):
+    member_id = make_member(name="Orig").id
+    with transaction():
+        member = Member.get_by_id(member_id)
+        member.name = "Changed"
+        member.save()
+    assert Member.get_by_id(member_id) is not member
+    assert Member.get_by_id(member_id).name == "Changed"
+
+def test_rollback_evicts_unsaved_edits(member_cache, make_member):
+    member_id = make_member(name="Orig").id
+    with pytest.raises(RuntimeError):
+        with transaction():
+            member = Member.get_by_id(member_id)
+            member.name = "Changed"
+            member.save()
+            raise RuntimeError("abort")
+    assert Member.get_by_id(member_id).name == "Orig"
+
+def test_failed_save_evicts_unsaved_edits(member_cache, make_member):
+    taken = make_member(name="Other").national_id
+    member_id = make_member(name="Orig").id
+    member = Member.get_by_id(member_id)
+    original = member.national_id
+    member.national_id = taken
+    with pytest.raises(DatabaseError):
+        member.save()
+    assert Member.get_by_id(member_id).national_id == original
@@ -0,0 +1,46 @@
+from datetime import date, timedelta
+import pytest
+from controllers.loan_controller import LoanController
+from database_manager import BaseEntity
+from models.loan import Loan, LoanError
+
+def test_issue_loan_enforces_member_limit(make_member, make_book):
+    member = make_member()
+    first, second = make_book(), make_book()
+    Loan.issue_loan(member.id, first.id, max_active=1)
+    with pytest.raises(LoanError, match="limit"):
+        Loan.issue_loan(member.id, second.id, max_active=1)
+    assert Loan.get_active_loans_count(member.id) == 1
+
+def test_issue_loan_enforces_copies(make_member, make_book):
+    book = make_book(quantity=1)
+    Loan.issue_loan(make_member().id, book.id)
+    with pytest.raises(LoanError, match="No copies"):
+        Loan.issue_loan(make_member().id, book.id)
+
+def test_issue_loan_unknown_rows(make_member, make_book):
+    with pytest.raises(LoanError, match="Member not found"):
+        Loan.issue_loan(999, make_book().id)
+    with pytest.raises(LoanError, match="Book not found"):
+        Loan.issue_loan(make_member().id, 999)
+
+def test_return_frees_the_copy(make_member, make_book):
+    controller = LoanController()
+    book = make_book(quantity=1)
+    issued = controller.issue_loan(make_member().id, book.id)
+    assert issued["success"]
+    assert controller.return_loan(issued["loan_id"])["success"]
+    assert not controller.return_loan(issued["loan_id"])["success"]
+    assert controller.issue_loan(make_member().id, book.id)["success"]
+
+def test_accrue_fines_is_idempotent(make_member, make_book):
+    loan = Loan.issue_loan(make_member().id, make_book().id)
+    BaseEntity.execute_query("UPDATE loans SET due_date = %s WHERE id = %s",
+                             (date.today() - timedelta(days=3), loan.id))
+    as_of = date.today()
+    assert Loan.accrue_fines(1.0, as_of) == 1
+    assert Loan.accrue_fines(1.0, as_of) == 0
+    assert Loan.get_outstanding_fines() == 3.0
+    # A day later the fine moves again
+    assert Loan.accrue_fines(1.0, as_of + timedelta(days=1)) == 1
+    assert Loan.get_outstanding_fines() == 4.0
@@ -0,0 +1,38 @@
+from database_manager import BaseEntity
+from models.member import Member
+from models.member_index import MemberIndex
+
+def test_typo_tolerant_search(make_member):
+    alice = make_member(name="Alice Johnson")
+    make_member(name="Bob Stone")
+    assert MemberIndex.search_ids("alise jonson")[0] == alice.id
+    assert [m.id for m in Member.search("Alice")] == [alice.id]
+
+def test_exact_national_id_ranks_first(make_member):
+    make_member(name="Carol 42")
+    carol = make_member(name="Carol", national_id="42")
+    assert Member.search("42")[0].id == carol.id
+
+def test_local_rename_is_seen_at_once(make_member):
+    member = make_member(name="Dana Scully")
+    assert MemberIndex.search_ids("scully") == [member.id]
+    member.name = "Dana Mulder"
+    member.save()
+    assert MemberIndex.search_ids("scully") == []
+    assert MemberIndex.search_ids("mulder") == [member.id]
+
+def test_rename_from_another_process_is_seen_after_refresh(make_member):
+    member = make_member(name="Evan Wright")
+    assert MemberIndex.search_ids("wright") == [member.id]
+    # Write on a raw connection so no write listener runs, as if another
+    # process had made the change
+    conn = BaseEntity._connect()
+    try:
+        conn.cursor().execute("UPDATE members SET name = %s, updated_at = CURRENT_TIMESTAMP "
+                              "WHERE id = %s", ("Evan Wrong", member.id))
+    finally:
+        conn.close()
+    assert MemberIndex.search_ids("wrong") == []  # still inside REFRESH_INTERVAL
+    MemberIndex._last_refresh = 0.0
+    assert MemberIndex.search_ids("wrong") == [member.id]
+    assert MemberIndex.search_ids("wright") == []
@@ -0,0 +1,59 @@
+from database_manager import BaseEntity
+from models.author import Author
+from models.book import Book
+from models.catalog_search import CatalogSearch
+from models.member import Member
+
+def test_book_keyset_pages_cover_every_row_once(make_book):
+    for n in range(7):
+        make_book(title=f"Book {n}", shelf_location=f"S{n % 3}")
+    seen, after = [], None
+    while True:
+        page = Book.get_page(after, limit=3)
+        if not page:
+            break
+        seen.extend(page)
+        after = (page[-1].shelf_location, page[-1].id)
+    keys = [(b.shelf_location, b.id) for b in seen]
+    assert keys == sorted(keys)
+    assert len({b.id for b in seen}) == 7
+
+def test_member_keyset_pages(make_member):
+    ids = [make_member(name=f"M{n}").id for n in range(5)]
+    first = Member.get_page(limit=2)
+    second = Member.get_page(first[-1].id, limit=2)
+    third = Member.get_page(second[-1].id, limit=2)
+    assert [m.id for m in first + second + third] == ids
+    assert Member.get_page(ids[-1]) == []
+
+def test_stream_yields_every_row_in_batches(make_member):
+    for n in range(25):
+        make_member(name=f"Streamed {n}")
+    rows = list(BaseEntity.stream("SELECT id FROM members ORDER BY id", batch_size=4))
+    assert len(rows) == 25
+    assert [m.name for m in Member.iter_all(batch_size=7)][:2] == ["Streamed 0", "Streamed 1"]
+
+def test_stream_closed_early_releases_connection(make_member):
+    for n in range(10):
+        make_member(name=f"Early {n}")
+    rows = BaseEntity.stream("SELECT id FROM members", batch_size=2)
+    next(rows)
+    rows.close()
+    assert BaseEntity.fetch_data("SELECT COUNT(*) FROM members")[0][0] == 10
+
+def test_catalog_search_matches_all_terms(make_book):
+    hobbit = make_book(title="The Hobbit")
+    make_book(title="The Silmarillion")
+    author = Author(name="J. R. R. Tolkien")
+    author.save()
+    hobbit.add_author(author.id)
+    assert [b.id for b in CatalogSearch.search("tolkien hobbit")] == [hobbit.id]
+    assert len(CatalogSearch.search("the")) == 2
+    assert CatalogSearch.search("   ") == []
+
+def test_catalog_search_escapes_like_wildcards(make_book):
+    # '_' is a word character, so it reaches LIKE and must match literally
+    make_book(title="snake_case")
+    make_book(title="snakexcase")
+    assert [b.title for b in CatalogSearch.search("snake_case")] == ["snake_case"]
+    assert CatalogSearch.search("%") == []
@@ -0,0 +1,29 @@
+import pytest
+from benchmarks import datagen
+from database_manager import BaseEntity
+from migrations.plans import HOT_QUERIES, capture, check_plans, full_scans
+
+@pytest.fixture
+def cursor():
+    conn = BaseEntity._connect()
+    cursor = conn.cursor()
+    yield cursor
+    cursor.close()
+    conn.close()
+
+def test_hot_queries_use_indexes():
+    # Planner choices depend on table statistics, so seed a realistic
+    # (if small) library and ANALYZE it, as `datagen` does
+    datagen.generate(books=2000, log=lambda *args: None)
+    lines = []
+    assert check_plans(log=lines.append) == 0, "\n".join(lines)
+
+def test_every_hot_query_is_captured():
+    for label, call in HOT_QUERIES:
+        assert capture(call), label
+
+def test_full_scans_flags_table_and_index_scans(cursor):
+    assert full_scans(cursor, "SELECT id FROM books WHERE quantity = %s", (1,)) == ["books"]
+    # Covered by idx_shelf, but still reads the whole index
+    assert full_scans(cursor, "SELECT shelf_location FROM books ORDER BY shelf_location", ())
+    assert full_scans(cursor, "SELECT id FROM books WHERE isbn = %s", ("1",)) == []
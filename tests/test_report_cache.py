@@ -0,0 +1,31 @@
+import os
+from models.member import Member
+from reports.pdf_generator import PDFGenerator
+from reports.report_cache import report_cache
+
+def test_report_is_reused_until_its_data_changes(tmp_path, make_member):
+    make_member(name="Frank Castle")
+    filename = str(tmp_path / "members.pdf")
+    generator = PDFGenerator()
+    misses, hits = report_cache.misses, report_cache.hits
+
+    path, cached = report_cache.generate(generator, "generate_member_report", filename=filename)
+    assert (path, cached) == (filename, False)
+    assert os.path.getsize(path) > 0
+    assert report_cache.generate(generator, "generate_member_report", filename=filename) == (filename, True)
+
+    # A write through the models moves the fingerprint even if counts don't
+    member = Member.get_by_id(Member.get_page()[0].id)
+    member.phone = "555-0100"
+    member.save()
+    assert report_cache.generate(generator, "generate_member_report", filename=filename) == (filename, False)
+    assert (report_cache.misses - misses, report_cache.hits - hits) == (2, 1)
+
+def test_deleted_file_is_rebuilt(tmp_path, make_member):
+    make_member()
+    filename = str(tmp_path / "members.pdf")
+    generator = PDFGenerator()
+    report_cache.generate(generator, "generate_member_report", filename=filename)
+    os.remove(filename)
+    assert report_cache.generate(generator, "generate_member_report", filename=filename) == (filename, False)
+    assert os.path.exists(filename)
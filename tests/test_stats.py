@@ -0,0 +1,21 @@
+from models.stats import LibraryStats
+
+def test_save_invalidates_cached_stats(make_member):
+    LibraryStats.invalidate()
+    assert LibraryStats.get()["total_members"] == 0
+    make_member()
+    assert LibraryStats.get()["total_members"] == 1
+
+def test_write_during_the_query_is_not_cached_over(monkeypatch, make_member):
+    LibraryStats.invalidate()
+    query = LibraryStats.fetch_data
+
+    def slow_query(sql, params=None):
+        rows = query(sql, params)
+        make_member()  # commits after the counts were read
+        return rows
+
+    monkeypatch.setattr(LibraryStats, "fetch_data", slow_query)
+    assert LibraryStats.get()["total_members"] == 0
+    monkeypatch.undo()
+    assert LibraryStats.get()["total_members"] == 1
@@ -0,0 +1,69 @@
+import sqlite3
+import pytest
+from database_manager import (BaseEntity, DatabaseError, in_transaction, pool_metrics,
+                              run_in_transaction, transaction)
+from models.author import Author
+from models.book import Book
+
+def _counts():
+    return tuple(BaseEntity.fetch_data(f"SELECT COUNT(*) FROM {table}")[0][0]
+                 for table in ("books", "authors", "book_authors"))
+
+def _add_book(names, fail_after=None):
+    # The add-book flow from main.py and the GUI
+    with transaction():
+        book = Book(title="Dune", isbn="111", category="SF", publisher="Chilton",
+                    shelf_location="A1", quantity=1)
+        book.save()
+        for n, name in enumerate(names):
+            if n == fail_after:
+                raise RuntimeError("failed halfway")
+            author = Author(name=name)
+            author.save()
+            book.add_author(author.id)
+    return book
+
+def test_book_and_authors_commit_together():
+    _add_book(["Frank Herbert", "Brian Herbert"])
+    assert _counts() == (1, 2, 2)
+
+def test_failure_halfway_leaves_no_rows():
+    with pytest.raises(RuntimeError):
+        _add_book(["Frank Herbert", "Brian Herbert", "Kevin J. Anderson"], fail_after=2)
+    assert _counts() == (0, 0, 0)
+
+def test_database_error_halfway_leaves_no_rows():
+    with pytest.raises(DatabaseError):
+        _add_book(["Frank Herbert", None])  # authors.name is NOT NULL
+    assert _counts() == (0, 0, 0)
+
+def test_nested_block_joins_the_outer_one():
+    with pytest.raises(RuntimeError):
+        with transaction() as outer:
+            with transaction() as inner:
+                assert inner is outer
+                Author(name="Inner").save()
+            assert in_transaction()
+            raise RuntimeError("outer fails after the inner block finished")
+    assert not in_transaction()
+    assert _counts() == (0, 0, 0)
+
+def test_writes_share_one_connection():
+    BaseEntity.fetch_data("SELECT 1")  # make sure the pool exists
+    before = pool_metrics()["checkouts"]
+    _add_book(["A", "B", "C"])
+    assert pool_metrics()["checkouts"] - before == 1
+
+def test_run_in_transaction_reruns_lock_errors():
+    calls = []
+
+    def work(conn):
+        calls.append(conn)
+        Author(name=f"Attempt {len(calls)}").save()
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return len(calls)
+
+    assert run_in_transaction(work) == 2
+    # The first attempt was rolled back with its transaction
+    assert [row[0] for row in BaseEntity.fetch_data("SELECT name FROM authors")] == ["Attempt 2"]